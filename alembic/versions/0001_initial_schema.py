@@ -0,0 +1,60 @@
+"""Ausgangsschema: Benutzer und Bücher
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_superuser", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"], unique=False)
+
+    op.create_table(
+        "books",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("author", sa.String(length=255), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("publication_date", sa.Date(), nullable=True),
+        sa.Column("isbn", sa.String(length=13), nullable=True),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_books_author", "books", ["author"], unique=False)
+    op.create_index("ix_books_id", "books", ["id"], unique=False)
+    op.create_index("ix_books_isbn", "books", ["isbn"], unique=True)
+    op.create_index("ix_books_title", "books", ["title"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_title", table_name="books")
+    op.drop_index("ix_books_isbn", table_name="books")
+    op.drop_index("ix_books_id", table_name="books")
+    op.drop_index("ix_books_author", table_name="books")
+    op.drop_table("books")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
@@ -0,0 +1,42 @@
+"""Versionszähler (ETags) und Bücherstatistik
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: init_db hat die Tabellen evtl. schon per create_all angelegt
+    op.create_table(
+        "book_versions",
+        sa.Column("owner_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "book_stats",
+        sa.Column("dimension", sa.String(length=16), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("dimension", "key"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("book_stats")
+    op.drop_table("book_versions")
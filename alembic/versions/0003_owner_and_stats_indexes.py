@@ -0,0 +1,40 @@
+"""Indizes für Besitzerlisten und Statistik
+
+Belegt durch tests/test_query_plans.py: ohne (owner_id, id) laufen alle
+Abfragen pro Besitzer (Listen, Keyset, Export, detach_owner) als Scan über
+"books"; die Statistik sortiert ohne Index in einem temporären B-Tree.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # if_not_exists: init_db legt die Indizes über create_all evtl. schon an
+    op.create_index(
+        "ix_books_owner_id_id", "books", ["owner_id", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_book_stats_dimension_count",
+        "book_stats",
+        ["dimension", sa.text("count DESC"), "key"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_book_stats_dimension_count", table_name="book_stats")
+    op.drop_index("ix_books_owner_id_id", table_name="books")
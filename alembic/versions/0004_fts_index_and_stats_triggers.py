@@ -0,0 +1,152 @@
+"""Volltextindex und Statistik-Trigger
+
+Bisher legte die Anwendung beide bei jedem Start an; mit
+DB_STARTUP_MODE=check muss das Schema vollständig aus den Migrationen kommen.
+
+Die DDL steht hier als Text und nicht als Import aus app.db.fts bzw.
+app.db.book_stats: spätere Änderungen dort gehören in eine neue Revision.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, author, description,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, description
+    ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+        INSERT INTO books_fts(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    "INSERT INTO books_fts(books_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')",
+    "INSERT INTO books_fts(books_fts) VALUES ('rebuild')",
+]
+
+STATS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS books_stats_ai AFTER INSERT ON books BEGIN
+        INSERT INTO book_stats(dimension, key, count) VALUES
+            ('total', '', 1),
+            ('owner', coalesce(CAST(new.owner_id AS TEXT), ''), 1),
+            ('author', coalesce(new.author, ''), 1),
+            ('year', coalesce(substr(new.publication_date, 1, 4), ''), 1)
+        ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_stats_ad AFTER DELETE ON books BEGIN
+        INSERT INTO book_stats(dimension, key, count) VALUES
+            ('total', '', -1),
+            ('owner', coalesce(CAST(old.owner_id AS TEXT), ''), -1),
+            ('author', coalesce(old.author, ''), -1),
+            ('year', coalesce(substr(old.publication_date, 1, 4), ''), -1)
+        ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count;
+        DELETE FROM book_stats WHERE count <= 0 AND (
+            (dimension = 'total' AND key = '')
+            OR (dimension = 'owner' AND key = coalesce(CAST(old.owner_id AS TEXT), ''))
+            OR (dimension = 'author' AND key = coalesce(old.author, ''))
+            OR (dimension = 'year' AND key = coalesce(substr(old.publication_date, 1, 4), ''))
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_stats_au
+    AFTER UPDATE OF owner_id, author, publication_date ON books BEGIN
+        INSERT INTO book_stats(dimension, key, count) VALUES
+            ('owner', coalesce(CAST(old.owner_id AS TEXT), ''), -1),
+            ('author', coalesce(old.author, ''), -1),
+            ('year', coalesce(substr(old.publication_date, 1, 4), ''), -1)
+        ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count;
+        INSERT INTO book_stats(dimension, key, count) VALUES
+            ('owner', coalesce(CAST(new.owner_id AS TEXT), ''), 1),
+            ('author', coalesce(new.author, ''), 1),
+            ('year', coalesce(substr(new.publication_date, 1, 4), ''), 1)
+        ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count;
+        DELETE FROM book_stats WHERE count <= 0 AND (
+            (dimension = 'owner' AND key = coalesce(CAST(old.owner_id AS TEXT), ''))
+            OR (dimension = 'author' AND key = coalesce(old.author, ''))
+            OR (dimension = 'year' AND key = coalesce(substr(old.publication_date, 1, 4), ''))
+        );
+    END
+    """,
+    # Statistik aus den vorhandenen Büchern aufbauen
+    "DELETE FROM book_stats",
+    """
+    INSERT INTO book_stats(dimension, key, count)
+    SELECT 'total', '', count(*) FROM books GROUP BY 2
+    """,
+    """
+    INSERT INTO book_stats(dimension, key, count)
+    SELECT 'owner', coalesce(CAST(books.owner_id AS TEXT), ''), count(*) FROM books GROUP BY 2
+    """,
+    """
+    INSERT INTO book_stats(dimension, key, count)
+    SELECT 'author', coalesce(books.author, ''), count(*) FROM books GROUP BY 2
+    """,
+    """
+    INSERT INTO book_stats(dimension, key, count)
+    SELECT 'year', coalesce(substr(books.publication_date, 1, 4), ''), count(*)
+    FROM books GROUP BY 2
+    """,
+]
+
+TRIGGERS = [
+    "books_stats_au",
+    "books_stats_ad",
+    "books_stats_ai",
+    "books_fts_au",
+    "books_fts_ad",
+    "books_fts_ai",
+]
+
+
+def upgrade() -> None:
+    # FTS5 und die Trigger gibt es nur unter SQLite. IF NOT EXISTS, weil
+    # ältere Versionen beides schon beim Start angelegt haben; Index und
+    # Statistik werden in jedem Fall aus den vorhandenen Büchern neu aufgebaut
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for statement in FTS_DDL + STATS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS books_fts")
@@ -2,8 +2,40 @@
 from fastapi import APIRouter
 
 from app.api.api_v1.endpoints import auth, books, users
+from app.config import settings
+
+
+def _without_overridden(router: APIRouter, override: APIRouter) -> APIRouter:
+    """
+    Router mit allen Routen aus ``router``, die ``override`` nicht selbst bedient.
+    """
+    overridden = {
+        (route.path, method) for route in override.routes for method in route.methods
+    }
+    remaining = APIRouter()
+    remaining.routes = [
+        route
+        for route in router.routes
+        if not any((route.path, method) in overridden for method in route.methods)
+    ]
+    return remaining
+
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(books.router, prefix="/books", tags=["books"])
\ No newline at end of file
+if settings.ASYNC_DB_MODE:
+    from app.api.api_v1.endpoints import async_books, async_users
+
+    # Synchrone Routen ohne Async-Variante zuerst einbinden, damit statische
+    # Pfade wie /books/search nicht von /books/{id} verdeckt werden
+    api_router.include_router(
+        _without_overridden(users.router, async_users.router), prefix="/users", tags=["users"]
+    )
+    api_router.include_router(async_users.router, prefix="/users", tags=["users"])
+    api_router.include_router(
+        _without_overridden(books.router, async_books.router), prefix="/books", tags=["books"]
+    )
+    api_router.include_router(async_books.router, prefix="/books", tags=["books"])
+else:
+    api_router.include_router(users.router, prefix="/users", tags=["users"])
+    api_router.include_router(books.router, prefix="/books", tags=["books"])
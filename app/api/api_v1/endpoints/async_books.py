@@ -0,0 +1,191 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.async_auth import get_current_user_async
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.fields import parse_fields, subset_response, subset_serializer
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer, rows_response
+from app.crud.async_crud_book import book as crud_book
+from app.db.session import get_async_db
+from app.schemas.book import Book, BookCreate, BookUpdate
+from app.schemas.user import Principal
+
+# Async-Varianten der Bücher-Endpunkte (ASYNC_DB_MODE). Verhalten und Pfade
+# entsprechen books.py; Endpunkte ohne Async-Variante bleiben synchron.
+router = APIRouter()
+
+BOOK_LIST = RowSerializer(Book)
+
+
+async def _book_etag(db: AsyncSession, current_user: Principal, *parts: Any) -> str:
+    """
+    ETag aus dem Versionszähler des sichtbaren Bereichs (alle Bücher für
+    Superuser, sonst die eigenen) und den Parametern der Anfrage.
+    """
+    if current_user.is_superuser:
+        version = await crud_book.get_version(db)
+        return make_etag("all", version, *parts)
+    version = await crud_book.get_version(db, owner_id=current_user.id)
+    return make_etag("owner", current_user.id, version, *parts)
+
+
+@router.get("/", response_model=List[Book])
+async def read_books(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor aus X-Next-Cursor; leer für die erste Seite im Cursor-Modus",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Ruft alle Bücher ab.
+    """
+    selected = parse_fields(fields, Book)
+    serializer = BOOK_LIST if selected is None else subset_serializer(Book, selected)
+    etag = await _book_etag(db, current_user, "list", skip, limit, cursor, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    filters = {} if current_user.is_superuser else {"owner_id": current_user.id}
+    if cursor is None:
+        rows = await crud_book.get_multi_rows(
+            db, columns=serializer.fields, skip=skip, limit=limit, **filters
+        )
+        return rows_response(serializer, rows, response)
+
+    after_id = decode_cursor(cursor, **filters).get("id")
+    rows = await crud_book.get_multi_keyset_rows(
+        db, columns=serializer.fields, after_id=after_id, limit=limit, **filters
+    )
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(**filters, id=rows[-1].id)
+    return rows_response(serializer, rows, response)
+
+
+@router.post("/", response_model=Book)
+async def create_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    book_in: BookCreate,
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Erstellt ein neues Buch.
+    """
+    return await crud_book.create_with_owner(
+        db=db, obj_in=book_in, owner_id=current_user.id
+    )
+
+
+@router.put("/{id}", response_model=Book)
+async def update_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    id: int,
+    book_in: BookUpdate,
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Aktualisiert ein Buch.
+    """
+    book = await crud_book.get(db=db, id=id, cached=False)
+    if not book:
+        raise HTTPException(status_code=404, detail="Buch nicht gefunden")
+    if not current_user.is_superuser and book.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    book = await crud_book.update(db=db, db_obj=book, obj_in=book_in)
+    return book
+
+
+@router.get("/{id}", response_model=Book)
+async def read_book(
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    id: int,
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Ruft ein Buch nach ID ab.
+    """
+    selected = parse_fields(fields, Book)
+    # Erst 404/403, dann der ETag: sonst verrät 304 (auch für "*") fremde
+    # oder fehlende Bücher
+    book = await crud_book.get(db=db, id=id, fields=selected)
+    if not book:
+        raise HTTPException(status_code=404, detail="Buch nicht gefunden")
+    if not current_user.is_superuser and book.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    etag = await _book_etag(db, current_user, "id", id, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if selected is not None:
+        return subset_response(Book, selected, book, response)
+    return book
+
+
+@router.delete("/{id}", response_model=Book)
+async def delete_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    id: int,
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Löscht ein Buch.
+    """
+    book = await crud_book.get(db=db, id=id, cached=False)
+    if not book:
+        raise HTTPException(status_code=404, detail="Buch nicht gefunden")
+    if not current_user.is_superuser and book.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    book = await crud_book.remove(db=db, id=id)
+    return book
+
+
+@router.get("/isbn/{isbn}", response_model=Book)
+async def read_book_by_isbn(
+    isbn: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Ruft ein Buch nach ISBN ab.
+    """
+    selected = parse_fields(fields, Book)
+    # Erst 404/403, dann der ETag: sonst verrät 304 (auch für "*") fremde
+    # oder fehlende Bücher
+    book = await crud_book.get_by_isbn(db=db, isbn=isbn, fields=selected)
+    if not book:
+        raise HTTPException(status_code=404, detail="Buch nicht gefunden")
+    if not current_user.is_superuser and book.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    etag = await _book_etag(db, current_user, "isbn", isbn, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if selected is not None:
+        return subset_response(Book, selected, book, response)
+    return book
@@ -0,0 +1,144 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.async_auth import (
+    get_current_active_superuser_async,
+    get_current_user_async,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer, rows_response
+from app.crud.async_crud_user import user as crud_user
+from app.db.session import get_async_db
+from app.schemas.user import Principal, User as UserSchema, UserCreate, UserUpdate
+
+# Async-Varianten der Benutzer-Endpunkte (ASYNC_DB_MODE), siehe users.py
+router = APIRouter()
+
+USER_LIST = RowSerializer(UserSchema)
+
+
+@router.get("/", response_model=List[UserSchema])
+async def read_users(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor aus X-Next-Cursor; leer für die erste Seite im Cursor-Modus",
+    ),
+    current_user: Principal = Depends(get_current_active_superuser_async),
+) -> Any:
+    """
+    Ruft Benutzer ab.
+    """
+    if cursor is None:
+        rows = await crud_user.get_multi_rows(
+            db, columns=USER_LIST.fields, skip=skip, limit=limit
+        )
+        return rows_response(USER_LIST, rows, response)
+
+    after_id = decode_cursor(cursor).get("id")
+    rows = await crud_user.get_multi_keyset_rows(
+        db, columns=USER_LIST.fields, after_id=after_id, limit=limit
+    )
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(id=rows[-1].id)
+    return rows_response(USER_LIST, rows, response)
+
+
+@router.post("/", response_model=UserSchema)
+async def create_user(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    user_in: UserCreate,
+    current_user: Principal = Depends(get_current_active_superuser_async),
+) -> Any:
+    """
+    Erstellt einen neuen Benutzer.
+    """
+    user = await crud_user.get_by_email(db, email=user_in.email)
+    if user:
+        raise HTTPException(
+            status_code=400,
+            detail="Ein Benutzer mit dieser E-Mail existiert bereits.",
+        )
+    user = await crud_user.create(db, obj_in=user_in)
+    return user
+
+
+@router.put("/me", response_model=UserSchema)
+async def update_user_me(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    password: str = Body(None),
+    email: EmailStr = Body(None),
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Aktualisiert eigenen Benutzer.
+    """
+    user_in = UserUpdate(
+        email=current_user.email,
+        is_active=current_user.is_active,
+        is_superuser=current_user.is_superuser,
+    )
+    if password is not None:
+        user_in.password = password
+    if email is not None:
+        user_in.email = email
+    db_user = await crud_user.get(db, id=current_user.id)
+    user = await crud_user.update(db, db_obj=db_user, obj_in=user_in)
+    return user
+
+
+@router.get("/me", response_model=UserSchema)
+async def read_user_me(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Any:
+    """
+    Ruft aktuellen Benutzer ab.
+    """
+    return current_user
+
+
+@router.get("/{user_id}", response_model=UserSchema)
+async def read_user_by_id(
+    user_id: int,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Ruft einen bestimmten Benutzer nach ID ab.
+    """
+    if user_id == current_user.id:
+        return current_user
+    if not crud_user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Nicht genügend Rechte",
+        )
+    user = await crud_user.get(db, id=user_id)
+    return user
+
+
+@router.delete("/{user_id}", response_model=UserSchema)
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_active_superuser_async),
+) -> Any:
+    """
+    Löscht einen Benutzer.
+    """
+    user = await crud_user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(
+            status_code=404,
+            detail="Benutzer nicht gefunden",
+        )
+    user = await crud_user.remove(db, id=user_id)
+    return user
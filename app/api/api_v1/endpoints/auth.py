@@ -1,28 +1,36 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.core.auth import create_access_token
-from app.core.security import verify_password
+from app.core.auth import decode_token, get_current_active_superuser, user_claims
+from app.core.principal_cache import principal_cache
+from app.core.security import (
+    REFRESH_TOKEN_TYPE,
+    create_access_token,
+    create_refresh_token,
+    verify_password,
+)
 from app.crud.crud_user import user as crud_user
-from app.schemas.token import Token
+from app.models.user import User
+from app.schemas.token import RefreshTokenRequest, Token
+from app.schemas.user import Principal
 from app.config import settings
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 kompatibler Token-Login, gibt ein JWT-Token zurück
     """
-    user = crud_user.authenticate(
+    user = await crud_user.authenticate_async(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -34,10 +42,54 @@ def login_access_token(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Inaktiver Benutzer"
         )
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return _issue_tokens(user)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+    body: RefreshTokenRequest, db: Session = Depends(get_db)
+) -> Any:
+    """
+    Stellt mit einem Refresh-Token (Claims-Modus) neue Tokens aus. Nur hier
+    wird der Benutzer aus der DB geladen, gesperrte Benutzer erhalten kein
+    neues Access-Token.
+    """
+    token_data = decode_token(body.refresh_token, REFRESH_TOKEN_TYPE)
+    user = crud_user.get(db, id=token_data.sub) if token_data.sub is not None else None
+    if not user or not crud_user.is_active(user):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh-Token ungültig",
+        )
+    return _issue_tokens(user)
+
+
+def _issue_tokens(user: User) -> Dict[str, Any]:
+    if not settings.AUTH_CLAIMS_MODE:
+        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        return {
+            "access_token": create_access_token(
+                user.id, expires_delta=access_token_expires
+            ),
+            "token_type": "bearer",
+        }
+    access_token_expires = timedelta(
+        minutes=settings.CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES
+    )
     return {
         "access_token": create_access_token(
-            user.id, expires_delta=access_token_expires
+            user.id, expires_delta=access_token_expires, claims=user_claims(user)
         ),
         "token_type": "bearer",
-    }
\ No newline at end of file
+        "refresh_token": create_refresh_token(user.id),
+    }
+
+
+@router.get("/cache-stats")
+def read_auth_cache_stats(
+    current_user: Principal = Depends(get_current_active_superuser),
+) -> Any:
+    """
+    Trefferstatistik des Caches für authentifizierte Benutzer.
+    """
+    return principal_cache.stats()
@@ -1,34 +1,100 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.core.auth import get_current_user
+from app.config import settings
+from app.core.auth import get_current_active_superuser, get_current_user
+from app.core.etag import etag_matches, make_etag, not_modified, set_etag
+from app.core.fields import parse_fields, subset_response, subset_serializer
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer, rows_response
+from app.crud.cache import book_cache
 from app.crud.crud_book import book as crud_book
-from app.models.user import User
-from app.schemas.book import Book, BookCreate, BookUpdate
+from app.schemas.book import (
+    Book,
+    BookBatchDelete,
+    BookBatchResult,
+    BookBatchUpdate,
+    BookCreate,
+    BookImportResult,
+    BookStats,
+    BookUpdate,
+)
+from app.schemas.user import Principal
+from app.services import book_export
+from app.services.book_batch import batch_delete_books, batch_update_books
+from app.services.book_import import FORMAT_CSV, FORMAT_NDJSON, import_books
 
 router = APIRouter()
 
+BOOK_LIST = RowSerializer(Book)
+
+
+def _book_etag(db: Session, current_user: Principal, *parts: Any) -> str:
+    """
+    ETag aus dem Versionszähler des sichtbaren Bereichs (alle Bücher für
+    Superuser, sonst die eigenen) und den Parametern der Anfrage.
+    """
+    if current_user.is_superuser:
+        version = crud_book.get_version(db)
+        return make_etag("all", version, *parts)
+    version = crud_book.get_version(db, owner_id=current_user.id)
+    return make_etag("owner", current_user.id, version, *parts)
+
 
 @router.get("/", response_model=List[Book])
 def read_books(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor aus X-Next-Cursor; leer für die erste Seite im Cursor-Modus",
+    ),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Ruft alle Bücher ab.
+
+    Ohne ``cursor`` wird wie bisher mit ``skip``/``limit`` geblättert. Mit
+    ``cursor`` wird per Keyset geblättert; der Cursor der nächsten Seite steht
+    im Header ``X-Next-Cursor``.
+
+    Liefert einen ETag; bei passendem ``If-None-Match`` kommt 304 ohne Abfrage
+    der Bücher. Die Liste wird ohne ORM-Objekte und Modellvalidierung
+    serialisiert (gleiches JSON wie ``response_model``). Mit ``fields`` werden
+    nur die angegebenen Spalten gelesen und ausgegeben.
     """
-    if current_user.is_superuser:
-        books = crud_book.get_multi(db, skip=skip, limit=limit)
-    else:
-        books = crud_book.get_multi_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
+    selected = parse_fields(fields, Book)
+    serializer = BOOK_LIST if selected is None else subset_serializer(Book, selected)
+    etag = _book_etag(db, current_user, "list", skip, limit, cursor, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # Schneller Lesepfad: Tupel aus einem Core-select, direkt zu JSON
+    filters = {} if current_user.is_superuser else {"owner_id": current_user.id}
+    if cursor is None:
+        rows = crud_book.get_multi_rows(
+            db, columns=serializer.fields, skip=skip, limit=limit, **filters
         )
-    return books
+        return rows_response(serializer, rows, response)
+
+    after_id = decode_cursor(cursor, **filters).get("id")
+    rows = crud_book.get_multi_keyset_rows(
+        db, columns=serializer.fields, after_id=after_id, limit=limit, **filters
+    )
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(**filters, id=rows[-1].id)
+    return rows_response(serializer, rows, response)
 
 
 # app/api/api_v1/endpoints/books.py (nur create_book aktualisieren)
@@ -37,24 +103,17 @@ def create_book(
     *,
     db: Session = Depends(get_db),
     book_in: BookCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Erstellt ein neues Buch.
     """
     try:
-        # Prüfen, ob ISBN bereits existiert
-        if book_in.isbn:
-            existing_book = crud_book.get_by_isbn(db=db, isbn=book_in.isbn)
-            if existing_book:
-                raise HTTPException(
-                    status_code=400, 
-                    detail="Ein Buch mit dieser ISBN existiert bereits"
-                )
-        
-        # Buch erstellen
+        # ISBN-Konflikte meldet der Unique-Constraint (BookAlreadyExistsException)
         book = crud_book.create_with_owner(db=db, obj_in=book_in, owner_id=current_user.id)
         return book
+    except HTTPException:
+        raise
     except Exception as e:
         # Bessere Fehlerbehandlung
         raise HTTPException(
@@ -63,18 +122,142 @@ def create_book(
         )
 
 
+@router.post("/import", response_model=BookImportResult)
+async def import_books_endpoint(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Importiert Bücher als NDJSON (application/x-ndjson) oder CSV (text/csv,
+    erste Zeile mit Spaltennamen). Liefert einen Fehlerbericht pro Zeile.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type == "text/csv":
+        fmt = FORMAT_CSV
+    elif content_type in ("application/x-ndjson", "application/jsonl", "application/json"):
+        fmt = FORMAT_NDJSON
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Erwartet application/x-ndjson oder text/csv",
+        )
+    return await import_books(
+        db, request.stream(), fmt=fmt, owner_id=current_user.id
+    )
+
+
+@router.get("/export")
+def export_books(
+    format: str = Query(book_export.FORMAT_NDJSON, pattern="^(ndjson|csv)$"),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Exportiert alle sichtbaren Bücher als NDJSON oder CSV (gestreamt).
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    columns = parse_fields(fields, Book)
+    return StreamingResponse(
+        book_export.export_books(fmt=format, owner_id=owner_id, columns=columns),
+        media_type=book_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="books.{format}"'},
+    )
+
+
+@router.get("/search", response_model=List[Book])
+def search_books(
+    *,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Durchsucht Titel, Autor und Beschreibung der sichtbaren Bücher.
+    """
+    owner_id = None if current_user.is_superuser else current_user.id
+    return crud_book.search(db, q=q, owner_id=owner_id, limit=limit)
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.BOOK_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Höchstens {settings.BOOK_BATCH_MAX_SIZE} Einträge pro Anfrage",
+        )
+
+
+@router.post("/batch-update", response_model=BookBatchResult)
+def batch_update(
+    *,
+    db: Session = Depends(get_db),
+    batch_in: BookBatchUpdate,
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Aktualisiert mehrere Bücher in einer Transaktion (Ergebnis pro Eintrag).
+    """
+    _check_batch_size(len(batch_in.items))
+    return batch_update_books(db, batch_in.items, current_user)
+
+
+@router.post("/batch-delete", response_model=BookBatchResult)
+def batch_delete(
+    *,
+    db: Session = Depends(get_db),
+    batch_in: BookBatchDelete,
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Löscht mehrere Bücher in einer Transaktion (Ergebnis pro Eintrag).
+    """
+    _check_batch_size(len(batch_in.ids))
+    return batch_delete_books(db, batch_in.ids, current_user)
+
+
+@router.get("/stats", response_model=BookStats)
+def read_book_stats(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000, description="Höchstzahl Gruppen je Dimension"),
+    current_user: Principal = Depends(get_current_active_superuser),
+) -> Any:
+    """
+    Anzahl Bücher insgesamt und je Besitzer, Autor und Erscheinungsjahr.
+    """
+    etag = _book_etag(db, current_user, "stats", limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return crud_book.get_stats(db, limit=limit)
+
+
+@router.get("/cache-stats")
+def read_book_cache_stats(
+    current_user: Principal = Depends(get_current_active_superuser),
+) -> Any:
+    """
+    Trefferstatistik des Bücher-Caches (nach ID und ISBN).
+    """
+    return book_cache.stats()
+
+
 @router.put("/{id}", response_model=Book)
 def update_book(
     *,
     db: Session = Depends(get_db),
     id: int,
     book_in: BookUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Aktualisiert ein Buch.
     """
-    book = crud_book.get(db=db, id=id)
+    book = crud_book.get(db=db, id=id, cached=False)
     if not book:
         raise HTTPException(status_code=404, detail="Buch nicht gefunden")
     if not current_user.is_superuser and book.owner_id != current_user.id:
@@ -86,18 +269,32 @@ def update_book(
 @router.get("/{id}", response_model=Book)
 def read_book(
     *,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_current_user),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Ruft ein Buch nach ID ab.
     """
-    book = crud_book.get(db=db, id=id)
+    selected = parse_fields(fields, Book)
+    # Erst 404/403, dann der ETag: sonst verrät 304 (auch für "*") fremde
+    # oder fehlende Bücher
+    book = crud_book.get(db=db, id=id, fields=selected)
     if not book:
         raise HTTPException(status_code=404, detail="Buch nicht gefunden")
     if not current_user.is_superuser and book.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    etag = _book_etag(db, current_user, "id", id, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if selected is not None:
+        return subset_response(Book, selected, book, response)
     return book
 
 
@@ -106,12 +303,12 @@ def delete_book(
     *,
     db: Session = Depends(get_db),
     id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Löscht ein Buch.
     """
-    book = crud_book.get(db=db, id=id)
+    book = crud_book.get(db=db, id=id, cached=False)
     if not book:
         raise HTTPException(status_code=404, detail="Buch nicht gefunden")
     if not current_user.is_superuser and book.owner_id != current_user.id:
@@ -123,15 +320,29 @@ def delete_book(
 @router.get("/isbn/{isbn}", response_model=Book)
 def read_book_by_isbn(
     isbn: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    fields: Optional[str] = Query(
+        None, description="Kommagetrennte Felder, z.B. title,author (id ist immer dabei)"
+    ),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Ruft ein Buch nach ISBN ab.
     """
-    book = crud_book.get_by_isbn(db=db, isbn=isbn)
+    selected = parse_fields(fields, Book)
+    # Erst 404/403, dann der ETag: sonst verrät 304 (auch für "*") fremde
+    # oder fehlende Bücher
+    book = crud_book.get_by_isbn(db=db, isbn=isbn, fields=selected)
     if not book:
         raise HTTPException(status_code=404, detail="Buch nicht gefunden")
     if not current_user.is_superuser and book.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Keine Berechtigung")
+    etag = _book_etag(db, current_user, "isbn", isbn, selected)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if selected is not None:
+        return subset_response(Book, selected, book, response)
     return book
@@ -1,31 +1,50 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
 from app.core.auth import get_current_active_superuser, get_current_user
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import RowSerializer, rows_response
 from app.crud.crud_user import user as crud_user
-from app.models.user import User
-from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.schemas.user import Principal, User as UserSchema, UserCreate, UserUpdate
 
 router = APIRouter()
 
+USER_LIST = RowSerializer(UserSchema)
+
 
 @router.get("/", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_superuser),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor aus X-Next-Cursor; leer für die erste Seite im Cursor-Modus",
+    ),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Ruft Benutzer ab.
     """
-    users = crud_user.get_multi(db, skip=skip, limit=limit)
-    return users
+    if cursor is None:
+        rows = crud_user.get_multi_rows(
+            db, columns=USER_LIST.fields, skip=skip, limit=limit
+        )
+        return rows_response(USER_LIST, rows, response)
+
+    after_id = decode_cursor(cursor).get("id")
+    rows = crud_user.get_multi_keyset_rows(
+        db, columns=USER_LIST.fields, after_id=after_id, limit=limit
+    )
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(id=rows[-1].id)
+    return rows_response(USER_LIST, rows, response)
 
 
 @router.post("/", response_model=UserSchema)
@@ -33,7 +52,7 @@ def create_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Erstellt einen neuen Benutzer.
@@ -54,7 +73,7 @@ def update_user_me(
     db: Session = Depends(get_db),
     password: str = Body(None),
     email: EmailStr = Body(None),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Aktualisiert eigenen Benutzer.
@@ -65,13 +84,14 @@ def update_user_me(
         user_in.password = password
     if email is not None:
         user_in.email = email
-    user = crud_user.update(db, db_obj=current_user, obj_in=user_in)
+    db_user = crud_user.get(db, id=current_user.id)
+    user = crud_user.update(db, db_obj=db_user, obj_in=user_in)
     return user
 
 
 @router.get("/me", response_model=UserSchema)
 def read_user_me(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ) -> Any:
     """
     Ruft aktuellen Benutzer ab.
@@ -82,20 +102,22 @@ def read_user_me(
 @router.get("/{user_id}", response_model=UserSchema)
 def read_user_by_id(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
     Ruft einen bestimmten Benutzer nach ID ab.
     """
-    user = crud_user.get(db, id=user_id)
-    if user == current_user:
-        return user
+    if user_id == current_user.id:
+        return current_user
     if not crud_user.is_superuser(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Nicht genügend Rechte",
         )
+    user = crud_user.get(db, id=user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="Benutzer nicht gefunden")
     return user
 
 
@@ -103,7 +125,7 @@ def read_user_by_id(
 def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Löscht einen Benutzer.
@@ -0,0 +1,65 @@
+import argparse
+from typing import List, Optional
+
+
+def rebuild_fts() -> None:
+    from app.db.fts import rebuild_fts_index
+    from app.db.session import engine
+
+    rebuild_fts_index(engine)
+    print("Volltextindex neu aufgebaut")
+
+
+def rebuild_stats() -> None:
+    from app.db.book_stats import rebuild_book_stats
+    from app.db.session import engine
+
+    rebuild_book_stats(engine)
+    print("Bücherstatistik neu aufgebaut")
+
+
+def init_db() -> None:
+    from app.db.init_db import init_db
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        init_db(db)
+    print("Datenbank initialisiert")
+
+
+def create_superuser() -> None:
+    from app.config import settings
+    from app.db.init_db import create_first_superuser
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        created = create_first_superuser(db)
+    if created:
+        print(f"Superuser {settings.FIRST_SUPERUSER} angelegt")
+    else:
+        print(f"Superuser {settings.FIRST_SUPERUSER} existiert bereits")
+
+
+COMMANDS = {
+    "init-db": (init_db, "Schema per create_all anlegen und Superuser erstellen"),
+    "create-superuser": (create_superuser, "Ersten Superuser (FIRST_SUPERUSER) anlegen"),
+    "rebuild-fts": (rebuild_fts, "Volltextindex der Bücher neu aufbauen"),
+    "rebuild-stats": (rebuild_stats, "Bücherstatistik (book_stats) neu aufbauen"),
+}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Verwaltungsbefehle, Aufruf z.B. mit ``python -m app.cli rebuild-fts``.
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
+    args = parser.parse_args(argv)
+    command, _ = COMMANDS[args.command]
+    command()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,113 @@ class Settings(BaseSettings):
     # 60 Minuten * 24 Stunden * 8 Tage = 8 Tage
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     
+    # Claims-Modus: kurzlebige Access-Tokens tragen is_active/is_superuser, der
+    # Benutzer wird nur beim Refresh aus der DB geladen. Sperren wirken daher
+    # spätestens nach CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES.
+    AUTH_CLAIMS_MODE: bool = False
+    CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES: int = 5
+    REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    
+    # Cache für authentifizierte Benutzer (0 = aus)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: float = 60
+    
+    # Passwort-Hashing: bcrypt-Kosten, Prozess-Pool und Länge der Warteschlange.
+    # Bei voller Warteschlange antworten Login & Co. mit 503 und Retry-After.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    
     # CORS-Einstellungen (erweitert um Port 8888)
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:8000", "http://localhost:3000", "http://localhost:8888"]
     
     # Datenbankeinstellungen
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./test.db"
+    # Async-Modus: Bücher- und Benutzer-Endpunkte laufen über AsyncSession
+    # (lokal aiosqlite). Ohne eigene URI wird sie aus der synchronen abgeleitet.
+    ASYNC_DB_MODE: bool = False
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
+    
+    # Datenbank beim Start: "create" legt fehlende Tabellen, Volltextindex und
+    # Trigger an (Entwicklung), "check" prüft nur die Alembic-Revision (nach
+    # "alembic upgrade head"), "skip" macht gar nichts. Den ersten Superuser
+    # legt "python -m app.cli create-superuser" an.
+    DB_STARTUP_MODE: str = "create"
+    
+    # SQLite-Profil: "performance" (WAL, synchronous=NORMAL, großer Cache, mmap),
+    # "durable" (WAL, synchronous=FULL) oder "default" (SQLite-Voreinstellungen).
+    # Einzelne Pragmas lassen sich über SQLITE_* überschreiben.
+    SQLITE_PROFILE: str = "performance"
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_BUSY_TIMEOUT_MS: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+    
+    # Connection-Pool der synchronen Engine
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    
+    # Lesende Endpunkte nutzen eine eigene Engine. Ohne eigene URI wird die
+    # SQLite-Datei schreibgeschützt (mode=ro, query_only) ein zweites Mal geöffnet;
+    # später kann hier ein Replikat eingetragen werden.
+    SQLALCHEMY_READ_DATABASE_URI: Optional[str] = None
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+    
+    # Massenimport: Zeilen pro Validierungs-/Insert-Transaktion
+    BOOK_IMPORT_CHUNK_SIZE: int = 5000
+    
+    # Maximale Anzahl Einträge pro Massenänderung/-löschung
+    BOOK_BATCH_MAX_SIZE: int = 1000
+    
+    # Read-Through-Cache für Bücher nach ID und ISBN: "memory" (LRU pro Prozess),
+    # "none" oder "modul:Klasse" einer CacheBackend-Implementierung (z.B. für
+    # einen geteilten Cache bei mehreren Workern). Nicht gefundene Bücher werden
+    # nur kurz gemerkt. "memory" ist nur mit einem Worker korrekt: Schreibzugriffe
+    # anderer Prozesse invalidieren ihn nicht, Lesezugriffe liefern dann bis zu
+    # BOOK_CACHE_TTL_SECONDS alte Daten. Mehrere Worker: "none" oder geteilt.
+    BOOK_CACHE_BACKEND: str = "memory"
+    BOOK_CACHE_SIZE: int = 10000
+    BOOK_CACHE_TTL_SECONDS: float = 300
+    BOOK_CACHE_NEGATIVE_TTL_SECONDS: float = 10
+    
+    # Latenz pro Route, Statuscodes, Datenbankabfragen und Wartezeit auf den
+    # Connection-Pool; im Prometheus-Textformat unter /metrics
+    METRICS_ENABLED: bool = True
+    
+    # Access-Log: eine JSON-Zeile pro Anfrage, geschrieben von einem
+    # Hintergrund-Thread. Rotation nach Größe (ACCESS_LOG_MAX_BYTES, 0 = nie)
+    # oder, falls gesetzt, nach Zeit (ACCESS_LOG_ROTATE_WHEN, z.B. "midnight").
+    # Erfolgreiche Anfragen lassen sich sampeln; ist die Queue voll, werden
+    # Zeilen verworfen (access_log_dropped_total) statt die Anfrage zu bremsen.
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_PATH: str = "logs/access.jsonl"
+    ACCESS_LOG_MAX_BYTES: int = 50 * 1024 * 1024
+    ACCESS_LOG_ROTATE_WHEN: Optional[str] = None
+    ACCESS_LOG_BACKUP_COUNT: int = 7
+    ACCESS_LOG_SAMPLE_RATE_2XX: float = 1.0
+    ACCESS_LOG_QUEUE_SIZE: int = 10000
+    
+    # Abfragebudget für Staging: "off" oder "log". Mit "log" wird pro Anfrage
+    # gewarnt, wenn mehr als QUERY_BUDGET_MAX_QUERIES Abfragen laufen oder
+    # dieselbe Abfrage QUERY_BUDGET_REPEAT_THRESHOLD mal wiederholt wird (N+1).
+    QUERY_BUDGET_MODE: str = "off"
+    QUERY_BUDGET_MAX_QUERIES: int = 10
+    QUERY_BUDGET_REPEAT_THRESHOLD: int = 5
+    
+    # Mitschnitt echter API-Anfragen für benchmarks.api.replay: Methode, Pfad,
+    # Query, anonymisierter Body, Status und Dauer als JSON-Zeilen. Bodies
+    # über CAPTURE_MAX_BODY_BYTES werden nur mit Größe vermerkt.
+    CAPTURE_ENABLED: bool = False
+    CAPTURE_PATH: str = "logs/requests.jsonl"
+    CAPTURE_SAMPLE_RATE: float = 1.0
+    CAPTURE_MAX_BODY_BYTES: int = 64 * 1024
+    CAPTURE_MAX_BYTES: int = 200 * 1024 * 1024
+    CAPTURE_BACKUP_COUNT: int = 3
     
     # Erste Superuser-Einstellungen
     FIRST_SUPERUSER: str = "admin@example.com"
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import queue
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+)
+from typing import Any, Dict, Optional
+
+from app.core.metrics import Counter, current_db_stats, registry, route_label
+
+DROPPED = registry.register(
+    Counter("access_log_dropped_total", "Verworfene Access-Log-Zeilen (Queue voll).")
+).labels()
+
+# Eigener Logger ohne Weitergabe an Root: Zugriffe landen nicht in app.log
+logger = logging.getLogger("app.access")
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler mit begrenzter Queue: Ist sie voll, wird die Zeile verworfen
+    und gezählt, statt die Anfrage auf den Schreib-Thread warten zu lassen.
+    """
+
+    def __init__(self, maxsize: int, counter: Any = DROPPED):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.counter = counter
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Die Nachricht ist bereits die fertige JSON-Zeile (ohne args/exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            self.counter.inc()
+
+
+class _BlockingStopQueueListener(QueueListener):
+    """
+    ``stop()`` wartet auf Platz für das Ende-Signal; ``put_nowait`` würde bei
+    voller Queue mit ``queue.Full`` abbrechen und den Thread weiterlaufen lassen.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def file_handler(
+    path: str, max_bytes: int, backup_count: int, rotate_when: Optional[str] = None
+) -> logging.Handler:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if rotate_when:
+        return TimedRotatingFileHandler(
+            path,
+            when=rotate_when,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True,
+            utc=True,
+        )
+    return RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True
+    )
+
+
+class BackgroundLog:
+    """
+    Schreibt die Zeilen eines Loggers in einem Hintergrund-Thread
+    (QueueListener) in eine Datei; ``stop()`` schreibt die Queue vorher leer.
+    """
+
+    def __init__(self, target: logging.Logger) -> None:
+        self.logger = target
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[_BlockingStopQueueListener] = None
+
+    def start_with(self, handler: logging.Handler, queue_size: int, counter: Any) -> None:
+        if self.listener is not None:
+            return
+        self.handler = DroppingQueueHandler(queue_size, counter)
+        self.listener = _BlockingStopQueueListener(self.handler.queue, handler)
+        self.logger.addHandler(self.handler)
+        self.listener.start()
+
+    def stop(self) -> None:
+        if self.listener is None:
+            return
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.logger.removeHandler(self.handler)
+        self.handler = self.listener = None
+
+
+class AccessLog(BackgroundLog):
+    def __init__(self) -> None:
+        super().__init__(logger)
+
+    def start(self, settings: Any) -> None:
+        handler = file_handler(
+            settings.ACCESS_LOG_PATH,
+            settings.ACCESS_LOG_MAX_BYTES,
+            settings.ACCESS_LOG_BACKUP_COUNT,
+            settings.ACCESS_LOG_ROTATE_WHEN,
+        )
+        self.start_with(handler, settings.ACCESS_LOG_QUEUE_SIZE, DROPPED)
+
+
+access_log = AccessLog()
+
+
+class AccessLogMiddleware:
+    """
+    Eine JSON-Zeile pro Anfrage: Route, Status, Dauer, Benutzer und
+    Datenbankanteil (aus den Metriken, falls aktiviert).
+
+    Erfolgreiche Anfragen (2xx) werden mit ``sample_rate_2xx`` gesampelt; die
+    Rate steht dann in der Zeile, damit Auswertungen hochrechnen können.
+    """
+
+    def __init__(self, app: Any, sample_rate_2xx: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate_2xx = sample_rate_2xx
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # request.state der Endpunkte ist dieses Dict (Benutzer-ID aus der Auth)
+        state = scope.setdefault("state", {})
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, state, status, time.perf_counter() - started)
+
+    def _log(
+        self, scope: Dict[str, Any], state: Dict[str, Any], status: int, elapsed: float
+    ) -> None:
+        sampled = 200 <= status < 300 and self.sample_rate_2xx < 1
+        if sampled and random.random() >= self.sample_rate_2xx:
+            return
+        entry: Dict[str, Any] = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "method": scope["method"],
+            "route": route_label(scope),
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 3),
+            "user_id": state.get("user_id"),
+        }
+        stats = current_db_stats()
+        if stats is not None:
+            entry["db_ms"] = round(stats.seconds * 1000, 3)
+            entry["db_queries"] = stats.queries
+        if sampled:
+            entry["sample_rate"] = self.sample_rate_2xx
+        logger.info(json.dumps(entry, separators=(",", ":")))
@@ -0,0 +1,42 @@
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth import (
+    check_active_user,
+    decode_access_token,
+    load_principal,
+    oauth2_scheme,
+    principal_from_claims,
+)
+from app.core.principal_cache import principal_cache
+from app.db.session import get_async_db
+from app.models.user import User
+from app.schemas.user import Principal
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    """
+    Wie ``get_current_user``, aber über die AsyncSession (Async-Modus).
+    """
+    token_data = decode_access_token(token)
+    principal = principal_from_claims(token_data) or principal_cache.get(token_data.sub)
+    if principal is None:
+        user = await db.get(User, token_data.sub) if token_data.sub is not None else None
+        principal = load_principal(user)
+    principal = check_active_user(principal)
+    request.state.user_id = principal.id
+    return principal
+
+
+async def get_current_active_superuser_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=400, detail="Der Benutzer hat nicht genügend Rechte"
+        )
+    return current_user
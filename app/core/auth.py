@@ -1,7 +1,6 @@
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import ValidationError
@@ -9,11 +8,11 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.user import User
-from app.core.security import ALGORITHM
+from app.core.principal_cache import principal_cache
+from app.core.security import ACCESS_TOKEN_TYPE, ALGORITHM
 from app.schemas.token import TokenPayload
+from app.schemas.user import Principal
 from app.config import settings
-# In app/core/auth.py hinzufügen
-from app.core.security import create_access_token
 
 # OAuth2-Authentifizierung
 oauth2_scheme = OAuth2PasswordBearer(
@@ -21,30 +20,98 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
+def decode_token(token: str, token_type: str = ACCESS_TOKEN_TYPE) -> TokenPayload:
+    """
+    Prüft Signatur, Ablauf und Typ eines Tokens. Tokens ohne "type" sind
+    Access-Tokens aus dem Standardmodus.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
         )
         token_data = TokenPayload(**payload)
     except (JWTError, ValidationError):
+        token_data = None
+    if token_data is None or (token_data.type or ACCESS_TOKEN_TYPE) != token_type:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Authentifizierung konnte nicht validiert werden",
         )
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if not user:
+    return token_data
+
+
+def decode_access_token(token: str) -> TokenPayload:
+    return decode_token(token, ACCESS_TOKEN_TYPE)
+
+
+def principal_from_claims(token_data: TokenPayload) -> Optional[Principal]:
+    """
+    Baut im Claims-Modus den Principal allein aus dem (signierten) Token.
+    """
+    if (
+        not settings.AUTH_CLAIMS_MODE
+        or token_data.type != ACCESS_TOKEN_TYPE
+        or token_data.sub is None
+        or token_data.is_superuser is None
+    ):
+        return None
+    return Principal.model_construct(
+        id=token_data.sub,
+        email=token_data.email,
+        is_active=bool(token_data.is_active),
+        is_superuser=token_data.is_superuser,
+    )
+
+
+def user_claims(user: User) -> Dict[str, Any]:
+    """
+    Claims für Access-Tokens im Claims-Modus.
+    """
+    return {
+        "email": user.email,
+        "is_active": bool(user.is_active),
+        "is_superuser": bool(user.is_superuser),
+    }
+
+
+def check_active_user(principal: Optional[Principal]) -> Principal:
+    if not principal:
         raise HTTPException(status_code=404, detail="Benutzer nicht gefunden")
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inaktiver Benutzer")
-    return user
+    return principal
+
+
+def load_principal(user: Optional[User]) -> Optional[Principal]:
+    """
+    Erzeugt den Principal für einen geladenen Benutzer und legt ihn im Cache ab.
+    """
+    if user is None:
+        return None
+    principal = Principal.model_validate(user, from_attributes=True)
+    principal_cache.set(principal.id, principal)
+    return principal
+
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    token_data = decode_access_token(token)
+    principal = principal_from_claims(token_data) or principal_cache.get(token_data.sub)
+    if principal is None:
+        user = db.query(User).filter(User.id == token_data.sub).first()
+        principal = load_principal(user)
+    principal = check_active_user(principal)
+    # Für das Access-Log
+    request.state.user_id = principal.id
+    return principal
 
 
 def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=400, detail="Der Benutzer hat nicht genügend Rechte"
@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, create_model
+
+from app.core.serialization import RowSerializer
+
+# Felder, die bei jeder Auswahl enthalten sind
+ALWAYS_INCLUDED = ("id",)
+
+
+def parse_fields(
+    value: Optional[str], schema: Type[BaseModel]
+) -> Optional[Tuple[str, ...]]:
+    """
+    Übersetzt ``fields=title,author`` in die Feldliste des Schemas (in dessen
+    Reihenfolge, ``id`` immer dabei). Ohne Angabe ``None`` = alle Felder.
+    """
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unbekannte Felder: {', '.join(sorted(unknown))}",
+        )
+    requested.update(ALWAYS_INCLUDED)
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def subset_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Erzeugt (einmal pro Feldkombination) ein Antwortschema mit nur ``fields``.
+    Validatoren des Ausgangsschemas werden nicht übernommen, die Werte kommen
+    bereits validiert aus der Datenbank.
+    """
+    return create_model(
+        f"{schema.__name__}_{'_'.join(fields)}",
+        __config__={"from_attributes": True},
+        **{
+            name: (schema.model_fields[name].annotation, schema.model_fields[name].default)
+            for name in fields
+        },
+    )
+
+
+@lru_cache(maxsize=256)
+def subset_serializer(
+    schema: Type[BaseModel], fields: Tuple[str, ...]
+) -> RowSerializer:
+    return RowSerializer(subset_schema(schema, fields))
+
+
+def subset_response(
+    schema: Type[BaseModel], fields: Tuple[str, ...], obj: Any, response: Response
+) -> Response:
+    """
+    JSON-Antwort für ein einzelnes Objekt mit nur den ausgewählten Feldern.
+    """
+    content = subset_schema(schema, fields).model_validate(obj).model_dump_json()
+    result = Response(content=content, media_type="application/json")
+    result.headers.raw.extend(response.headers.raw)
+    return result
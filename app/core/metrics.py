@@ -0,0 +1,374 @@
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Prometheus-Textformat, Version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+# Routen ohne Treffer (404) unter einem Label, damit beliebige Pfade nicht
+# beliebig viele Zeitreihen erzeugen
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    """
+    Basis der Metriken: Kindobjekte pro Label-Kombination werden einmal
+    angelegt und danach nur noch nachgeschlagen.
+    """
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self) -> Any:
+        ...
+
+    def labels(self, *values: str) -> Any:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def samples(self) -> List[Tuple[str, str, float]]:
+        ...
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [
+            (self.name, _format_labels(self.labelnames, values), child.value)
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+
+class GaugeFunction(_Metric):
+    """
+    Gauge, dessen Werte erst beim Abruf von ``/metrics`` ermittelt werden
+    (z.B. belegte Verbindungen eines Pools).
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        collect: Callable[[], Dict[Tuple[str, ...], float]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def _new_child(self) -> Any:
+        # Werte kommen nur aus collect, nicht über labels()
+        raise TypeError(f"{self.name}: GaugeFunction hat keine Kindobjekte")
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [
+            (self.name, _format_labels(self.labelnames, values), value)
+            for values, value in self.collect().items()
+        ]
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # Ein Zähler pro Bucket plus +Inf; kumuliert wird erst beim Abruf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames, values, f'le="{_format_value(float(bound))}"'
+                )
+                samples.append((f"{self.name}_bucket", labels, cumulative))
+            labels = _format_labels(self.labelnames, values)
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(
+    Counter(
+        "http_requests_total",
+        "Anzahl HTTP-Anfragen nach Methode, Route und Status.",
+        ["method", "route", "status"],
+    )
+)
+REQUEST_SECONDS = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Dauer der HTTP-Anfragen nach Methode und Route.",
+        ["method", "route"],
+    )
+)
+IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "Derzeit laufende HTTP-Anfragen.")
+).labels()
+REQUEST_QUERIES = registry.register(
+    Histogram(
+        "http_request_db_queries",
+        "Datenbankabfragen pro HTTP-Anfrage nach Methode und Route.",
+        ["method", "route"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_DB_SECONDS = registry.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Summe der Abfragezeit pro HTTP-Anfrage nach Methode und Route.",
+        ["method", "route"],
+        buckets=DB_SECONDS_BUCKETS,
+    )
+)
+
+REQUEST_SESSIONS = registry.register(
+    Histogram(
+        "http_request_db_sessions",
+        "Sessions mit Datenbankzugriff (begonnene Transaktionen) pro HTTP-Anfrage.",
+        ["method", "route"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+REQUEST_CHECKOUTS = registry.register(
+    Histogram(
+        "http_request_db_checkouts",
+        "Aus dem Pool geholte Verbindungen pro HTTP-Anfrage.",
+        ["method", "route"],
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+
+
+class RequestDBStats:
+    """
+    Datenbanknutzung der laufenden Anfrage. Das Objekt wird in den Threadpool
+    mitkopiert (contextvars), Abfragen in synchronen Endpunkten zählen also mit.
+    """
+
+    __slots__ = ("queries", "seconds", "sessions", "checkouts")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        self.sessions = 0
+        self.checkouts = 0
+
+
+_request_db: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db", default=None)
+
+
+def current_db_stats() -> Optional[RequestDBStats]:
+    return _request_db.get()
+
+
+def record_query(seconds: float) -> None:
+    """
+    Rechnet eine Abfrage der laufenden HTTP-Anfrage zu (falls es eine gibt).
+    """
+    stats = _request_db.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += seconds
+
+
+def record_session() -> None:
+    stats = _request_db.get()
+    if stats is not None:
+        stats.sessions += 1
+
+
+def record_checkout() -> None:
+    stats = _request_db.get()
+    if stats is not None:
+        stats.checkouts += 1
+
+
+_suffix_patterns: Dict[str, "re.Pattern[str]"] = {}
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """
+    Pfadvorlage der getroffenen Route inklusive Router-Präfix, z.B.
+    ``/api/v1/books/{id}``.
+
+    ``scope["route"].path`` enthält nur den Teil unterhalb von
+    ``include_router``; der Präfix ist der Teil des Pfads vor dem Stück, das
+    der reguläre Ausdruck der Route abdeckt.
+    """
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return UNMATCHED_ROUTE
+    suffix = _suffix_patterns.get(regex.pattern)
+    if suffix is None:
+        suffix = _suffix_patterns.setdefault(
+            regex.pattern, re.compile(regex.pattern.lstrip("^"))
+        )
+    path = scope["path"]
+    match = suffix.search(path)
+    prefix = path[: match.start()] if match else ""
+    return prefix + route.path
+
+
+class MetricsMiddleware:
+    """
+    ASGI-Middleware für Latenz, Status und Datenbankanteil pro Route.
+
+    Als reine ASGI-Middleware (statt ``BaseHTTPMiddleware``) ohne eigenen Task
+    pro Anfrage; Routen werden über ihre Vorlage (``/books/{id}``) erfasst.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestDBStats()
+        token = _request_db.set(stats)
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            _request_db.reset(token)
+            route = route_label(scope)
+            method = scope["method"]
+            REQUESTS.labels(method, route, str(status)).inc()
+            REQUEST_SECONDS.labels(method, route).observe(elapsed)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_SECONDS.labels(method, route).observe(stats.seconds)
+            REQUEST_SESSIONS.labels(method, route).observe(stats.sessions)
+            REQUEST_CHECKOUTS.labels(method, route).observe(stats.checkouts)
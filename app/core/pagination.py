@@ -0,0 +1,39 @@
+import base64
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(**keys: Any) -> str:
+    """
+    Kodiert die Sortierschlüssel der letzten Zeile einer Seite als opaken Cursor.
+    """
+    raw = json.dumps(keys, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], **expected: Any) -> Dict[str, Any]:
+    """
+    Dekodiert einen Cursor. Ein leerer Cursor steht für die erste Seite.
+
+    Über ``expected`` können Schlüssel festgelegt werden, die im Cursor den
+    angegebenen Wert haben müssen (z.B. ``owner_id``), damit ein Cursor nicht
+    für einen anderen Bereich wiederverwendet wird.
+    """
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        keys = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        keys = None
+    if (
+        not isinstance(keys, dict)
+        or not isinstance(keys.get("id"), int)
+        or any(keys.get(name) != value for name, value in expected.items())
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Ungültiger Cursor"
+        )
+    return keys
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+
+class PasswordPoolBusy(Exception):
+    """
+    Warteschlange des Hashing-Pools ist voll; der Aufrufer soll es später erneut
+    versuchen (HTTP 503 mit Retry-After).
+    """
+
+
+class PasswordHashPool:
+    """
+    Eigener Prozess-Pool für bcrypt mit begrenzter Warteschlange.
+
+    Hashing blockiert so weder die Event-Loop noch den Threadpool von Starlette.
+    Ist der Pool mit ``workers + queue_size`` Aufträgen ausgelastet, wird sofort
+    ``PasswordPoolBusy`` ausgelöst statt weiter Arbeit anzustauen. Mit
+    ``workers = 0`` wird ohne Prozess-Pool gerechnet (``run`` im Threadpool,
+    nie auf der Event-Loop); die Begrenzung gilt auch dann.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max(workers + queue_size, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _acquire(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordPoolBusy()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run_sync(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers > 0:
+            return self.submit(fn, *args).result()
+        self._acquire()
+        try:
+            return fn(*args)
+        finally:
+            self._slots.release()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers > 0:
+            return await asyncio.wrap_future(self.submit(fn, *args))
+        self._acquire()
+        try:
+            return await run_in_threadpool(fn, *args)
+        finally:
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
@@ -1,20 +1,34 @@
+import secrets
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Tuple, Union, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.config import settings
+from app.core.password_pool import password_pool
 
-# Passwort-Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Passwort-Hashing; Hashes mit anderen Kosten werden beim Login erneuert
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+# Vergleichshash für unbekannte E-Mails, beim ersten Bedarf berechnet
+_dummy_hash: Optional[str] = None
 
 # JWT Token
 ALGORITHM = "HS256"
 
 
+# Token-Typen im Claim "type"
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
+
+
 def create_access_token(
-    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+    subject: Union[str, Any],
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -23,13 +37,83 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    if claims:
+        to_encode.update(claims, type=ACCESS_TOKEN_TYPE)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def create_refresh_token(
+    subject: Union[str, Any], expires_delta: Optional[timedelta] = None
+) -> str:
+    expire = datetime.utcnow() + (
+        expires_delta or timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
+    )
+    to_encode = {"exp": expire, "sub": str(subject), "type": REFRESH_TOKEN_TYPE}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+# Die folgenden Funktionen laufen in den Prozessen des Hashing-Pools
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return password_pool.run_sync(_verify, plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return password_pool.run_sync(_hash, password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(_hash, password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    Prüft ein Passwort und liefert ggf. einen neuen Hash mit den aktuellen
+    bcrypt-Kosten. Ohne Hash (unbekannter Benutzer) wird gegen einen
+    Vergleichshash geprüft, damit die Antwortzeit nichts verrät. Der erste
+    solche Login berechnet den Vergleichshash stattdessen (gleiche Kosten wie
+    eine Prüfung), jeder Login bezahlt so genau einen bcrypt-Lauf.
+    """
+    global _dummy_hash
+    if hashed_password is None:
+        if _dummy_hash is None:
+            _dummy_hash = get_password_hash(secrets.token_urlsafe(16))
+        else:
+            password_pool.run_sync(_verify, plain_password, _dummy_hash)
+        return False, None
+    return password_pool.run_sync(_verify_and_update, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    Async-Variante von ``verify_and_update_password``, wartet auf den Pool
+    ohne einen Thread zu belegen.
+    """
+    global _dummy_hash
+    if hashed_password is None:
+        if _dummy_hash is None:
+            _dummy_hash = await get_password_hash_async(secrets.token_urlsafe(16))
+        else:
+            await password_pool.run(_verify, plain_password, _dummy_hash)
+        return False, None
+    return await password_pool.run(_verify_and_update, plain_password, hashed_password)
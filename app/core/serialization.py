@@ -0,0 +1,96 @@
+import json
+import typing
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+Encoder = Callable[[Any], str]
+
+_encode_str = json.encoder.c_encode_basestring or json.encoder.py_encode_basestring
+
+
+def _encode_int(value: Any) -> str:
+    return "null" if value is None else str(int(value))
+
+
+def _encode_text(value: Any) -> str:
+    return "null" if value is None else _encode_str(value)
+
+
+def _encode_bool(value: Any) -> str:
+    if value is None:
+        return "null"
+    return "true" if value else "false"
+
+
+def _encode_date(value: Any) -> str:
+    return "null" if value is None else '"' + value.isoformat() + '"'
+
+
+def _encode_any(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _encoder_for(annotation: Any) -> Encoder:
+    """
+    Wählt den Encoder anhand der Feld-Annotation (``Optional[X]`` wie ``X``).
+    """
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if typing.get_origin(annotation) is typing.Union and len(args) == 1:
+        annotation = args[0]
+    if annotation is bool:
+        return _encode_bool
+    if annotation is int:
+        return _encode_int
+    if annotation in (date, datetime):
+        return _encode_date
+    if isinstance(annotation, type) and issubclass(annotation, str):
+        return _encode_text
+    # EmailStr und andere Zeichenketten-Typen werden als Text kodiert
+    if getattr(annotation, "__name__", "") == "EmailStr":
+        return _encode_text
+    return _encode_any
+
+
+class RowSerializer:
+    """
+    Serialisiert Zeilen (Tupel in Feldreihenfolge des Schemas) direkt zu JSON.
+
+    Schlüssel und Typ-Encoder werden einmal pro Schema vorbereitet; pro Zeile
+    entstehen weder ORM-Objekte noch Pydantic-Modelle. Die Ausgabe entspricht
+    Byte für Byte der kompakten JSON-Antwort von FastAPI für ``List[schema]``.
+    """
+
+    def __init__(self, schema: Type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.fields: List[str] = list(fields or schema.model_fields)
+        self._encoders: List[Tuple[str, Encoder]] = [
+            (_encode_str(name) + ":", _encoder_for(schema.model_fields[name].annotation))
+            for name in self.fields
+        ]
+
+    def row(self, values: Sequence[Any]) -> str:
+        return "{" + ",".join(
+            prefix + encode(value)
+            for (prefix, encode), value in zip(self._encoders, values)
+        ) + "}"
+
+    def dumps(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        row = self.row
+        return ("[" + ",".join([row(values) for values in rows]) + "]").encode()
+
+
+def rows_response(
+    serializer: RowSerializer,
+    rows: Sequence[Sequence[Any]],
+    response: Optional[Response] = None,
+) -> Response:
+    """
+    JSON-Antwort aus Zeilen; Header aus dem injizierten ``response`` (ETag,
+    Cursor) werden übernommen, wie FastAPI es sonst selbst tut.
+    """
+    result = Response(content=serializer.dumps(rows), media_type="application/json")
+    if response is not None:
+        result.headers.raw.extend(response.headers.raw)
+    return result
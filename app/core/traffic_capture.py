@@ -0,0 +1,237 @@
+import csv
+import hashlib
+import hmac
+import io
+import json
+import logging
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.access_log import BackgroundLog, file_handler
+from app.core.metrics import Counter, registry, route_label
+
+DROPPED = registry.register(
+    Counter("capture_dropped_total", "Verworfene Mitschnitt-Zeilen (Queue voll).")
+).labels()
+QUEUE_SIZE = 10000
+
+# Werte dieser Felder landen nie im Mitschnitt (JSON, NDJSON und Formulare)
+SENSITIVE_FIELDS = frozenset(
+    {"password", "email", "username", "access_token", "refresh_token", "token"}
+)
+# Gültig für die Schemas, damit Replays nicht schon an der Validierung scheitern
+ANONYMIZED_PASSWORD = "anonymisiert"
+ANONYMIZED_DOMAIN = "anonym.example.com"
+CSV_TYPES = frozenset({"text/csv"})
+NDJSON_TYPES = frozenset({"application/x-ndjson", "application/jsonl"})
+
+# E-Mail-Adressen in beliebigen Texten (Suchbegriffe, Beschreibungen, CSV)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+logger = logging.getLogger("app.capture")
+logger.propagate = False
+logger.setLevel(logging.INFO)
+
+
+def _pseudonym(email: str, key: bytes) -> str:
+    digest = hmac.new(key, email.lower().encode(), hashlib.sha256).hexdigest()[:16]
+    return f"{digest}@{ANONYMIZED_DOMAIN}"
+
+
+def anonymize(value: Any, key: bytes, field: Optional[str] = None) -> Any:
+    """
+    Ersetzt sensible Felder rekursiv und E-Mail-Adressen in allen übrigen
+    Texten. E-Mails werden per HMAC pseudonymisiert: dieselbe Adresse ergibt
+    im ganzen Mitschnitt dasselbe Pseudonym.
+    """
+    if isinstance(value, dict):
+        return {name: anonymize(item, key, name) for name, item in value.items()}
+    if isinstance(value, list):
+        return [anonymize(item, key, field) for item in value]
+    if not isinstance(value, str):
+        return value
+    if field not in SENSITIVE_FIELDS:
+        return EMAIL_PATTERN.sub(lambda match: _pseudonym(match.group(), key), value)
+    if field in ("email", "username"):
+        return _pseudonym(value, key)
+    if field == "password":
+        return ANONYMIZED_PASSWORD
+    return "***"
+
+
+def anonymize_query(query: str, key: bytes) -> str:
+    """
+    Query-String mit anonymisierten Parametern; unverändert, wenn es nichts
+    zu ersetzen gibt.
+    """
+    pairs = parse_qsl(query, keep_blank_values=True)
+    anonymized = [(name, anonymize(item, key, name)) for name, item in pairs]
+    return query if anonymized == pairs else urlencode(anonymized)
+
+
+def _anonymize_csv(text: str, key: bytes) -> str:
+    # Spalten wie Felder behandeln (Name aus der Kopfzeile)
+    rows = list(csv.reader(io.StringIO(text)))
+    header = rows[0] if rows else []
+    anonymized = [header] + [
+        [anonymize(cell, key, name) for name, cell in zip(header, row)] + row[len(header):]
+        for row in rows[1:]
+    ]
+    if anonymized == rows:
+        return text
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(anonymized)
+    return buffer.getvalue()
+
+
+def _anonymize_json(text: str, key: bytes) -> str:
+    # Unveränderte Dokumente bleiben byte-gleich (gleiche Antwort beim Replay)
+    value = json.loads(text)
+    anonymized = anonymize(value, key)
+    return text if anonymized == value else json.dumps(anonymized)
+
+
+def anonymize_body(body: bytes, content_type: str, key: bytes) -> Optional[str]:
+    """
+    Anonymisierter Body als Text; ``None`` für Formate, die nicht mitgeschnitten
+    werden (unbekannt, binär, kein gültiges JSON).
+    """
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    if content_type == "application/x-www-form-urlencoded":
+        pairs = parse_qsl(text, keep_blank_values=True)
+        return urlencode([(name, anonymize(item, key, name)) for name, item in pairs])
+    if content_type == "application/json":
+        try:
+            return _anonymize_json(text, key)
+        except ValueError:
+            return None
+    if content_type in NDJSON_TYPES:
+        lines = []
+        for line in text.splitlines():
+            try:
+                lines.append(_anonymize_json(line, key) if line.strip() else line)
+            except ValueError:
+                return None
+        return "\n".join(lines)
+    if content_type in CSV_TYPES:
+        try:
+            return _anonymize_csv(text, key)
+        except csv.Error:
+            return None
+    return None
+
+
+class TrafficCapture(BackgroundLog):
+    def __init__(self) -> None:
+        super().__init__(logger)
+
+    def start(self, settings: Any) -> None:
+        handler = file_handler(
+            settings.CAPTURE_PATH, settings.CAPTURE_MAX_BYTES, settings.CAPTURE_BACKUP_COUNT
+        )
+        self.start_with(handler, QUEUE_SIZE, DROPPED)
+
+
+traffic_capture = TrafficCapture()
+
+
+class TrafficCaptureMiddleware:
+    """
+    Schneidet Anfragen unter ``prefix`` für ``benchmarks.api.replay`` mit:
+    Methode, Pfad, Query, anonymisierter Body, Benutzer-ID, Status, Dauer und
+    ein Hash der Antwort (zum Erkennen abweichender Antworten beim Replay).
+
+    Authorization-Header werden nicht gespeichert; das Replay stellt für die
+    Benutzer-ID selbst ein Token aus. Query-Strings und Bodies laufen durch
+    ``anonymize``. Bodies über ``max_body_bytes`` werden
+    nur mit ihrer Größe vermerkt.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        prefix: str,
+        key: str,
+        sample_rate: float = 1.0,
+        max_body_bytes: int = 64 * 1024,
+    ) -> None:
+        self.app = app
+        self.prefix = prefix
+        self.key = key.encode()
+        self.sample_rate = sample_rate
+        self.max_body_bytes = max_body_bytes
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.prefix)
+            or (self.sample_rate < 1 and random.random() >= self.sample_rate)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        chunks: List[bytes] = []
+        body_bytes = 0
+        status = 500
+        response_bytes = 0
+        response_hash = hashlib.sha1()
+
+        async def capture_receive() -> Dict[str, Any]:
+            nonlocal body_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_bytes += len(chunk)
+                if body_bytes <= self.max_body_bytes:
+                    chunks.append(chunk)
+            return message
+
+        async def capture_send(message: Dict[str, Any]) -> None:
+            nonlocal status, response_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                response_bytes += len(chunk)
+                response_hash.update(chunk)
+            await send(message)
+
+        state = scope.setdefault("state", {})
+        ts = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            elapsed = time.perf_counter() - started
+            headers = dict(scope["headers"])
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+            entry: Dict[str, Any] = {
+                "ts": ts.isoformat(timespec="microseconds"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": anonymize_query(scope["query_string"].decode("latin-1"), self.key),
+                "route": route_label(scope),
+                "user_id": state.get("user_id"),
+                "status": status,
+                "duration_ms": round(elapsed * 1000, 3),
+                "response_bytes": response_bytes,
+                "response_sha1": response_hash.hexdigest(),
+            }
+            if content_type:
+                entry["content_type"] = content_type
+            if b"if-none-match" in headers:
+                entry["if_none_match"] = headers[b"if-none-match"].decode("latin-1")
+            if body_bytes:
+                entry["body_bytes"] = body_bytes
+                entry["body"] = None
+                if body_bytes <= self.max_body_bytes:
+                    media_type = content_type.split(";")[0].strip()
+                    entry["body"] = anonymize_body(b"".join(chunks), media_type, self.key)
+            logger.info(json.dumps(entry, separators=(",", ":")))
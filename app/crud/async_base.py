@@ -0,0 +1,120 @@
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import select_rows
+from app.db.session import Base
+
+ModelType = TypeVar("ModelType", bound=Base)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    def __init__(self, model: Type[ModelType]):
+        """
+        Async-Gegenstück zu ``CRUDBase`` auf Basis von ``AsyncSession``.
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        result = await db.scalars(
+            select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+        )
+        return list(result)
+
+    async def get_multi_rows(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[Row]:
+        statement = select_rows(self.model, columns, **filters).order_by(self.model.id)
+        result = await db.execute(statement.offset(skip).limit(limit))
+        return result.all()
+
+    async def get_multi_keyset_rows(
+        self,
+        db: AsyncSession,
+        *,
+        columns: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[Row]:
+        statement = select_rows(self.model, columns, after_id=after_id, **filters)
+        result = await db.execute(statement.order_by(self.model.id).limit(limit))
+        return result.all()
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = await self._insert(db, obj_in.dict())
+        await db.commit()
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        changes = self.changed_columns(db_obj, update_data)
+        if not changes:
+            return db_obj
+        db_obj = await self._update(db, db_obj, changes)
+        await db.commit()
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        obj = await self._delete(db, id)
+        await db.commit()
+        return obj
+
+    def changed_columns(
+        self, db_obj: ModelType, update_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            field: update_data[field]
+            for field in self.model.__table__.columns.keys()
+            if field in update_data and getattr(db_obj, field) != update_data[field]
+        }
+
+    # Wie in CRUDBase: RETURNING statt refresh, ohne Commit
+
+    async def _insert(self, db: AsyncSession, values: Dict[str, Any]) -> ModelType:
+        result = await db.scalars(
+            insert(self.model).values(**values).returning(self.model)
+        )
+        return result.one()
+
+    async def _update(
+        self, db: AsyncSession, db_obj: ModelType, changes: Dict[str, Any]
+    ) -> ModelType:
+        result = await db.scalars(
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**changes)
+            .returning(self.model)
+        )
+        return result.one()
+
+    async def _delete(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        result = await db.scalars(
+            delete(self.model).where(self.model.id == id).returning(self.model)
+        )
+        return result.one_or_none()
@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.cache import MISS, book_cache
+from app.crud.crud_book import (
+    book_from_cache,
+    bump_versions_statement,
+    cache_book,
+    cache_key_id,
+    cache_key_isbn,
+    cache_keys,
+    detach_owner_statement,
+    get_version_statement,
+    projection,
+    raise_for_isbn_conflict,
+)
+from app.models.book import Book
+from app.schemas.book import BookCreate, BookUpdate
+
+
+class AsyncCRUDBook(AsyncCRUDBase[Book, BookCreate, BookUpdate]):
+    async def get(
+        self,
+        db: AsyncSession,
+        id: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        cached: bool = True,
+    ) -> Optional[Book]:
+        if not cached:
+            return await super().get(db, id)
+        key = cache_key_id(id)
+        data = book_cache.get(key)
+        if data is not MISS:
+            return await db.merge(book_from_cache(data), load=False) if data else None
+        if fields is not None:
+            result = await db.scalars(
+                select(Book).options(projection(fields)).where(Book.id == id)
+            )
+            return result.first()
+        generation = book_cache.generation()
+        obj = await super().get(db, id)
+        cache_book(key, obj, generation)
+        return obj
+
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: BookCreate, owner_id: int
+    ) -> Book:
+        try:
+            db_obj = await self._insert(db, dict(obj_in.dict(), owner_id=owner_id))
+        except IntegrityError as e:
+            await db.rollback()
+            raise_for_isbn_conflict(e)
+        await self.bump_versions(db, owner_id)
+        await db.commit()
+        book_cache.invalidate(cache_keys(ids=[db_obj.id], isbns=[db_obj.isbn]))
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Book,
+        obj_in: Union[BookUpdate, Dict[str, Any]]
+    ) -> Book:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        changes = self.changed_columns(db_obj, update_data)
+        if not changes:
+            return db_obj
+        old_isbn, old_owner_id = db_obj.isbn, db_obj.owner_id
+        try:
+            db_obj = await self._update(db, db_obj, changes)
+        except IntegrityError as e:
+            await db.rollback()
+            raise_for_isbn_conflict(e)
+        await self.bump_versions(db, old_owner_id, db_obj.owner_id)
+        await db.commit()
+        book_cache.invalidate(
+            cache_keys(ids=[db_obj.id], isbns={old_isbn, db_obj.isbn})
+        )
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[Book]:
+        obj = await self._delete(db, id)
+        if obj is None:
+            return None
+        await self.bump_versions(db, obj.owner_id)
+        await db.commit()
+        book_cache.invalidate(cache_keys(ids=[id], isbns=[obj.isbn]))
+        return obj
+
+    async def detach_owner(self, db: AsyncSession, *, owner_id: int) -> List[str]:
+        rows = (await db.execute(detach_owner_statement(owner_id))).all()
+        if rows:
+            await self.bump_versions(db, owner_id)
+        return cache_keys(ids=[id for id, _ in rows], isbns=[isbn for _, isbn in rows])
+
+    async def bump_versions(self, db: AsyncSession, *owner_ids: Optional[int]) -> None:
+        await db.execute(bump_versions_statement(owner_ids))
+
+    async def get_version(
+        self, db: AsyncSession, *, owner_id: Optional[int] = None
+    ) -> int:
+        return await db.scalar(get_version_statement(owner_id)) or 0
+
+    async def get_multi_by_owner(
+        self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Book]:
+        result = await db.scalars(
+            select(Book)
+            .where(Book.owner_id == owner_id)
+            .order_by(Book.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result)
+
+    async def get_by_isbn(
+        self,
+        db: AsyncSession,
+        *,
+        isbn: str,
+        fields: Optional[Sequence[str]] = None,
+        cached: bool = True,
+    ) -> Optional[Book]:
+        if not cached:
+            result = await db.scalars(select(Book).where(Book.isbn == isbn))
+            return result.first()
+        key = cache_key_isbn(isbn)
+        data = book_cache.get(key)
+        if data is not MISS:
+            return await db.merge(book_from_cache(data), load=False) if data else None
+        if fields is not None:
+            result = await db.scalars(
+                select(Book).options(projection(fields)).where(Book.isbn == isbn)
+            )
+            return result.first()
+        generation = book_cache.generation()
+        result = await db.scalars(select(Book).where(Book.isbn == isbn))
+        obj = result.first()
+        cache_book(key, obj, generation)
+        return obj
+
+
+book = AsyncCRUDBook(Book)
@@ -0,0 +1,76 @@
+from typing import Any, Dict, Optional, Union
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash_async
+from app.crud.async_base import AsyncCRUDBase
+from app.crud.async_crud_book import book as crud_book
+from app.crud.cache import book_cache
+from app.crud.crud_user import raise_for_email_conflict
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.scalars(select(User).where(User.email == email))
+        return result.first()
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        # bcrypt läuft im Hashing-Pool und blockiert die Event-Loop nicht
+        hashed_password = await get_password_hash_async(obj_in.password)
+        values = {
+            "email": obj_in.email,
+            "hashed_password": hashed_password,
+            "is_superuser": obj_in.is_superuser,
+        }
+        try:
+            db_obj = await self._insert(db, values)
+        except IntegrityError as e:
+            await db.rollback()
+            raise_for_email_conflict(e)
+        await db.commit()
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: User,
+        obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        if "password" in update_data and update_data["password"]:
+            hashed_password = await get_password_hash_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        try:
+            db_obj = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        except IntegrityError as e:
+            await db.rollback()
+            raise_for_email_conflict(e)
+        principal_cache.invalidate(db_obj.id)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        book_keys = await crud_book.detach_owner(db, owner_id=id)
+        obj = await self._delete(db, id)
+        await db.commit()
+        book_cache.invalidate(book_keys)
+        principal_cache.invalidate(id)
+        return obj
+
+    def is_active(self, user: User) -> bool:
+        return user.is_active
+
+    def is_superuser(self, user: User) -> bool:
+        return user.is_superuser
+
+
+user = AsyncCRUDUser(User)
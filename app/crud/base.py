@@ -1,7 +1,8 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Select, delete, insert, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.db.session import Base
@@ -11,6 +12,26 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def select_rows(
+    model: Type[Base],
+    columns: Sequence[str],
+    *,
+    after_id: Optional[int] = None,
+    **filters: Any,
+) -> Select:
+    """
+    Core-``select`` der Spalten ``columns`` mit Gleichheitsfiltern, ohne ORM.
+    Mit ``after_id`` nur Zeilen mit größerer ``id`` (Keyset).
+    """
+    table = model.__table__
+    statement = select(*(table.c[name] for name in columns))
+    for name, value in filters.items():
+        statement = statement.where(table.c[name] == value)
+    if after_id is not None:
+        statement = statement.where(table.c.id > after_id)
+    return statement
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -24,14 +45,44 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        query = db.query(self.model).order_by(self.model.id)
+        return query.offset(skip).limit(limit).all()
+
+    def get_multi_rows(
+        self,
+        db: Session,
+        *,
+        columns: Sequence[str],
+        skip: int = 0,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[Row]:
+        """
+        Wie ``get_multi``, liefert aber Tupel statt ORM-Objekten (kein
+        Identity-Map-Aufwand) für die direkte Serialisierung.
+        """
+        statement = select_rows(self.model, columns, **filters).order_by(self.model.id)
+        return db.execute(statement.offset(skip).limit(limit)).all()
+
+    def get_multi_keyset_rows(
+        self,
+        db: Session,
+        *,
+        columns: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: int = 100,
+        **filters: Any,
+    ) -> List[Row]:
+        """
+        Seitenweises Lesen per Keyset (Seek auf ``id``) als Tupel: die Kosten
+        einer Seite hängen nicht davon ab, wie weit hinten sie liegt.
+        """
+        statement = select_rows(self.model, columns, after_id=after_id, **filters)
+        return db.execute(statement.order_by(self.model.id).limit(limit)).all()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        db_obj = self._insert(db, obj_in.dict())
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def update(
@@ -41,21 +92,55 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
+        changes = self.changed_columns(db_obj, update_data)
+        if not changes:
+            return db_obj
+        db_obj = self._update(db, db_obj, changes)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
+    def remove(self, db: Session, *, id: int) -> Optional[ModelType]:
+        obj = self._delete(db, id)
         db.commit()
-        return obj
\ No newline at end of file
+        return obj
+
+    def changed_columns(
+        self, db_obj: ModelType, update_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Spalten aus ``update_data``, deren Wert sich tatsächlich ändert.
+        """
+        return {
+            field: update_data[field]
+            for field in self.model.__table__.columns.keys()
+            if field in update_data and getattr(db_obj, field) != update_data[field]
+        }
+
+    # Schreibzugriffe mit RETURNING: eine Anweisung pro Zugriff, das Objekt kommt
+    # vollständig aus der Datenbank zurück (kein ``refresh`` nach dem Commit).
+    # Die Helfer committen nicht, damit Unterklassen weitere Änderungen in
+    # derselben Transaktion unterbringen können.
+
+    def _insert(self, db: Session, values: Dict[str, Any]) -> ModelType:
+        return db.scalars(
+            insert(self.model).values(**values).returning(self.model)
+        ).one()
+
+    def _update(
+        self, db: Session, db_obj: ModelType, changes: Dict[str, Any]
+    ) -> ModelType:
+        return db.scalars(
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**changes)
+            .returning(self.model)
+        ).one()
+
+    def _delete(self, db: Session, id: Any) -> Optional[ModelType]:
+        return db.scalars(
+            delete(self.model).where(self.model.id == id).returning(self.model)
+        ).one_or_none()
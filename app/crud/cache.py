@@ -0,0 +1,213 @@
+import importlib
+from abc import ABC, abstractmethod
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+
+# Platzhalter für "nicht vorhanden" (negativer Eintrag); ein leeres Dict lässt
+# sich auch in geteilten Caches problemlos serialisieren.
+NOT_FOUND: Dict[str, Any] = {}
+
+# Rückgabewert von EntityCache.get, wenn der Schlüssel nicht im Cache ist
+MISS = object()
+
+
+class CacheBackend(ABC):
+    """
+    Schnittstelle für Cache-Backends. Werte sind Dicts mit Spaltenwerten.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class NullBackend(CacheBackend):
+    """
+    Backend ohne Speicher (Cache abgeschaltet).
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def size(self) -> Optional[int]:
+        return 0
+
+
+class InMemoryLRUBackend(CacheBackend):
+    """
+    Begrenzter LRU-Cache mit TTL pro Eintrag (pro Prozess).
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class EntityCache:
+    """
+    Read-Through-Cache für Zeilen einer Tabelle.
+
+    Gefundene Zeilen werden ``ttl`` Sekunden gehalten, nicht gefundene als
+    negativer Eintrag ``negative_ttl`` Sekunden. Schreibzugriffe müssen die
+    betroffenen Schlüssel nach dem Commit über ``invalidate`` entfernen.
+
+    Jedes ``invalidate`` erhöht die Generation. Wer nach einem Miss liest,
+    merkt sich vorher ``generation()`` und übergibt sie an ``store``; lag
+    dazwischen ein Schreibzugriff, wird die womöglich veraltete Zeile
+    verworfen statt abgelegt. Das gilt nur innerhalb eines Prozesses.
+    """
+
+    def __init__(self, backend: CacheBackend, *, ttl: float, negative_ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """
+        Liefert das Dict der Zeile, ``None`` für einen negativen Eintrag oder
+        ``MISS``, wenn der Schlüssel nicht im Cache ist.
+        """
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return MISS
+        return self._hit(value)
+
+    def _hit(self, value: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if value == NOT_FOUND:
+            self.negative_hits += 1
+            return None
+        self.hits += 1
+        return value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def store(
+        self, key: str, value: Optional[Dict[str, Any]], generation: Optional[int] = None
+    ) -> None:
+        """
+        Legt ``value`` ab; mit ``generation`` nur, wenn seitdem nichts
+        invalidiert wurde.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if value is None:
+                self.backend.set(key, NOT_FOUND, self.negative_ttl)
+            else:
+                self.backend.set(key, value, self.ttl)
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if keys:
+            with self._lock:
+                self._generation += 1
+                self.backend.delete(*keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            "size": self.backend.size(),
+            "maxsize": getattr(self.backend, "maxsize", None),
+            "ttl_seconds": self.ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+        }
+
+
+def create_backend(name: str, maxsize: int) -> CacheBackend:
+    """
+    Erzeugt ein Backend aus der Konfiguration ("memory", "none" oder
+    "modul:Klasse"; die Klasse wird ohne Argumente instanziiert).
+    """
+    if name == "memory":
+        return InMemoryLRUBackend(maxsize)
+    if name == "none":
+        return NullBackend()
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unbekanntes Cache-Backend: {name}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+book_cache = EntityCache(
+    create_backend(settings.BOOK_CACHE_BACKEND, settings.BOOK_CACHE_SIZE),
+    ttl=settings.BOOK_CACHE_TTL_SECONDS,
+    negative_ttl=settings.BOOK_CACHE_NEGATIVE_TTL_SECONDS,
+)
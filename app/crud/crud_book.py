@@ -1,36 +1,469 @@
-from typing import List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, insert, select, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only, make_transient_to_detached
 
 from app.crud.base import CRUDBase
+from app.crud.cache import MISS, book_cache
+from app.db.book_stats import (
+    DIMENSION_AUTHOR,
+    DIMENSION_OWNER,
+    DIMENSION_TOTAL,
+    DIMENSION_YEAR,
+)
+from app.db.fts import FTS_TABLE, match_expression
+from app.exceptions import BookAlreadyExistsException
 from app.models.book import Book
+from app.models.book_stat import BookStat
+from app.models.book_version import BookVersion
 from app.schemas.book import BookCreate, BookUpdate
 
+# Versionszähler für die Sicht über alle Besitzer
+ALL_OWNERS = 0
+
+
+def bump_versions_statement(owner_ids: Iterable[Optional[int]]):
+    """
+    UPSERT, das die Versionszähler der Besitzer und den globalen Zähler erhöht.
+    """
+    keys = sorted({owner_id for owner_id in owner_ids if owner_id is not None} | {ALL_OWNERS})
+    statement = sqlite_insert(BookVersion).values(
+        [{"owner_id": key, "version": 1} for key in keys]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[BookVersion.owner_id],
+        set_={"version": BookVersion.version + 1},
+    )
+
+
+def get_version_statement(owner_id: Optional[int]):
+    return select(BookVersion.version).where(
+        BookVersion.owner_id == (ALL_OWNERS if owner_id is None else owner_id)
+    )
+
+
+def detach_owner_statement(owner_id: int):
+    table = Book.__table__
+    return (
+        update(table)
+        .where(table.c.owner_id == owner_id)
+        .values(owner_id=None)
+        .returning(table.c.id, table.c.isbn)
+    )
+
+
+def cache_key_id(id: Any) -> str:
+    return f"book:id:{id}"
+
+
+def cache_key_isbn(isbn: str) -> str:
+    return f"book:isbn:{isbn}"
+
+
+def cache_keys(*, ids: Iterable[Any] = (), isbns: Iterable[Optional[str]] = ()) -> List[str]:
+    return [cache_key_id(id) for id in ids] + [
+        cache_key_isbn(isbn) for isbn in isbns if isbn
+    ]
+
+
+def cache_book(key: str, obj: Optional[Book], generation: int) -> None:
+    """
+    Legt ein geladenes Buch (oder ``None`` als negativen Eintrag unter ``key``)
+    im Cache ab; gefundene Bücher unter ID und ISBN. ``generation`` stammt aus
+    ``book_cache.generation()`` vor dem Lesen.
+    """
+    if obj is None:
+        book_cache.store(key, None, generation)
+        return
+    data = {column.key: getattr(obj, column.key) for column in Book.__table__.columns}
+    for cached_key in cache_keys(ids=[obj.id], isbns=[obj.isbn]):
+        book_cache.store(cached_key, data, generation)
+
+
+def is_isbn_conflict(error: IntegrityError) -> bool:
+    return "books.isbn" in str(error.orig)
+
+
+def raise_for_isbn_conflict(error: IntegrityError) -> NoReturn:
+    """
+    Übersetzt eine Verletzung des Unique-Constraints auf ``isbn`` in
+    ``BookAlreadyExistsException``; andere Fehler werden weitergereicht.
+    """
+    if is_isbn_conflict(error):
+        raise BookAlreadyExistsException() from error
+    raise error
+
+
+def book_from_cache(data: Dict[str, Any]) -> Book:
+    """
+    Baut aus einem Cache-Eintrag ein abgelöstes Book, das per
+    ``merge(load=False)`` ohne Abfrage an eine Session gehängt werden kann.
+    """
+    obj = Book(**data)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def projection(fields: Sequence[str]):
+    """
+    ``load_only`` für die ausgewählten Felder; ``owner_id`` wird für die
+    Berechtigungsprüfung immer mitgeladen.
+    """
+    return load_only(*(getattr(Book, name) for name in {*fields, "id", "owner_id"}))
+
 
 class CRUDBook(CRUDBase[Book, BookCreate, BookUpdate]):
+    def get(
+        self,
+        db: Session,
+        id: Any,
+        *,
+        fields: Optional[Sequence[str]] = None,
+        cached: bool = True,
+    ) -> Optional[Book]:
+        """
+        Mit ``fields`` werden bei einem Cache-Miss nur diese Spalten gelesen;
+        solche Teilobjekte landen nicht im Cache. Schreibpfade lesen mit
+        ``cached=False`` immer aus der Datenbank (Berechtigung und Änderungen
+        nie gegen eine womöglich veraltete Kopie prüfen).
+        """
+        if not cached:
+            return super().get(db, id)
+        key = cache_key_id(id)
+        data = book_cache.get(key)
+        if data is not MISS:
+            return db.merge(book_from_cache(data), load=False) if data else None
+        if fields is not None:
+            return (
+                db.query(Book).options(projection(fields)).filter(Book.id == id).first()
+            )
+        generation = book_cache.generation()
+        obj = super().get(db, id)
+        cache_book(key, obj, generation)
+        return obj
+
     def create_with_owner(
         self, db: Session, *, obj_in: BookCreate, owner_id: int
     ) -> Book:
-        obj_in_data = obj_in.dict()
-        db_obj = Book(**obj_in_data, owner_id=owner_id)
-        db.add(db_obj)
+        try:
+            db_obj = self._insert(db, dict(obj_in.dict(), owner_id=owner_id))
+        except IntegrityError as e:
+            db.rollback()
+            raise_for_isbn_conflict(e)
+        self.bump_versions(db, owner_id)
         db.commit()
-        db.refresh(db_obj)
+        # Negative Einträge für ID und ISBN entfernen
+        book_cache.invalidate(cache_keys(ids=[db_obj.id], isbns=[db_obj.isbn]))
+        return db_obj
+
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Book,
+        obj_in: Union[BookUpdate, Dict[str, Any]]
+    ) -> Book:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict(exclude_unset=True)
+        # db_obj muss aus der Datenbank stammen (get(cached=False)), sonst
+        # entscheidet eine veraltete Kopie, ob geschrieben wird
+        changes = self.changed_columns(db_obj, update_data)
+        if not changes:
+            return db_obj
+        old_isbn, old_owner_id = db_obj.isbn, db_obj.owner_id
+        try:
+            db_obj = self._update(db, db_obj, changes)
+        except IntegrityError as e:
+            db.rollback()
+            raise_for_isbn_conflict(e)
+        self.bump_versions(db, old_owner_id, db_obj.owner_id)
+        db.commit()
+        book_cache.invalidate(
+            cache_keys(ids=[db_obj.id], isbns={old_isbn, db_obj.isbn})
+        )
         return db_obj
 
+    def remove(self, db: Session, *, id: int) -> Optional[Book]:
+        obj = self._delete(db, id)
+        if obj is None:
+            return None
+        self.bump_versions(db, obj.owner_id)
+        db.commit()
+        book_cache.invalidate(cache_keys(ids=[id], isbns=[obj.isbn]))
+        return obj
+
+    def detach_owner(self, db: Session, *, owner_id: int) -> List[str]:
+        """
+        Entfernt den Besitzer von seinen Büchern (beim Löschen eines Benutzers),
+        ohne zu committen. Liefert die danach zu invalidierenden Cache-Schlüssel.
+        """
+        rows = db.execute(detach_owner_statement(owner_id)).all()
+        if rows:
+            self.bump_versions(db, owner_id)
+        return cache_keys(ids=[id for id, _ in rows], isbns=[isbn for _, isbn in rows])
+
+    def get_owners(
+        self, db: Session, *, ids: Iterable[int]
+    ) -> Dict[int, Tuple[Optional[int], Optional[str]]]:
+        """
+        Besitzer und ISBN der vorhandenen Bücher aus ``ids`` (eine Abfrage).
+        """
+        ids = list(ids)
+        if not ids:
+            return {}
+        rows = db.execute(
+            select(Book.id, Book.owner_id, Book.isbn).where(Book.id.in_(ids))
+        )
+        return {id: (owner_id, isbn) for id, owner_id, isbn in rows}
+
+    def get_ids_by_isbn(self, db: Session, *, isbns: Iterable[str]) -> Dict[str, int]:
+        isbns = list(isbns)
+        if not isbns:
+            return {}
+        rows = db.execute(select(Book.isbn, Book.id).where(Book.isbn.in_(isbns)))
+        return {isbn: id for isbn, id in rows}
+
+    def update_multi(
+        self,
+        db: Session,
+        *,
+        patches: Dict[int, Dict[str, Any]],
+        old_isbns: Iterable[Optional[str]] = (),
+    ) -> List[Book]:
+        """
+        Ändert viele Bücher in einer Transaktion: ein UPDATE pro Spaltenkombination
+        (executemany nach Primärschlüssel), danach ein SELECT für das Ergebnis.
+        Inzwischen gelöschte Bücher fehlen im Ergebnis (Core-UPDATE statt
+        ORM-Bulk-Update, das dafür StaleDataError wirft).
+        ``old_isbns`` sind die bisherigen ISBNs, deren Cache-Einträge verfallen.
+        """
+        if not patches:
+            return []
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for id, patch in patches.items():
+            if patch:
+                # Bind-Namen mit Präfix: Spaltennamen sind im UPDATE reserviert
+                params = {f"v_{key}": value for key, value in patch.items()}
+                groups.setdefault(tuple(sorted(patch)), []).append(dict(params, b_id=id))
+        table = Book.__table__
+        try:
+            for columns, params in groups.items():
+                db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"))
+                    .values({column: bindparam(f"v_{column}") for column in columns}),
+                    params,
+                )
+        except IntegrityError as e:
+            db.rollback()
+            raise_for_isbn_conflict(e)
+        books = db.scalars(
+            select(Book)
+            .where(Book.id.in_(list(patches)))
+            .order_by(Book.id)
+            .execution_options(populate_existing=True)
+        ).all()
+        if groups:
+            self.bump_versions(db, *{obj.owner_id for obj in books})
+        db.commit()
+        book_cache.invalidate(
+            cache_keys(
+                ids=patches, isbns={*old_isbns, *(obj.isbn for obj in books)}
+            )
+        )
+        return list(books)
+
+    def remove_multi(self, db: Session, *, ids: Iterable[int]) -> List[int]:
+        """
+        Löscht viele Bücher mit einem DELETE in einer Transaktion und liefert die
+        IDs der tatsächlich gelöschten Bücher.
+        """
+        ids = list(ids)
+        if not ids:
+            return []
+        table = Book.__table__
+        rows = db.execute(
+            delete(table)
+            .where(table.c.id.in_(ids))
+            .returning(table.c.id, table.c.owner_id, table.c.isbn)
+        ).all()
+        if rows:
+            self.bump_versions(db, *{owner_id for _, owner_id, _ in rows})
+        db.commit()
+        book_cache.invalidate(
+            cache_keys(ids=[id for id, _, _ in rows], isbns=[isbn for _, _, isbn in rows])
+        )
+        return [id for id, _, _ in rows]
+
+    def bump_versions(self, db: Session, *owner_ids: Optional[int]) -> None:
+        """
+        Erhöht die Versionszähler (für ETags) innerhalb der laufenden
+        Transaktion; committet nicht.
+        """
+        db.execute(bump_versions_statement(owner_ids))
+
+    def get_version(self, db: Session, *, owner_id: Optional[int] = None) -> int:
+        """
+        Versionszähler der Bücher eines Besitzers, ohne ``owner_id`` über alle.
+        """
+        return db.scalar(get_version_statement(owner_id)) or 0
+
+    def get_stats(self, db: Session, *, limit: int = 100) -> Dict[str, Any]:
+        """
+        Anzahl Bücher je Besitzer, Autor und Erscheinungsjahr (je die
+        ``limit`` größten Gruppen) aus den vorberechneten Zählungen; der
+        Aufwand hängt von der Zahl der Gruppen ab, nicht der Bücher.
+        """
+
+        def groups(dimension: str) -> List[Tuple[Optional[str], int]]:
+            rows = db.execute(
+                select(BookStat.key, BookStat.count)
+                .where(BookStat.dimension == dimension)
+                .order_by(BookStat.count.desc(), BookStat.key)
+                .limit(limit)
+            )
+            return [(key or None, count) for key, count in rows]
+
+        total = db.scalar(
+            select(BookStat.count).where(BookStat.dimension == DIMENSION_TOTAL)
+        )
+        return {
+            "total": total or 0,
+            "owners": [
+                {"owner_id": int(key) if key else None, "count": count}
+                for key, count in groups(DIMENSION_OWNER)
+            ],
+            "authors": [
+                {"author": key, "count": count} for key, count in groups(DIMENSION_AUTHOR)
+            ],
+            "years": [
+                {"year": int(key) if key else None, "count": count}
+                for key, count in groups(DIMENSION_YEAR)
+            ],
+        }
+
+    def create_multi_with_owner(
+        self, db: Session, *, objs_in: List[Dict[str, Any]], owner_id: int
+    ) -> None:
+        """
+        Legt viele Bücher mit einem executemany in einer Transaktion an.
+        """
+        if not objs_in:
+            return
+        ids = db.scalars(
+            insert(Book.__table__).returning(Book.__table__.c.id),
+            [dict(obj, owner_id=owner_id) for obj in objs_in],
+        ).all()
+        self.bump_versions(db, owner_id)
+        db.commit()
+        book_cache.invalidate(
+            cache_keys(ids=ids, isbns=(obj.get("isbn") for obj in objs_in))
+        )
+
     def get_multi_by_owner(
         self, db: Session, *, owner_id: int, skip: int = 0, limit: int = 100
     ) -> List[Book]:
         return (
             db.query(self.model)
             .filter(Book.owner_id == owner_id)
+            .order_by(Book.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
-        
-    def get_by_isbn(self, db: Session, *, isbn: str) -> Optional[Book]:
-        return db.query(Book).filter(Book.isbn == isbn).first()
+
+    def get_by_isbn(
+        self,
+        db: Session,
+        *,
+        isbn: str,
+        fields: Optional[Sequence[str]] = None,
+        cached: bool = True,
+    ) -> Optional[Book]:
+        if not cached:
+            return db.query(Book).filter(Book.isbn == isbn).first()
+        key = cache_key_isbn(isbn)
+        data = book_cache.get(key)
+        if data is not MISS:
+            return db.merge(book_from_cache(data), load=False) if data else None
+        if fields is not None:
+            query = db.query(Book).options(projection(fields))
+            return query.filter(Book.isbn == isbn).first()
+        generation = book_cache.generation()
+        obj = db.query(Book).filter(Book.isbn == isbn).first()
+        cache_book(key, obj, generation)
+        return obj
+
+    def get_existing_isbns(self, db: Session, *, isbns: Iterable[str]) -> Set[str]:
+        """
+        Liefert die ISBNs aus ``isbns``, die bereits vergeben sind (eine Abfrage).
+        """
+        isbns = list(isbns)
+        if not isbns:
+            return set()
+        return {isbn for (isbn,) in db.query(Book.isbn).filter(Book.isbn.in_(isbns))}
+
+    def iter_rows(
+        self,
+        db: Session,
+        *,
+        columns: Sequence[str],
+        owner_id: Optional[int] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Sequence[RowMapping]]:
+        """
+        Liest Bücher als Zeilen (ohne ORM-Objekte) in Blöcken von ``batch_size``.
+        Das Ergebnis wird per ``yield_per`` gestreamt, der Speicherbedarf bleibt
+        unabhängig von der Gesamtzahl der Zeilen konstant.
+        """
+        table = Book.__table__
+        statement = select(*(table.c[name] for name in columns)).order_by(table.c.id)
+        if owner_id is not None:
+            statement = statement.where(table.c.owner_id == owner_id)
+        result = db.execute(statement.execution_options(yield_per=batch_size))
+        yield from result.mappings().partitions()
+
+    def search(
+        self, db: Session, *, q: str, owner_id: Optional[int] = None, limit: int = 20
+    ) -> List[Book]:
+        """
+        Volltextsuche über Titel, Autor und Beschreibung, nach Relevanz sortiert.
+        Mit ``owner_id`` werden nur Bücher dieses Besitzers geliefert.
+        """
+        match = match_expression(q)
+        if match is None:
+            return []
+        owner_filter = "AND books.owner_id = :owner_id" if owner_id is not None else ""
+        statement = text(
+            f"""
+            SELECT books.* FROM {FTS_TABLE}
+            JOIN books ON books.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH :match {owner_filter}
+            ORDER BY {FTS_TABLE}.rank
+            LIMIT :limit
+            """
+        )
+        params = {"match": match, "limit": limit}
+        if owner_id is not None:
+            params["owner_id"] = owner_id
+        return db.query(Book).from_statement(statement).params(**params).all()
 
 
 book = CRUDBook(Book)
\ No newline at end of file
@@ -1,26 +1,49 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, NoReturn, Optional, Union
 
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.security import get_password_hash, verify_password
+from app.core.principal_cache import principal_cache
+from app.core.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_and_update_password_async,
+)
 from app.crud.base import CRUDBase
+from app.crud.cache import book_cache
+from app.crud.crud_book import book as crud_book
+from app.exceptions import UserAlreadyExistsException
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
 
+def is_email_conflict(error: IntegrityError) -> bool:
+    return "users.email" in str(error.orig)
+
+
+def raise_for_email_conflict(error: IntegrityError) -> NoReturn:
+    if is_email_conflict(error):
+        raise UserAlreadyExistsException() from error
+    raise error
+
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
-            is_superuser=obj_in.is_superuser,
-        )
-        db.add(db_obj)
+        values = {
+            "email": obj_in.email,
+            "hashed_password": get_password_hash(obj_in.password),
+            "is_superuser": obj_in.is_superuser,
+        }
+        try:
+            db_obj = self._insert(db, values)
+        except IntegrityError as e:
+            db.rollback()
+            raise_for_email_conflict(e)
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def update(
@@ -34,14 +57,52 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             hashed_password = get_password_hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        try:
+            db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        except IntegrityError as e:
+            db.rollback()
+            raise_for_email_conflict(e)
+        principal_cache.invalidate(db_obj.id)
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Optional[User]:
+        # Wie die ORM-Kaskade zuvor: Bücher bleiben erhalten, verlieren aber
+        # ihren Besitzer
+        book_keys = crud_book.detach_owner(db, owner_id=id)
+        obj = self._delete(db, id)
+        db.commit()
+        book_cache.invalidate(book_keys)
+        principal_cache.invalidate(id)
+        return obj
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
-        if not user:
+        verified, new_hash = verify_and_update_password(
+            password, user.hashed_password if user else None
+        )
+        if not user or not verified:
             return None
-        if not verify_password(password, user.hashed_password):
+        if new_hash:
+            user = self.update(db, db_obj=user, obj_in={"hashed_password": new_hash})
+        return user
+
+    async def authenticate_async(
+        self, db: Session, *, email: str, password: str
+    ) -> Optional[User]:
+        """
+        Wie ``authenticate``, aber bcrypt läuft im Hashing-Pool, ohne dass der
+        Request währenddessen einen Thread belegt.
+        """
+        user = await run_in_threadpool(self.get_by_email, db, email=email)
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password if user else None
+        )
+        if not user or not verified:
             return None
+        if new_hash:
+            user = await run_in_threadpool(
+                self.update, db, db_obj=user, obj_in={"hashed_password": new_hash}
+            )
         return user
 
     def is_active(self, user: User) -> bool:
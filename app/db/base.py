@@ -1,3 +1,5 @@
 from app.db.session import Base
 from app.models.book import Book
+from app.models.book_stat import BookStat
+from app.models.book_version import BookVersion
 from app.models.user import User
\ No newline at end of file
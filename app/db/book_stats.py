@@ -0,0 +1,128 @@
+import logging
+from typing import List, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.sqlite import begin
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLE = "book_stats"
+
+DIMENSION_TOTAL = "total"
+DIMENSION_OWNER = "owner"
+DIMENSION_AUTHOR = "author"
+DIMENSION_YEAR = "year"
+
+# Schlüssel je Dimension als SQL-Ausdruck über eine Zeile von "books";
+# NULL wird zu '', weil NULL im Primärschlüssel keinen Konflikt auslöst
+_KEYS = [
+    (DIMENSION_TOTAL, "''"),
+    (DIMENSION_OWNER, "coalesce(CAST({row}.owner_id AS TEXT), '')"),
+    (DIMENSION_AUTHOR, "coalesce({row}.author, '')"),
+    (DIMENSION_YEAR, "coalesce(substr({row}.publication_date, 1, 4), '')"),
+]
+
+_TRIGGERS = ["books_stats_ai", "books_stats_ad", "books_stats_au"]
+
+
+def _keys(row: str, dimensions: Tuple[str, ...] = ()) -> List[Tuple[str, str]]:
+    return [
+        (dimension, key.format(row=row))
+        for dimension, key in _KEYS
+        if not dimensions or dimension in dimensions
+    ]
+
+
+def _add(row: str, delta: int, *dimensions: str) -> str:
+    values = ", ".join(
+        f"('{dimension}', {key}, {delta})" for dimension, key in _keys(row, dimensions)
+    )
+    return (
+        f"INSERT INTO {STATS_TABLE}(dimension, key, count) VALUES {values} "
+        "ON CONFLICT(dimension, key) DO UPDATE SET count = count + excluded.count;"
+    )
+
+
+def _prune(row: str, *dimensions: str) -> str:
+    # Nur die eben verringerten Gruppen prüfen (per Primärschlüssel), nicht die
+    # ganze Tabelle
+    groups = " OR ".join(
+        f"(dimension = '{dimension}' AND key = {key})"
+        for dimension, key in _keys(row, dimensions)
+    )
+    return f"DELETE FROM {STATS_TABLE} WHERE count <= 0 AND ({groups});"
+
+
+# Die Trigger laufen in der Transaktion des Schreibzugriffs auf "books" und
+# decken damit auch Massenoperationen ab, die am ORM vorbeigehen.
+_UPDATED = (DIMENSION_OWNER, DIMENSION_AUTHOR, DIMENSION_YEAR)
+_DDL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_stats_ai AFTER INSERT ON books BEGIN
+        {_add("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_stats_ad AFTER DELETE ON books BEGIN
+        {_add("old", -1)}
+        {_prune("old")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_stats_au
+    AFTER UPDATE OF owner_id, author, publication_date ON books BEGIN
+        {_add("old", -1, *_UPDATED)}
+        {_add("new", 1, *_UPDATED)}
+        {_prune("old", *_UPDATED)}
+    END
+    """,
+]
+
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_stats_triggers(bind: Union[Engine, Connection]) -> None:
+    """
+    Legt die Trigger für die Bücherstatistik an, falls sie noch nicht
+    existieren. Beim ersten Anlegen wird die Statistik einmalig aufgebaut.
+    """
+    if not _is_sqlite(bind):
+        logger.warning("Bücherstatistik benötigt SQLite-Trigger, wird nicht gepflegt")
+        return
+    with begin(bind) as conn:
+        names = ", ".join(f"'{name}'" for name in _TRIGGERS)
+        existing = conn.execute(
+            text(
+                "SELECT count(*) FROM sqlite_master "
+                f"WHERE type = 'trigger' AND name IN ({names})"
+            )
+        ).scalar()
+        for statement in _DDL:
+            conn.execute(text(statement))
+        if existing < len(_TRIGGERS):
+            _rebuild(conn)
+            logger.info("Bücherstatistik angelegt")
+
+
+def rebuild_book_stats(bind: Union[Engine, Connection]) -> None:
+    """
+    Baut die Bücherstatistik komplett aus der Tabelle "books" neu auf.
+    """
+    create_stats_triggers(bind)
+    with begin(bind) as conn:
+        _rebuild(conn)
+
+
+def _rebuild(conn: Connection) -> None:
+    conn.execute(text(f"DELETE FROM {STATS_TABLE}"))
+    for dimension, key in _keys("books"):
+        conn.execute(
+            text(
+                f"INSERT INTO {STATS_TABLE}(dimension, key, count) "
+                f"SELECT '{dimension}', {key}, count(*) FROM books GROUP BY 2"
+            )
+        )
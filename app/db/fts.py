@@ -0,0 +1,100 @@
+import logging
+import re
+from typing import Optional, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.sqlite import begin
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "books_fts"
+
+# Externer Inhalt: die FTS5-Tabelle speichert nur den Index, die Texte selbst
+# bleiben in "books". Die Trigger halten den Index bei jedem Schreibzugriff auf
+# "books" synchron - auch bei Massenoperationen, die am ORM vorbeigehen.
+_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, author, description,
+        content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, description
+    ON books BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, author, description)
+        VALUES ('delete', old.id, old.title, old.author, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, author, description)
+        VALUES (new.id, new.title, new.author, new.description);
+    END
+    """,
+    # Gewichtung für bm25: Titel vor Autor vor Beschreibung
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')",
+]
+
+
+def _is_sqlite(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def create_fts_index(bind: Union[Engine, Connection]) -> None:
+    """
+    Legt den Volltextindex samt Triggern an, falls er noch nicht existiert.
+    Bestehende Bücher werden beim ersten Anlegen einmalig indexiert.
+    """
+    if not _is_sqlite(bind):
+        logger.warning("Volltextsuche benötigt SQLite (FTS5), Index wird nicht angelegt")
+        return
+    with begin(bind) as conn:
+        created = not inspect(conn).has_table(FTS_TABLE)
+        for statement in _DDL:
+            conn.execute(text(statement))
+        if created:
+            _rebuild(conn)
+            logger.info("Volltextindex angelegt")
+
+
+def rebuild_fts_index(bind: Union[Engine, Connection]) -> None:
+    """
+    Baut den Volltextindex komplett aus der Tabelle "books" neu auf.
+    """
+    create_fts_index(bind)
+    with begin(bind) as conn:
+        _rebuild(conn)
+
+
+def _rebuild(conn: Connection) -> None:
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def match_expression(q: str) -> Optional[str]:
+    """
+    Übersetzt eine Benutzereingabe in einen FTS5-MATCH-Ausdruck.
+
+    Alle Wörter müssen vorkommen und werden in Anführungszeichen gesetzt, damit
+    Sonderzeichen der FTS5-Syntax nie als Operatoren interpretiert werden. Nur
+    das letzte Wort wird ab drei Zeichen als Präfix gesucht (Suche beim Tippen),
+    weil breite Präfixe die Zahl der zu bewertenden Treffer vervielfachen.
+    """
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    phrases = [f'"{term}"' for term in terms]
+    if len(terms[-1]) >= 3:
+        phrases[-1] += "*"
+    return " ".join(phrases)
@@ -1,24 +1,92 @@
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from app.db.base import Base
-from app.db.session import engine
+from app.config import settings
 from app.core.security import get_password_hash
+from app.db.base import Base
+from app.db.book_stats import create_stats_triggers
+from app.db.fts import create_fts_index
 from app.models.user import User
-from app.config import settings
 
+# Alembic-Revision, die dieser Code erwartet (Kopf von alembic/versions)
+SCHEMA_REVISION = "0004"
 
-def init_db(db: Session) -> None:
-    # Tabellen erstellen
-    Base.metadata.create_all(bind=engine)
-    
-    # Überprüfen, ob bereits ein Superuser existiert
-    user = db.query(User).filter(User.email == settings.FIRST_SUPERUSER).first()
-    if not user:
-        # Ersten Superuser erstellen
-        user_in = User(
-            email=settings.FIRST_SUPERUSER,
-            hashed_password=get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
-            is_superuser=True,
+STARTUP_CREATE = "create"
+STARTUP_CHECK = "check"
+STARTUP_SKIP = "skip"
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def create_schema(bind: Engine) -> None:
+    """
+    Legt fehlende Tabellen, den Volltextindex und die Statistik-Trigger an
+    (Entwicklung und Tests; in Produktion übernimmt das Alembic).
+    """
+    Base.metadata.create_all(bind=bind)
+    create_fts_index(bind)
+    create_stats_triggers(bind)
+
+
+def get_schema_revision(bind: Engine) -> Optional[str]:
+    # Ohne Tabelle alembic_version (leere Datenbank) gibt es keinen Stand
+    try:
+        with bind.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except OperationalError:
+        return None
+
+
+def check_schema(bind: Engine) -> None:
+    """
+    Prüft nur den gespeicherten Schema-Stand: eine Abfrage, keine Reflexion
+    der Tabellen und kein DDL.
+    """
+    revision = get_schema_revision(bind)
+    if revision != SCHEMA_REVISION:
+        raise SchemaVersionError(
+            f"Datenbankschema ist auf Stand {revision}, erwartet {SCHEMA_REVISION}. "
+            "Bitte 'alembic upgrade head' ausführen."
         )
-        db.add(user_in)
-        db.commit()
\ No newline at end of file
+
+
+def prepare_database(bind: Engine, mode: str) -> None:
+    """
+    Datenbank beim Start vorbereiten, je nach ``DB_STARTUP_MODE``.
+    """
+    if mode == STARTUP_CREATE:
+        create_schema(bind)
+    elif mode == STARTUP_CHECK:
+        check_schema(bind)
+    elif mode != STARTUP_SKIP:
+        raise ValueError(f"Unbekannter DB_STARTUP_MODE: {mode}")
+
+
+def create_first_superuser(db: Session) -> Optional[User]:
+    """
+    Legt den Superuser aus ``FIRST_SUPERUSER`` an, falls es ihn noch nicht
+    gibt. Liefert den neuen Benutzer, sonst ``None``.
+    """
+    user = db.query(User).filter(User.email == settings.FIRST_SUPERUSER).first()
+    if user:
+        return None
+    user = User(
+        email=settings.FIRST_SUPERUSER,
+        hashed_password=get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
+        is_superuser=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def init_db(db: Session) -> None:
+    # Schema anlegen und ersten Superuser erstellen
+    create_schema(db.get_bind())
+    create_first_superuser(db)
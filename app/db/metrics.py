@@ -0,0 +1,129 @@
+import time
+from typing import Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+from app.core.metrics import (
+    DB_SECONDS_BUCKETS,
+    POOL_WAIT_BUCKETS,
+    Counter,
+    GaugeFunction,
+    Histogram,
+    record_checkout,
+    record_query,
+    record_session,
+    registry,
+)
+
+QUERIES = registry.register(
+    Counter("db_queries_total", "Ausgeführte Datenbankabfragen.", ["engine"])
+)
+QUERY_ERRORS = registry.register(
+    Counter("db_query_errors_total", "Fehlgeschlagene Datenbankabfragen.", ["engine"])
+)
+QUERY_SECONDS = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Dauer einzelner Datenbankabfragen.",
+        ["engine"],
+        buckets=DB_SECONDS_BUCKETS,
+    )
+)
+CHECKOUT_SECONDS = registry.register(
+    Histogram(
+        "db_pool_checkout_seconds",
+        "Wartezeit auf eine Verbindung aus dem Pool (inkl. Verbindungsaufbau).",
+        ["engine"],
+        buckets=POOL_WAIT_BUCKETS,
+    )
+)
+
+_engines: Dict[str, Engine] = {}
+
+
+def _checked_out() -> Dict[Tuple[str, ...], float]:
+    # Nicht jeder Pool zählt ausgegebene Verbindungen (z.B. StaticPool)
+    return {
+        (name,): engine.pool.checkedout()
+        for name, engine in _engines.items()
+        if hasattr(engine.pool, "checkedout")
+    }
+
+
+registry.register(
+    GaugeFunction(
+        "db_pool_checked_out",
+        "Derzeit ausgegebene Verbindungen des Pools.",
+        ["engine"],
+        _checked_out,
+    )
+)
+
+
+def _time_checkout(pool: Pool, histogram) -> None:
+    # Der Pool bietet kein Ereignis vor dem Warten, daher wird connect() der
+    # Pool-Instanz umschlossen (nach dispose() neu, siehe engine_disposed)
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            histogram.observe(time.perf_counter() - started)
+            record_checkout()
+
+    pool.connect = timed_connect
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Zählt Abfragen und Abfragezeit der Engine (global und pro HTTP-Anfrage)
+    und misst die Wartezeit beim Auschecken aus dem Pool.
+    """
+    if name in _engines:
+        return
+    _engines[name] = engine
+    queries = QUERIES.labels(name)
+    errors = QUERY_ERRORS.labels(name)
+    seconds = QUERY_SECONDS.labels(name)
+    checkout = CHECKOUT_SECONDS.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info["metrics_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("metrics_started")
+        queries.inc()
+        seconds.observe(elapsed)
+        record_query(elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            context.connection.info.pop("metrics_started", None)
+        errors.inc()
+
+    @event.listens_for(engine, "engine_disposed")
+    def engine_disposed(engine):
+        _time_checkout(engine.pool, checkout)
+
+    _time_checkout(engine.pool, checkout)
+
+
+def instrument_sessions() -> None:
+    """
+    Zählt pro HTTP-Anfrage die Sessions, die eine Transaktion begonnen (also
+    eine Verbindung benutzt) haben; gilt für alle Sessions inkl. AsyncSession.
+    """
+    if not event.contains(Session, "after_begin", _after_begin):
+        event.listen(Session, "after_begin", _after_begin)
+
+
+def _after_begin(session, transaction, connection) -> None:
+    record_session()
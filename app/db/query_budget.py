@@ -0,0 +1,157 @@
+import logging
+import threading
+from collections import Counter
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+# Ab so vielen Ausführungen derselben Abfrage gilt sie als N+1-Verdacht. Feste
+# Auffächerungen wie /books/stats (eine Abfrage je Dimension) liegen darunter.
+REPEAT_THRESHOLD = 5
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog:
+    """
+    Abfragen einer Anfrage bzw. eines Testblocks (SQL und Parameter).
+    """
+
+    def __init__(self) -> None:
+        self.statements: List[Tuple[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, parameters: Any) -> None:
+        with self._lock:
+            self.statements.append((statement, parameters))
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> Dict[str, int]:
+        """
+        Abfragen mit identischem SQL, die mindestens ``threshold`` mal liefen
+        (SQL -> Anzahl); typisch für eine Schleife, die pro Objekt mit anderen
+        Parametern nachlädt (N+1).
+        """
+        counts = Counter(statement for statement, _ in self.statements)
+        return {statement: count for statement, count in counts.items() if count >= threshold}
+
+    def problems(
+        self,
+        max_queries: Optional[int] = None,
+        repeat_threshold: Optional[int] = REPEAT_THRESHOLD,
+    ) -> List[str]:
+        found = []
+        if max_queries is not None and len(self) > max_queries:
+            found.append(f"{len(self)} Abfragen (Budget {max_queries})")
+        if repeat_threshold is not None:
+            found.extend(
+                f"{count}x wiederholt: {_shorten(statement)}"
+                for statement, count in self.repeated(repeat_threshold).items()
+            )
+        return found
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + " …"
+
+
+# Pro HTTP-Anfrage (Middleware) und global für Testblöcke: der TestClient
+# führt die App in einem eigenen Thread aus, dort ist die ContextVar des Tests
+# nicht sichtbar
+_request_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+_recorders: List[QueryLog] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _request_log.get()
+    if log is not None:
+        log.add(statement, parameters)
+    for recorder in _recorders:
+        recorder.add(statement, parameters)
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+class query_budget(ContextDecorator):
+    """
+    Zeichnet alle Abfragen im Block auf (auch aus anderen Threads) und schlägt
+    fehl, wenn es mehr als ``max_queries`` sind oder eine Abfrage nach N+1
+    aussieht. Als Kontextmanager liefert es das ``QueryLog``::
+
+        with query_budget(2):
+            client.get("/api/v1/books/")
+
+    Die Engines müssen per ``instrument_engine`` angemeldet sein.
+    """
+
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        *,
+        repeat_threshold: Optional[int] = REPEAT_THRESHOLD,
+    ):
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+
+    def __enter__(self) -> QueryLog:
+        self.log = QueryLog()
+        _recorders.append(self.log)
+        return self.log
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _recorders.remove(self.log)
+        if exc_type is None:
+            problems = self.log.problems(self.max_queries, self.repeat_threshold)
+            if problems:
+                statements = "\n".join(
+                    f"  {_shorten(statement)}" for statement, _ in self.log.statements
+                )
+                raise QueryBudgetExceeded("; ".join(problems) + "\n" + statements)
+        return False
+
+
+class QueryBudgetMiddleware:
+    """
+    Nur-Log-Modus für Staging: warnt pro Anfrage bei zu vielen Abfragen oder
+    N+1-Verdacht, ohne die Antwort zu verändern.
+    """
+
+    def __init__(self, app: Any, max_queries: int, repeat_threshold: int = REPEAT_THRESHOLD):
+        self.app = app
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        log = QueryLog()
+        token = _request_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_log.reset(token)
+            problems = log.problems(self.max_queries, self.repeat_threshold)
+            if problems:
+                logger.warning(
+                    "Abfragebudget %s %s: %s",
+                    scope["method"],
+                    route_label(scope),
+                    "; ".join(problems),
+                )
@@ -1,21 +1,117 @@
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.db.sqlite import (
+    apply_pragmas,
+    engine_options,
+    read_only_pragmas,
+    read_only_uri,
+    sqlite_pragmas,
+)
 
 engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, connect_args={"check_same_thread": False}
+    settings.SQLALCHEMY_DATABASE_URI,
+    **engine_options(settings.SQLALCHEMY_DATABASE_URI, settings),
+)
+apply_pragmas(engine, sqlite_pragmas(settings))
+
+# Lese-Engine: eigener Pool, schreibgeschützt. Bei In-Memory-Datenbanken gibt
+# es keine zweite Verbindung auf dieselben Daten, dort wird die Schreib-Engine
+# mitbenutzt.
+_read_uri = settings.SQLALCHEMY_READ_DATABASE_URI or read_only_uri(
+    settings.SQLALCHEMY_DATABASE_URI
+)
+if _read_uri:
+    read_engine = create_engine(
+        _read_uri,
+        **engine_options(
+            _read_uri,
+            settings,
+            pool_size=settings.DB_READ_POOL_SIZE,
+            max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        ),
+    )
+    apply_pragmas(read_engine, read_only_pragmas(sqlite_pragmas(settings)))
+else:
+    read_engine = engine
+
+if settings.METRICS_ENABLED:
+    from app.db.metrics import instrument_engine, instrument_sessions
+
+    instrument_sessions()
+    instrument_engine(engine, "write")
+    if read_engine is not engine:
+        instrument_engine(read_engine, "read")
+
+if settings.QUERY_BUDGET_MODE == "log":
+    from app.db import query_budget
+
+    query_budget.instrument_engine(engine)
+    query_budget.instrument_engine(read_engine)
+
+# Objekte bleiben nach dem Commit gültig: Schreibzugriffe holen ihre Werte per
+# RETURNING, ein erneutes Laden beim Serialisieren wäre eine zusätzliche Abfrage
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+ReadSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+def _async_database_uri(uri: str) -> str:
+    if uri.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + uri[len("sqlite://"):]
+    return uri
+
+
+# Async-Engine nur im Async-Modus anlegen, damit aiosqlite sonst nicht
+# installiert sein muss
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB_MODE:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        settings.SQLALCHEMY_ASYNC_DATABASE_URI
+        or _async_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+    )
+    apply_pragmas(async_engine.sync_engine, sqlite_pragmas(settings))
+    if settings.METRICS_ENABLED:
+        instrument_engine(async_engine.sync_engine, "async")
+    if settings.QUERY_BUDGET_MODE == "log":
+        query_budget.instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+# Methoden ohne Schreibzugriff laufen über die Lese-Engine
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
 # Hilfsfunktion für Abhängigkeiten (Dependency Injection)
-def get_db():
-    db = SessionLocal()
+def get_db(request: Request):
+    """
+    Eine Session pro Anfrage, die sich Authentifizierung und Endpunkt teilen
+    (FastAPI cached die Dependency innerhalb der Anfrage). Lesende Methoden
+    bekommen eine Session auf der Lese-Engine, alle anderen auf der
+    Schreib-Engine. Die Verbindung holt die Session erst bei der ersten
+    Abfrage aus dem Pool.
+    """
+    factory = ReadSessionLocal if request.method in READ_METHODS else SessionLocal
+    db = factory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
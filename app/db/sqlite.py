@@ -0,0 +1,171 @@
+import logging
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Reihenfolge ist relevant: journal_mode zuerst, da es eine Sperre braucht
+PRAGMAS = [
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "busy_timeout",
+    "temp_store",
+    "query_only",
+]
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    # WAL: Leser blockieren Schreiber nicht; synchronous=NORMAL ist in WAL
+    # konsistent, nur die letzten Commits vor einem Stromausfall können fehlen
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # negativ = KiB, also 64 MB pro Verbindung
+        "mmap_size": 256 * 1024 * 1024,
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+}
+
+_SYNCHRONOUS = {0: "OFF", 1: "NORMAL", 2: "FULL", 3: "EXTRA"}
+_TEMP_STORE = {0: "DEFAULT", 1: "FILE", 2: "MEMORY"}
+
+
+def begin(bind: Union[Engine, Connection]) -> ContextManager[Connection]:
+    """
+    Transaktion auf einer Engine; eine übergebene Verbindung (z.B. in einer
+    Alembic-Migration) wird samt laufender Transaktion mitbenutzt.
+    """
+    if isinstance(bind, Connection):
+        return nullcontext(bind)
+    return bind.begin()
+
+
+def is_sqlite(uri: str) -> bool:
+    return uri.startswith("sqlite")
+
+
+def is_memory(uri: str) -> bool:
+    return uri in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in uri
+
+
+def sqlite_pragmas(settings) -> Dict[str, Any]:
+    """
+    Pragmas des konfigurierten Profils samt einzelner Überschreibungen.
+    """
+    if settings.SQLITE_PROFILE not in PROFILES:
+        raise ValueError(f"Unbekanntes SQLite-Profil: {settings.SQLITE_PROFILE}")
+    pragmas = dict(PROFILES[settings.SQLITE_PROFILE])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+    pragmas.update({name: value for name, value in overrides.items() if value is not None})
+    return pragmas
+
+
+def read_only_pragmas(pragmas: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pragmas für schreibgeschützte Verbindungen: journal_mode lässt sich dort
+    nicht setzen (gilt ohnehin für die Datei), Schreibzugriffe werden abgelehnt.
+    """
+    pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+    pragmas["query_only"] = 1
+    return pragmas
+
+
+def read_only_uri(uri: str) -> Optional[str]:
+    """
+    Öffnet dieselbe SQLite-Datei schreibgeschützt (``mode=ro``). Liefert
+    ``None`` für In-Memory- und andere Datenbanken, die keine zweite
+    Verbindung auf dieselbe Datei zulassen.
+    """
+    if not uri.startswith("sqlite:///") or is_memory(uri) or "?" in uri:
+        return None
+    return f"sqlite:///file:{uri[len('sqlite:///'):]}?mode=ro&uri=true"
+
+
+def engine_options(
+    uri: str,
+    settings,
+    *,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Argumente für ``create_engine``: Pool-Größen für dateibasierte Datenbanken.
+    In-Memory-Datenbanken behalten den Pool, den SQLAlchemy dafür vorsieht.
+    """
+    options: Dict[str, Any] = {}
+    if is_sqlite(uri):
+        options["connect_args"] = {"check_same_thread": False}
+        if is_memory(uri):
+            return options
+        options["poolclass"] = QueuePool
+    options.update(
+        pool_size=settings.DB_POOL_SIZE if pool_size is None else pool_size,
+        max_overflow=settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
+
+def apply_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Setzt die Pragmas bei jeder neuen Verbindung (connect-Event).
+    """
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+    statements = [f"PRAGMA {name}={pragmas[name]}" for name in PRAGMAS if name in pragmas]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def effective_pragmas(engine: Engine) -> Dict[str, Any]:
+    """
+    Liest die Pragmas zurück, die auf einer Verbindung tatsächlich gelten
+    (z.B. bleibt journal_mode bei In-Memory-Datenbanken "memory").
+    """
+    values: Dict[str, Any] = {}
+    with engine.connect() as conn:
+        for name in PRAGMAS:
+            values[name] = conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+    values["synchronous"] = _SYNCHRONOUS.get(values["synchronous"], values["synchronous"])
+    values["temp_store"] = _TEMP_STORE.get(values["temp_store"], values["temp_store"])
+    return values
+
+
+def log_effective_pragmas(engine: Engine, label: str = "SQLite") -> None:
+    if engine.dialect.name != "sqlite":
+        return
+    pool = engine.pool
+    logger.info(
+        "%s: %s; Pool: %s (size=%s, overflow=%s)",
+        label,
+        ", ".join(f"{name}={value}" for name, value in effective_pragmas(engine).items()),
+        type(pool).__name__,
+        getattr(pool, "size", lambda: None)(),
+        getattr(pool, "_max_overflow", None),
+    )
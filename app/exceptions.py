@@ -26,4 +26,12 @@ class NotEnoughPermissionException(BookException):
     def __init__(self):
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN, detail="Nicht genügend Berechtigungen"
-        )
\ No newline at end of file
+        )
+
+
+class UserAlreadyExistsException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ein Benutzer mit dieser E-Mail existiert bereits.",
+        )
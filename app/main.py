@@ -1,27 +1,38 @@
+import atexit
 import logging
-from fastapi import FastAPI, Request, Depends, HTTPException, status
+import queue
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+
+from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from starlette.responses import HTMLResponse, RedirectResponse
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 
 from app.api.api_v1.api import api_router
-from app.core.auth import get_current_user
 from app.config import settings
-from app.db.init_db import init_db
-from app.db.session import get_db
-from app.models.user import User
-
-# Logging konfigurieren
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler("logs/app.log"),
-        logging.StreamHandler()
-    ]
-)
+from app.core import metrics
+from app.core.access_log import AccessLogMiddleware, access_log
+from app.core.traffic_capture import TrafficCaptureMiddleware, traffic_capture
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.db.init_db import prepare_database
+from app.db.session import engine, read_engine
+from app.db.sqlite import log_effective_pragmas
+
+# Logging konfigurieren: Log-Aufrufe legen den Eintrag nur in eine Queue,
+# Datei und Konsole bedient ein Hintergrund-Thread
+_log_handlers = [logging.FileHandler("logs/app.log"), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+# Nur Nachricht (inkl. Traceback) vorformatieren, Zeit und Level setzen die
+# Handler im Hintergrund-Thread davor
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+log_listener = QueueListener(_log_queue, *_log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +45,14 @@ app = FastAPI(
 
 # Static files und Templates
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
-templates = Jinja2Templates(directory="app/templates")
+
+
+@lru_cache(maxsize=None)
+def get_templates():
+    # Jinja2 erst beim ersten Seitenaufruf laden, nicht bei jedem Worker-Start
+    from fastapi.templating import Jinja2Templates
+
+    return Jinja2Templates(directory="app/templates")
 
 # CORS-Middleware hinzufügen
 app.add_middleware(
@@ -43,8 +61,44 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Mitschnitt der API-Anfragen für Replays (benchmarks.api.replay)
+if settings.CAPTURE_ENABLED:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        prefix=settings.API_V1_STR,
+        key=settings.SECRET_KEY,
+        sample_rate=settings.CAPTURE_SAMPLE_RATE,
+        max_body_bytes=settings.CAPTURE_MAX_BODY_BYTES,
+    )
+
+# Access-Log: innerhalb der Metriken, damit die Datenbankzeit der Anfrage
+# verfügbar ist
+if settings.ACCESS_LOG_ENABLED:
+    app.add_middleware(
+        AccessLogMiddleware, sample_rate_2xx=settings.ACCESS_LOG_SAMPLE_RATE_2XX
+    )
+
+# Metriken: als letzte Middleware hinzugefügt, läuft sie außen und misst CORS mit
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics() -> Response:
+        return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+# Abfragebudget im Nur-Log-Modus (Staging)
+if settings.QUERY_BUDGET_MODE == "log":
+    from app.db.query_budget import QueryBudgetMiddleware
+
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+        repeat_threshold=settings.QUERY_BUDGET_REPEAT_THRESHOLD,
+    )
+
 # API-Router einbinden
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -58,35 +112,54 @@ async def read_root(request: Request):
 # Login-Seite
 @app.get("/login", response_class=HTMLResponse)
 async def read_login(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    return get_templates().TemplateResponse("login.html", {"request": request})
 
 
 # Bücher-Seite
 @app.get("/books", response_class=HTMLResponse)
 async def read_books(request: Request):
-    return templates.TemplateResponse("books.html", {"request": request})
+    return get_templates().TemplateResponse("books.html", {"request": request})
 
 
 # Startup-Event
 @app.on_event("startup")
 def on_startup():
     logger.info("Starte Anwendung...")
-    db = next(get_db())
-    init_db(db)
-    logger.info("Datenbank initialisiert")
+    if settings.ACCESS_LOG_ENABLED:
+        access_log.start(settings)
+    if settings.CAPTURE_ENABLED:
+        traffic_capture.start(settings)
+    prepare_database(engine, settings.DB_STARTUP_MODE)
+    logger.info("Datenbank bereit (DB_STARTUP_MODE=%s)", settings.DB_STARTUP_MODE)
+    log_effective_pragmas(engine, "SQLite (schreiben)")
+    if read_engine is not engine:
+        log_effective_pragmas(read_engine, "SQLite (lesen)")
 
 
 # Shutdown-Event
 @app.on_event("shutdown")
 def on_shutdown():
     logger.info("Anwendung wird heruntergefahren...")
+    password_pool.shutdown()
+    access_log.stop()
+    traffic_capture.stop()
 
 
 # Fehlerbehhandlung
+@app.exception_handler(PasswordPoolBusy)
+async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusy):
+    logger.warning("Hashing-Pool ausgelastet, Anfrage abgewiesen: %s", request.url.path)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Zu viele Anmeldungen, bitte später erneut versuchen"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unerwarteter Fehler: {exc}", exc_info=True)
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "error.html",
         {"request": request, "error": "Ein unerwarteter Fehler ist aufgetreten."},
         status_code=500,
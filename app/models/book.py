@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, String, Text, Date
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, Text, Date
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -6,6 +6,10 @@ from app.db.session import Base
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (
+        # Listen und Keyset-Seiten pro Besitzer (WHERE owner_id = ? ORDER BY id)
+        Index("ix_books_owner_id_id", "owner_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True, nullable=False)
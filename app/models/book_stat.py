@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Index, Integer, String
+
+from app.db.session import Base
+
+
+class BookStat(Base):
+    __tablename__ = "book_stats"
+
+    # Vorberechnete Anzahl Bücher je Gruppe (Besitzer, Autor, Jahr), gepflegt
+    # von Triggern auf "books" (siehe app/db/book_stats.py). Fehlende Werte
+    # werden als leerer Schlüssel gezählt.
+    dimension = Column(String(16), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # Größte Gruppen je Dimension ohne Sortierung (ORDER BY count DESC, key)
+        Index("ix_book_stats_dimension_count", "dimension", count.desc(), "key"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer
+
+from app.db.session import Base
+
+
+class BookVersion(Base):
+    __tablename__ = "book_versions"
+
+    # Versionszähler pro Besitzer; owner_id 0 zählt alle Änderungen (Sicht
+    # der Superuser). Wird bei jedem Schreibzugriff auf "books" erhöht.
+    owner_id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import date
 
 from pydantic import BaseModel, validator, Field
@@ -49,4 +49,66 @@ class Book(BookInDBBase):
 
 # Zusätzliche Eigenschaften in DB
 class BookInDB(BookInDBBase):
-    pass
\ No newline at end of file
+    pass
+
+
+# Ergebnis eines Massenimports
+class BookImportError(BaseModel):
+    row: int
+    isbn: Optional[str] = None
+    errors: List[str]
+
+
+class BookImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: List[BookImportError] = []
+
+
+# Massenänderungen: ein Eintrag pro Buch, Ergebnis pro Eintrag
+class BookBatchUpdateItem(BookUpdate):
+    id: int
+
+
+class BookBatchUpdate(BaseModel):
+    items: List[BookBatchUpdateItem]
+
+
+class BookBatchDelete(BaseModel):
+    ids: List[int]
+
+
+class BookBatchItemResult(BaseModel):
+    id: int
+    status: int
+    detail: Optional[str] = None
+    book: Optional[Book] = None
+
+
+class BookBatchResult(BaseModel):
+    succeeded: int = 0
+    failed: int = 0
+    results: List[BookBatchItemResult] = []
+
+
+# Statistik aus den vorberechneten Zählungen (book_stats)
+class BookOwnerCount(BaseModel):
+    owner_id: Optional[int] = None
+    count: int
+
+
+class BookAuthorCount(BaseModel):
+    author: Optional[str] = None
+    count: int
+
+
+class BookYearCount(BaseModel):
+    year: Optional[int] = None
+    count: int
+
+
+class BookStats(BaseModel):
+    total: int = 0
+    owners: List[BookOwnerCount] = []
+    authors: List[BookAuthorCount] = []
+    years: List[BookYearCount] = []
@@ -6,7 +6,18 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+    # Nur im Claims-Modus
+    refresh_token: Optional[str] = None
 
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None
\ No newline at end of file
+    sub: Optional[int] = None
+    type: Optional[str] = None
+    # Claims des Benutzers, nur in Access-Tokens des Claims-Modus
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
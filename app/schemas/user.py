@@ -46,6 +46,15 @@ class User(UserInDBBase):
     pass
 
 
+# Authentifizierter Benutzer ohne Bindung an eine DB-Session (z.B. aus dem
+# Auth-Cache); unveränderlich, weil Instanzen zwischen Requests geteilt werden
+class Principal(UserInDBBase):
+    id: int
+
+    class Config:
+        frozen = True
+
+
 # Zusätzliche Eigenschaften in DB
 class UserInDB(UserInDBBase):
     hashed_password: str
\ No newline at end of file
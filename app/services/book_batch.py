@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import status
+from sqlalchemy.orm import Session
+
+from app.crud.crud_book import book as crud_book
+from app.schemas.book import (
+    Book,
+    BookBatchItemResult,
+    BookBatchResult,
+    BookBatchUpdateItem,
+)
+from app.schemas.user import Principal
+
+NOT_FOUND = "Buch nicht gefunden"
+FORBIDDEN = "Keine Berechtigung"
+DUPLICATE_ID = "ID mehrfach angegeben"
+ISBN_CONFLICT = "Buch mit dieser ISBN existiert bereits"
+
+
+def _check_access(
+    ids: List[int],
+    owners: Dict[int, Tuple[Optional[int], Optional[str]]],
+    current_user: Principal,
+) -> Dict[int, BookBatchItemResult]:
+    """
+    Fehler pro ID für doppelte, fehlende und fremde Bücher.
+    """
+    errors: Dict[int, BookBatchItemResult] = {}
+    seen = set()
+    for id in ids:
+        # Alle Vorkommen einer doppelten ID werden abgelehnt
+        if id in seen:
+            errors[id] = BookBatchItemResult(
+                id=id, status=status.HTTP_400_BAD_REQUEST, detail=DUPLICATE_ID
+            )
+        elif id not in owners:
+            errors[id] = BookBatchItemResult(
+                id=id, status=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND
+            )
+        elif not current_user.is_superuser and owners[id][0] != current_user.id:
+            errors[id] = BookBatchItemResult(
+                id=id, status=status.HTTP_403_FORBIDDEN, detail=FORBIDDEN
+            )
+        seen.add(id)
+    return errors
+
+
+def _result(
+    ids: List[int],
+    errors: Dict[int, BookBatchItemResult],
+    successes: Dict[int, BookBatchItemResult],
+) -> BookBatchResult:
+    # Fehlt ein Buch in beiden, wurde es zwischen Prüfung und Änderung gelöscht
+    results = [
+        errors.get(id)
+        or successes.get(id)
+        or BookBatchItemResult(id=id, status=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        for id in ids
+    ]
+    failed = sum(1 for item in results if item.status != status.HTTP_200_OK)
+    return BookBatchResult(
+        succeeded=len(results) - failed, failed=failed, results=results
+    )
+
+
+def batch_update_books(
+    db: Session, items: List[BookBatchUpdateItem], current_user: Principal
+) -> BookBatchResult:
+    """
+    Ändert mehrere Bücher in einer Transaktion. Besitz und ISBN-Konflikte werden
+    vorab mit je einer Abfrage für alle Einträge geprüft; fehlerhafte Einträge
+    werden übersprungen, die übrigen trotzdem geändert.
+    """
+    ids = [item.id for item in items]
+    owners = crud_book.get_owners(db, ids=ids)
+    errors = _check_access(ids, owners, current_user)
+
+    patches = {
+        item.id: item.dict(exclude_unset=True, exclude={"id"})
+        for item in items
+        if item.id not in errors
+    }
+    new_isbns: Dict[str, List[int]] = {}
+    for id, patch in patches.items():
+        if patch.get("isbn") and patch["isbn"] != owners[id][1]:
+            new_isbns.setdefault(patch["isbn"], []).append(id)
+    holders = crud_book.get_ids_by_isbn(db, isbns=new_isbns)
+    for isbn, isbn_ids in new_isbns.items():
+        # Vergeben oder innerhalb des Batches mehrfach verwendet
+        if isbn in holders or len(isbn_ids) > 1:
+            for id in isbn_ids:
+                errors[id] = BookBatchItemResult(
+                    id=id, status=status.HTTP_400_BAD_REQUEST, detail=ISBN_CONFLICT
+                )
+                del patches[id]
+
+    books = crud_book.update_multi(
+        db,
+        patches=patches,
+        old_isbns=(owners[id][1] for id in patches),
+    )
+    successes = {
+        obj.id: BookBatchItemResult(
+            id=obj.id,
+            status=status.HTTP_200_OK,
+            book=Book.model_validate(obj, from_attributes=True),
+        )
+        for obj in books
+    }
+    return _result(ids, errors, successes)
+
+
+def batch_delete_books(
+    db: Session, ids: List[int], current_user: Principal
+) -> BookBatchResult:
+    """
+    Löscht mehrere Bücher mit einem DELETE in einer Transaktion.
+    """
+    owners = crud_book.get_owners(db, ids=ids)
+    errors = _check_access(ids, owners, current_user)
+    deleted = crud_book.remove_multi(db, ids=[id for id in owners if id not in errors])
+    successes = {
+        id: BookBatchItemResult(id=id, status=status.HTTP_200_OK) for id in deleted
+    }
+    return _result(ids, errors, successes)
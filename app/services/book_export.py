@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import Any, Iterator, Optional, Sequence
+
+from app.crud.crud_book import book as crud_book
+from app.db.session import ReadSessionLocal
+from app.schemas.book import Book
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+MEDIA_TYPES = {
+    FORMAT_NDJSON: "application/x-ndjson",
+    FORMAT_CSV: "text/csv",
+}
+
+# Gleiche Felder und Reihenfolge wie die JSON-Antworten der API
+EXPORT_COLUMNS = list(Book.model_fields)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+
+def export_books(
+    *, fmt: str, owner_id: Optional[int] = None, columns: Optional[Sequence[str]] = None
+) -> Iterator[str]:
+    """
+    Erzeugt den Export blockweise als Text für eine ``StreamingResponse``.
+    Ohne ``columns`` werden alle Felder exportiert.
+
+    Die Session wird im Generator selbst geöffnet, damit sie genau so lange
+    lebt wie die Übertragung und nicht an den Request-Scope gebunden ist.
+    """
+    columns = list(columns or EXPORT_COLUMNS)
+    if fmt == FORMAT_CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    db = ReadSessionLocal()
+    try:
+        for rows in crud_book.iter_rows(db, columns=columns, owner_id=owner_id):
+            if fmt == FORMAT_CSV:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows(
+                    [row[name] for name in columns] for row in rows
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(
+                        dict(row),
+                        default=_json_default,
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    )
+                    + "\n"
+                    for row in rows
+                )
+    finally:
+        db.close()
@@ -0,0 +1,188 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Dict, List, Set, Tuple, Union
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.crud_book import book as crud_book
+from app.crud.crud_book import is_isbn_conflict
+from app.schemas.book import BookCreate, BookImportError, BookImportResult
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+DUPLICATE_ISBN = "Ein Buch mit dieser ISBN existiert bereits"
+CONCURRENT_CONFLICT = "ISBN-Konflikt mit gleichzeitigem Import, Zeile nicht importiert"
+# Versuche pro Block, wenn gleichzeitig dieselben ISBNs angelegt werden
+IMPORT_ATTEMPTS = 2
+
+# Zeilennummer und entweder ein Datensatz oder eine Fehlermeldung
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Zerlegt einen Bytestrom in Textzeilen, ohne den ganzen Body zu puffern.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in _iter_lines(chunks):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, f"Ungültiges JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield row, "Jede Zeile muss ein JSON-Objekt sein"
+            continue
+        yield row, record
+
+
+async def _iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    header = None
+    row = 0
+    record_lines: List[str] = []
+    async for line in _iter_lines(chunks):
+        # Felder in Anführungszeichen dürfen Zeilenumbrüche enthalten: ein
+        # Datensatz ist erst vollständig, wenn die Anführungszeichen paarig sind.
+        record_lines.append(line)
+        logical = "\n".join(record_lines)
+        if logical.count('"') % 2:
+            continue
+        record_lines = []
+        if not logical.strip():
+            continue
+        values = next(csv.reader([logical]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Erwartet {len(header)} Spalten, gefunden {len(values)}"
+            continue
+        yield row, {name: value or None for name, value in zip(header, values)}
+    if record_lines:
+        yield row + 1, "Unvollständiger Datensatz (Anführungszeichen nicht geschlossen)"
+
+
+def _import_chunk(
+    db: Session,
+    records: List[Record],
+    owner_id: int,
+    seen_isbns: Set[str],
+    result: BookImportResult,
+) -> None:
+    valid: List[Tuple[int, BookCreate]] = []
+    for row, record in records:
+        if isinstance(record, str):
+            result.errors.append(BookImportError(row=row, errors=[record]))
+            continue
+        try:
+            valid.append((row, BookCreate(**record)))
+        except ValidationError as e:
+            result.errors.append(
+                BookImportError(
+                    row=row,
+                    isbn=record.get("isbn") if isinstance(record.get("isbn"), str) else None,
+                    errors=[
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ],
+                )
+            )
+
+    _insert_chunk(db, valid, owner_id, seen_isbns, result)
+
+
+def _insert_chunk(
+    db: Session,
+    valid: List[Tuple[int, BookCreate]],
+    owner_id: int,
+    seen_isbns: Set[str],
+    result: BookImportResult,
+) -> None:
+    """
+    Fügt die gültigen Zeilen ohne doppelte ISBNs ein. Vergibt eine andere
+    Anfrage eine ISBN zwischen Prüfung und INSERT, wird der Block
+    zurückgerollt und mit neuer Prüfung wiederholt; andere Verletzungen
+    (z.B. inzwischen gelöschter Besitzer) werden weitergereicht.
+    """
+    for _ in range(IMPORT_ATTEMPTS):
+        existing = crud_book.get_existing_isbns(
+            db, isbns={book_in.isbn for _, book_in in valid if book_in.isbn}
+        )
+        duplicates: List[BookImportError] = []
+        chunk_isbns: Set[str] = set()
+        objs_in = []
+        taken = (existing, seen_isbns, chunk_isbns)
+        for row, book_in in valid:
+            if book_in.isbn:
+                if any(book_in.isbn in isbns for isbns in taken):
+                    duplicates.append(
+                        BookImportError(row=row, isbn=book_in.isbn, errors=[DUPLICATE_ISBN])
+                    )
+                    continue
+                chunk_isbns.add(book_in.isbn)
+            objs_in.append(book_in.dict())
+        try:
+            crud_book.create_multi_with_owner(db, objs_in=objs_in, owner_id=owner_id)
+        except IntegrityError as e:
+            db.rollback()
+            if not is_isbn_conflict(e):
+                raise
+            continue
+        seen_isbns |= chunk_isbns
+        result.errors.extend(duplicates)
+        result.imported += len(objs_in)
+        return
+    # Auch der letzte Versuch kollidierte: nichts aus diesem Block importiert
+    result.errors.extend(
+        BookImportError(row=row, isbn=book_in.isbn, errors=[CONCURRENT_CONFLICT])
+        for row, book_in in valid
+    )
+
+
+async def import_books(
+    db: Session, chunks: AsyncIterator[bytes], *, fmt: str, owner_id: int
+) -> BookImportResult:
+    """
+    Importiert Bücher aus einem NDJSON- oder CSV-Strom.
+
+    Der Strom wird blockweise gelesen; je ``BOOK_IMPORT_CHUNK_SIZE`` Zeilen
+    werden validiert, mit einer Abfrage auf doppelte ISBNs geprüft und in einer
+    Transaktion eingefügt. Fehlerhafte Zeilen landen im Fehlerbericht, der Rest
+    wird trotzdem importiert.
+    """
+    records = _iter_csv(chunks) if fmt == FORMAT_CSV else _iter_ndjson(chunks)
+    result = BookImportResult()
+    seen_isbns: Set[str] = set()
+    batch: List[Record] = []
+    async for record in records:
+        batch.append(record)
+        if len(batch) >= settings.BOOK_IMPORT_CHUNK_SIZE:
+            await run_in_threadpool(_import_chunk, db, batch, owner_id, seen_isbns, result)
+            batch = []
+    if batch:
+        await run_in_threadpool(_import_chunk, db, batch, owner_id, seen_isbns, result)
+    result.errors.sort(key=lambda error: error.row)
+    result.failed = len(result.errors)
+    return result
@@ -38,7 +38,7 @@ class BookService:
         db: Session, id: int, book_in: BookUpdate, current_user: User
     ) -> Book:
         """Aktualisiert ein Buch."""
-        book = crud_book.get(db=db, id=id)
+        book = crud_book.get(db=db, id=id, cached=False)
         if not book:
             raise BookNotFoundException()
         
@@ -62,7 +62,7 @@ class BookService:
     @staticmethod
     def delete_book(db: Session, id: int, current_user: User) -> Book:
         """Löscht ein Buch."""
-        book = crud_book.get(db=db, id=id)
+        book = crud_book.get(db=db, id=id, cached=False)
         if not book:
             raise BookNotFoundException()
         
@@ -0,0 +1,18 @@
+"""
+Last- und Latenz-Benchmark für die API.
+
+    python -m benchmarks.api.seed --db bench.db --users 10000 --books 1000000
+    python -m benchmarks.api.run --db bench.db --requests 500 --out base.json
+    # ... Änderung ...
+    python -m benchmarks.api.run --db bench.db --requests 500 --out new.json
+    python -m benchmarks.api.compare base.json new.json
+
+``seed`` erzeugt einen deterministischen Datensatz (gleiche Parameter, gleiche
+Daten). ``run`` arbeitet auf einer Kopie davon, jeder Lauf startet also vom
+selben Stand, und gibt Durchsatz und p50/p95/p99 pro Endpunkt als JSON aus.
+``compare`` vergleicht zwei Ergebnisse und endet mit Exit-Code 1 bei
+Regressionen.
+
+``replay`` spielt statt synthetischer Last einen Mitschnitt echter Anfragen
+(CAPTURE_ENABLED) gegen eine lokale Kopie der Datenbank ab.
+"""
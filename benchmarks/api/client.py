@@ -0,0 +1,201 @@
+"""
+Gemeinsamer Unterbau für run und replay: Kopie der Datenbank, HTTP-Client
+für die drei Modi (im Prozess, ``--serve``, ``--url``), Latenz-Auswertung
+und Rahmendaten eines Laufs.
+"""
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+# Einstellungen, die Ergebnisse spürbar beeinflussen; stehen im Ergebnis
+RELEVANT_SETTINGS = (
+    "ASYNC_DB_MODE",
+    "AUTH_CLAIMS_MODE",
+    "SQLITE_PROFILE",
+    "DB_POOL_SIZE",
+    "DB_READ_POOL_SIZE",
+    "BOOK_CACHE_BACKEND",
+    "METRICS_ENABLED",
+    "ACCESS_LOG_ENABLED",
+    "QUERY_BUDGET_MODE",
+)
+
+
+def add_mode_arguments(parser: argparse.ArgumentParser) -> None:
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", action="store_true", help="gegen uvicorn im Unterprozess")
+    mode.add_argument("--url", help="gegen einen laufenden Server")
+
+
+def mode_name(args: argparse.Namespace) -> str:
+    return "url" if args.url else "serve" if args.serve else "in-process"
+
+
+@contextmanager
+def database_copy(db: str, args: argparse.Namespace) -> Iterator[Dict[str, str]]:
+    """
+    Umgebung für die App auf einer frischen Kopie von ``db`` (Schreibzugriffe
+    verändern die Daten, jeder Lauf startet so vom selben Stand). Bei
+    ``--url`` gehört die Datenbank dem fremden Server, die Umgebung ist leer.
+    """
+    if args.url:
+        yield {}
+        return
+    directory = tempfile.mkdtemp(prefix="api-bench-")
+    try:
+        copy = os.path.join(directory, "bench.db")
+        shutil.copyfile(db, copy)
+        yield {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{copy}",
+            "ACCESS_LOG_PATH": os.path.join(directory, "access.jsonl"),
+            "CAPTURE_ENABLED": "false",
+            "PYTHONWARNINGS": "ignore",
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    if importlib.util.find_spec("uvicorn") is None:
+        raise SystemExit("--serve braucht uvicorn (pip install uvicorn)")
+    import httpx
+
+    port = _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        env=dict(os.environ, **env),
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn beendet mit Exit-Code {process.returncode}")
+        try:
+            httpx.get(f"{url}/openapi.json", timeout=1)
+            return process, url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("uvicorn nicht rechtzeitig erreichbar")
+
+
+@asynccontextmanager
+async def open_client(
+    args: argparse.Namespace, env: Dict[str, str], concurrency: int
+) -> AsyncIterator[Any]:
+    """
+    httpx-Client für den gewählten Modus. Im Prozess wird die App erst hier
+    importiert, nachdem ``env`` gesetzt ist (Settings und Engines lesen die
+    Umgebung beim Import).
+    """
+    import httpx
+
+    # httpx protokolliert jede Anfrage mit INFO, das wäre Teil der Messung
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.url or args.serve:
+        process = None
+        url = args.url
+        if args.serve:
+            process, url = start_server(env)
+        limits = httpx.Limits(max_connections=concurrency)
+        try:
+            async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+                yield client
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        return
+
+    os.environ.update(env)
+    from app.main import app
+    from benchmarks.asgi import lifespan
+
+    shutdown = await lifespan(app)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+    finally:
+        await shutdown.put({"type": "lifespan.shutdown"})
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Perzentil einer aufsteigend sortierten Liste (nächster Rang).
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    values = sorted(value * 1000 for value in seconds)
+    return {
+        "mean": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _settings(env: Dict[str, str]) -> Dict[str, Any]:
+    from app.config import Settings
+
+    os.environ.update(env)
+    settings = Settings()
+    return {name: getattr(settings, name) for name in RELEVANT_SETTINGS}
+
+
+def run_meta(args: argparse.Namespace, env: Dict[str, str]) -> Dict[str, Any]:
+    return {
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "mode": mode_name(args),
+        # Bei --url gelten die Einstellungen des fremden Servers
+        "settings": None if args.url else _settings(env),
+    }
+
+
+def write_report(report: Dict[str, Any], out: Optional[str]) -> None:
+    output = json.dumps(report, indent=2)
+    if out:
+        with open(out, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
@@ -0,0 +1,95 @@
+"""
+Vergleicht zwei Ergebnisse von benchmarks.api.run pro Endpunkt.
+
+    python -m benchmarks.api.compare base.json new.json --threshold 10
+
+Als Regression gilt ein Endpunkt, dessen p50 oder p95 um mehr als
+``--threshold`` Prozent und zugleich um mehr als ``--min-ms`` Millisekunden
+steigt (kleine Latenzen schwanken relativ stark), oder der neue Fehler hat.
+Weichen die Rahmendaten (Datensatz, Parallelität, Einstellungen) ab, wird
+gewarnt: Die Zahlen sind dann nur bedingt vergleichbar. Exit-Code 1 bei
+Regressionen.
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Rahmendaten, die gleich sein müssen, damit der Vergleich trägt
+COMPARABLE_META = ("mode", "dataset", "requests", "concurrency", "settings", "python", "sqlite")
+PERCENTILES = ("p50", "p95")
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def meta_differences(base: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    return [
+        f"{key}: {base['meta'].get(key)!r} -> {new['meta'].get(key)!r}"
+        for key in COMPARABLE_META
+        if base["meta"].get(key) != new["meta"].get(key)
+    ]
+
+
+def compare(
+    base: Dict[str, Any], new: Dict[str, Any], threshold: float, min_ms: float
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Liefert eine Zeile pro Endpunkt (beide Läufe) und die Namen der
+    regressierten Endpunkte.
+    """
+    rows: List[Dict[str, Any]] = []
+    regressions: List[str] = []
+    for name, old in base["endpoints"].items():
+        current = new["endpoints"].get(name)
+        if current is None:
+            continue
+        row: Dict[str, Any] = {"name": name, "errors": (old["errors"], current["errors"])}
+        regressed = current["errors"] > old["errors"]
+        for key in PERCENTILES:
+            before, after = old["latency_ms"][key], current["latency_ms"][key]
+            change = (after - before) / before * 100 if before else 0.0
+            row[key] = (before, after, change)
+            if change > threshold and after - before > min_ms:
+                regressed = True
+        row["regressed"] = regressed
+        rows.append(row)
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Prozent")
+    parser.add_argument("--min-ms", type=float, default=0.5, help="Rauschgrenze in ms")
+    args = parser.parse_args()
+
+    base, new = _load(args.base), _load(args.new)
+    for difference in meta_differences(base, new):
+        print(f"Warnung: Rahmendaten abweichend, {difference}", file=sys.stderr)
+    missing = sorted(set(base["endpoints"]) ^ set(new["endpoints"]))
+    if missing:
+        print(f"Warnung: nur in einem Lauf: {', '.join(missing)}", file=sys.stderr)
+
+    rows, regressions = compare(base, new, args.threshold, args.min_ms)
+    print(f"{'Endpunkt':<22} {'p50 alt':>9} {'p50 neu':>9} {'Δ':>7} {'p95 alt':>9} "
+          f"{'p95 neu':>9} {'Δ':>7}  Fehler")
+    for row in rows:
+        cells = "".join(
+            f" {row[key][0]:>9.2f} {row[key][1]:>9.2f} {row[key][2]:>+6.1f}%" for key in PERCENTILES
+        )
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(f"{row['name']:<22}{cells}  {row['errors'][0]}->{row['errors'][1]}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} Regression(en): {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Spielt einen Mitschnitt (CAPTURE_ENABLED=true, logs/requests.jsonl) gegen
+eine lokale Kopie der Datenbank ab.
+
+    python -m benchmarks.api.replay logs/requests.jsonl* --db kopie.db --speed 2
+    python -m benchmarks.api.replay logs/requests.jsonl --db kopie.db --speed 0 --concurrency 16
+
+``--speed`` skaliert die ursprünglichen Abstände (2 = doppelt so schnell,
+0 = so schnell wie möglich), ``--concurrency`` begrenzt die gleichzeitig
+offenen Anfragen; wie weit das Replay dadurch hinter dem Zeitplan liegt,
+steht als ``lag_ms`` im Ergebnis. Die Datenbank sollte dem Stand zu Beginn
+des Mitschnitts entsprechen, sonst weichen Antworten ab.
+
+Tokens stellt das Replay selbst pro mitgeschnittener Benutzer-ID aus (mit
+dem SECRET_KEY aus der Umgebung; bei ``--url`` muss er dem des Servers
+entsprechen). Passwörter und E-Mails sind im Mitschnitt anonymisiert (auch in
+Query-Strings und CSV-Bodies), Logins und Anfragen mit diesen Werten weichen
+daher erwartbar ab. Ausgabe: JSON mit
+Latenzverteilung gesamt und pro Route (neben der ursprünglichen) sowie den
+Abweichungen von Status und Antwort-Hash gegenüber dem Mitschnitt.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import secrets
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.api.client import (
+    add_mode_arguments,
+    database_copy,
+    latency_summary,
+    open_client,
+    run_meta,
+    write_report,
+)
+
+# Beispiele für abweichende Status pro Lauf (der Rest wird nur gezählt)
+MAX_EXAMPLES = 20
+
+
+def load_entries(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Einträge aller Dateien (auch rotierte), nach Startzeit sortiert; ``t`` ist
+    die Startzeit in Sekunden.
+    """
+    entries = []
+    for path in paths:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    entry = json.loads(line)
+                    entry["t"] = datetime.fromisoformat(entry["ts"]).timestamp()
+                    entries.append(entry)
+    entries.sort(key=lambda entry: entry["t"])
+    return entries
+
+
+def replayable(entry: Dict[str, Any]) -> bool:
+    # Bodies, die nicht mitgeschnitten wurden (zu groß, unbekanntes Format)
+    return not entry.get("body_bytes") or entry.get("body") is not None
+
+
+def issue_tokens(user_ids: Iterable[int], database_uri: Optional[str]) -> Dict[int, str]:
+    """
+    Access-Tokens pro Benutzer-ID. Im Claims-Modus werden die Claims aus der
+    Datenbank gelesen; die Laufzeit entspricht immer der normaler Tokens,
+    damit lange Replays nicht an abgelaufenen Tokens scheitern.
+    """
+    from datetime import timedelta
+
+    from app.config import settings
+    from app.core.security import create_access_token
+
+    expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    user_ids = set(user_ids)
+    if not settings.AUTH_CLAIMS_MODE:
+        return {user_id: create_access_token(user_id, expires) for user_id in user_ids}
+
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.core.auth import user_claims
+    from app.db.base import User
+
+    engine = create_engine(database_uri or settings.SQLALCHEMY_DATABASE_URI)
+    try:
+        with Session(engine) as db:
+            users = db.scalars(select(User).where(User.id.in_(user_ids)))
+            return {
+                user.id: create_access_token(user.id, expires, claims=user_claims(user))
+                for user in users
+            }
+    finally:
+        engine.dispose()
+
+
+def build_request(entry: Dict[str, Any], tokens: Dict[int, str]) -> Dict[str, Any]:
+    headers = {}
+    if entry.get("content_type"):
+        headers["Content-Type"] = entry["content_type"]
+    if entry.get("if_none_match"):
+        headers["If-None-Match"] = entry["if_none_match"]
+    token = tokens.get(entry.get("user_id"))
+    if token is not None:
+        headers["Authorization"] = f"Bearer {token}"
+    url = entry["path"] + (f"?{entry['query']}" if entry.get("query") else "")
+    body = entry.get("body")
+    return {
+        "method": entry["method"],
+        "url": url,
+        "headers": headers,
+        "content": body.encode() if body is not None else None,
+    }
+
+
+async def replay(
+    client: Any,
+    entries: List[Dict[str, Any]],
+    tokens: Dict[int, str],
+    speed: float,
+    concurrency: int,
+) -> List[Dict[str, Any]]:
+    """
+    Sendet die Einträge im ursprünglichen Abstand (geteilt durch ``speed``)
+    mit höchstens ``concurrency`` offenen Anfragen. Liefert pro Eintrag
+    Status, Hash, Dauer und Verzug gegenüber dem Zeitplan.
+    """
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+    outcomes: List[Dict[str, Any]] = []
+    origin = entries[0]["t"] if entries else 0.0
+    started = time.perf_counter()
+
+    async def send(entry: Dict[str, Any], due: float) -> None:
+        try:
+            sent = time.perf_counter()
+            outcome = {"entry": entry, "lag": max(0.0, sent - started - due)}
+            try:
+                response = await client.request(**build_request(entry, tokens))
+            except httpx.HTTPError as exc:
+                outcome.update(status=None, error=type(exc).__name__)
+            else:
+                outcome.update(
+                    status=response.status_code,
+                    sha1=hashlib.sha1(response.content).hexdigest(),
+                )
+            outcome["seconds"] = time.perf_counter() - sent
+            outcomes.append(outcome)
+        finally:
+            semaphore.release()
+
+    for entry in entries:
+        due = (entry["t"] - origin) / speed if speed else 0.0
+        delay = due - (time.perf_counter() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await semaphore.acquire()
+        task = asyncio.ensure_future(send(entry, due))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+    return outcomes
+
+
+def summarize(outcomes: List[Dict[str, Any]], wall: float) -> Dict[str, Any]:
+    routes: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for outcome in outcomes:
+        entry = outcome["entry"]
+        routes[f"{entry['method']} {entry.get('route') or entry['path']}"].append(outcome)
+
+    def differences(group: List[Dict[str, Any]]) -> Dict[str, int]:
+        status = [o for o in group if o["status"] != o["entry"]["status"]]
+        body = [
+            o for o in group
+            if o["status"] == o["entry"]["status"] and o.get("sha1") != o["entry"]["response_sha1"]
+        ]
+        return {"status": len(status), "body": len(body)}
+
+    examples = [
+        {
+            "method": o["entry"]["method"],
+            "path": o["entry"]["path"],
+            "query": o["entry"].get("query", ""),
+            "captured": o["entry"]["status"],
+            "replayed": o["status"] if o["status"] is not None else o.get("error"),
+        }
+        for o in outcomes
+        if o["status"] != o["entry"]["status"]
+    ][:MAX_EXAMPLES]
+
+    return {
+        "overall": {
+            "requests": len(outcomes),
+            "throughput_rps": round(len(outcomes) / wall, 1) if wall else 0.0,
+            "latency_ms": latency_summary([o["seconds"] for o in outcomes]),
+            "captured_latency_ms": latency_summary(
+                [o["entry"]["duration_ms"] / 1000 for o in outcomes]
+            ),
+            "lag_ms": latency_summary([o["lag"] for o in outcomes]),
+            "differences": differences(outcomes),
+        },
+        "routes": {
+            name: {
+                "requests": len(group),
+                "status": dict(Counter(str(o["status"]) for o in group)),
+                "latency_ms": latency_summary([o["seconds"] for o in group]),
+                "captured_latency_ms": latency_summary(
+                    [o["entry"]["duration_ms"] / 1000 for o in group]
+                ),
+                "differences": differences(group),
+            }
+            for name, group in sorted(routes.items())
+        },
+        "status_examples": examples,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("captures", nargs="+", help="Mitschnitt-Dateien (JSON-Zeilen)")
+    parser.add_argument("--db", required=True, help="lokale Kopie der Datenbank")
+    parser.add_argument("--speed", type=float, default=1.0, help="Faktor, 0 = ohne Pausen")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--limit", type=int, help="nur die ersten N Anfragen")
+    add_mode_arguments(parser)
+    parser.add_argument("--out", help="Ergebnis-Datei (sonst stdout)")
+    args = parser.parse_args()
+
+    entries = load_entries(args.captures)
+    replayable_entries = [entry for entry in entries if replayable(entry)]
+    replayed = replayable_entries[: args.limit]
+    if not replayed:
+        raise SystemExit("Keine abspielbaren Anfragen im Mitschnitt")
+    captured_s = replayed[-1]["t"] - replayed[0]["t"]
+    user_ids = {entry["user_id"] for entry in replayed if entry.get("user_id") is not None}
+
+    async def run(env: Dict[str, str]) -> List[Dict[str, Any]]:
+        async with open_client(args, env, args.concurrency) as client:
+            database_uri = env.get("SQLALCHEMY_DATABASE_URI", f"sqlite:///{args.db}")
+            tokens = issue_tokens(user_ids, database_uri)
+            return await replay(client, replayed, tokens, args.speed, args.concurrency)
+
+    with database_copy(args.db, args) as env:
+        if not args.url:
+            # Gemeinsamer Schlüssel für die Tokens des Replays und die App
+            env["SECRET_KEY"] = secrets.token_urlsafe(32)
+            os.environ.update(env)
+        started = time.perf_counter()
+        outcomes = asyncio.run(run(env))
+        wall = time.perf_counter() - started
+        meta = run_meta(args, env)
+    meta.update(
+        captures=args.captures,
+        entries=len(entries),
+        skipped=len(entries) - len(replayable_entries),
+        speed=args.speed,
+        concurrency=args.concurrency,
+        captured_duration_s=round(captured_s, 1),
+        duration_s=round(wall, 1),
+    )
+    summary = summarize(outcomes, wall)
+    overall = summary["overall"]
+    print(
+        f"{overall['requests']} Anfragen, p50 {overall['latency_ms']['p50']:.2f} ms"
+        f" (Mitschnitt {overall['captured_latency_ms']['p50']:.2f} ms),"
+        f" p99 {overall['latency_ms']['p99']:.2f} ms,"
+        f" abweichend: Status {overall['differences']['status']},"
+        f" Antwort {overall['differences']['body']}",
+        file=sys.stderr,
+    )
+    write_report({"meta": meta, **summary}, args.out)
+
+
+if __name__ == "__main__":
+    main()
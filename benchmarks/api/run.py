@@ -0,0 +1,174 @@
+"""
+Lastlauf gegen die API: jedes Szenario (ein Endpunkt) mit ``--requests``
+Anfragen bei ``--concurrency`` gleichzeitigen Clients.
+
+    python -m benchmarks.api.run --db bench.db --requests 500 --out base.json
+    python -m benchmarks.api.run --db bench.db --serve          # echter Server
+    python -m benchmarks.api.run --db bench.db --url http://127.0.0.1:8000
+
+Ohne ``--serve``/``--url`` läuft die App im selben Prozess (httpx mit
+ASGI-Transport, ohne Netzwerk); das misst die App selbst und streut am
+wenigsten. ``--serve`` startet uvicorn auf einer Kopie der Datenbank,
+``--url`` nutzt einen laufenden Server mit dem geseedeten Datensatz (der
+danach verändert ist). Ausgabe: JSON mit Durchsatz, Statuscodes und
+Latenz-Perzentilen pro Endpunkt sowie den Rahmendaten des Laufs.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from benchmarks.api.client import (
+    add_mode_arguments,
+    database_copy,
+    latency_summary,
+    open_client,
+    run_meta,
+    write_report,
+)
+from benchmarks.api.scenarios import API, SCENARIOS, Context, Scenario
+from benchmarks.api.seed import dataset_path, user_email
+
+
+def _summary(
+    scenario: Scenario, latencies: List[float], statuses: Counter, errors: int, wall: float
+) -> Dict[str, Any]:
+    return {
+        "method": scenario.method,
+        "path": scenario.path,
+        "requests": len(latencies),
+        "errors": errors,
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run_scenario(
+    client: Any, scenario: Scenario, ctx: Context, requests: int, concurrency: int, warmup: int
+) -> Optional[Dict[str, Any]]:
+    import httpx
+
+    count = scenario.count(ctx, requests)
+    if count <= 0:
+        return None
+    # Aufwärmen nur bei Lesezugriffen: Schreibende würden den Stand verschieben
+    if scenario.method == "GET":
+        for i in range(min(warmup, count)):
+            await client.request(scenario.method, **scenario.build(ctx, i))
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    indexes = iter(range(count))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in indexes:
+            kwargs = scenario.build(ctx, i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, **kwargs)
+            except httpx.HTTPError:
+                statuses["error"] += 1
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+            if response.status_code not in scenario.expected:
+                errors += 1
+            elif scenario.after is not None:
+                scenario.after(ctx, response)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summary(scenario, latencies, statuses, errors, time.perf_counter() - started)
+
+
+async def _login(client: Any, email: str, password: str) -> Dict[str, Any]:
+    response = await client.post(
+        f"{API}/auth/login", data={"username": email, "password": password}
+    )
+    if response.status_code != 200:
+        raise SystemExit(
+            f"Login als {email} fehlgeschlagen: {response.status_code} {response.text}"
+        )
+    return response.json()
+
+
+async def prepare_context(client: Any, dataset: Dict[str, Any]) -> Context:
+    ctx = Context(users=dataset["users"], books=dataset["books"], password=dataset["password"])
+    token = await _login(client, user_email(ctx.user_id), ctx.password)
+    ctx.headers = {"Authorization": f"Bearer {token['access_token']}"}
+    ctx.refresh_token = token.get("refresh_token")
+    token = await _login(client, user_email(ctx.superuser_id), ctx.password)
+    ctx.superuser_headers = {"Authorization": f"Bearer {token['access_token']}"}
+    response = await client.get(f"{API}/books/", headers=ctx.headers)
+    ctx.etags["books"] = response.headers.get("etag", "")
+    return ctx
+
+
+async def run_all(
+    client: Any, dataset: Dict[str, Any], scenarios: List[Scenario], args: argparse.Namespace
+) -> Dict[str, Any]:
+    ctx = await prepare_context(client, dataset)
+    results: Dict[str, Any] = {}
+    for scenario in scenarios:
+        result = await run_scenario(
+            client, scenario, ctx, args.requests, args.concurrency, args.warmup
+        )
+        if result is not None:
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<22} {result['throughput_rps']:>9.1f}/s"
+                f"  p50 {result['latency_ms']['p50']:>8.2f} ms"
+                f"  p99 {result['latency_ms']['p99']:>8.2f} ms"
+                f"  Fehler {result['errors']}",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--db", default="bench.db", help="Datenbank aus benchmarks.api.seed")
+    parser.add_argument("--requests", type=int, default=500, help="Anfragen pro Szenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20, help="Aufwärm-Anfragen (nur GET)")
+    parser.add_argument("--scenarios", nargs="+", help="Namen oder Präfixe, z.B. books.list auth")
+    add_mode_arguments(parser)
+    parser.add_argument("--out", help="Ergebnis-Datei (sonst stdout)")
+    args = parser.parse_args()
+
+    with open(dataset_path(args.db)) as fh:
+        dataset = json.load(fh)
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenarios
+        or any(scenario.name.startswith(name) for name in args.scenarios)
+    ]
+
+    async def run(env: Dict[str, str]) -> Dict[str, Any]:
+        async with open_client(args, env, args.concurrency) as client:
+            return await run_all(client, dataset, scenarios, args)
+
+    started = time.perf_counter()
+    with database_copy(args.db, args) as env:
+        results = asyncio.run(run(env))
+        meta = run_meta(args, env)
+    meta.update(
+        dataset=dataset,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        duration_s=round(time.perf_counter() - started, 1),
+    )
+    write_report({"meta": meta, "endpoints": results}, args.out)
+
+
+if __name__ == "__main__":
+    main()
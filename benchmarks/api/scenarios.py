@@ -0,0 +1,245 @@
+"""
+Ein Szenario pro Endpunkt. ``build(ctx, i)`` liefert die i-te Anfrage als
+Keyword-Argumente für ``httpx.AsyncClient.request``; alle Werte ergeben sich
+aus dem Datensatz (siehe seed.py), nicht aus Zufall, damit Läufe vergleichbar
+bleiben.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.api.seed import WORDS, book_isbn, user_email
+
+API = "/api/v1"
+IMPORT_SIZE = 100
+BATCH_SIZE = 50
+
+
+@dataclass
+class Context:
+    users: int
+    books: int
+    password: str
+    # Normaler Benutzer (Leser/Schreiber) und Superuser, mit Tokens
+    user_id: int = 2
+    superuser_id: int = 1
+    headers: Dict[str, str] = field(default_factory=dict)
+    superuser_headers: Dict[str, str] = field(default_factory=dict)
+    refresh_token: Optional[str] = None
+    etags: Dict[str, str] = field(default_factory=dict)
+    # IDs der im Lauf angelegten Bücher (für Änderung und Löschen)
+    created: List[int] = field(default_factory=list)
+
+    def own_book_id(self, i: int) -> int:
+        # Buch j gehört Benutzer 1 + j % users, seine ID ist j + 1
+        per_user = self.books // self.users
+        return self.user_id + (i % per_user) * self.users
+
+    def any_book_index(self, i: int) -> int:
+        # Über den ganzen Bestand gestreut, deterministisch
+        return (i * 7919) % self.books
+
+    def doomed_book_ids(self, i: int, count: int) -> List[int]:
+        # Vom Ende des Bestands, damit Lese-Szenarien nicht betroffen sind
+        last = self.books - i * count
+        return list(range(last - count + 1, last + 1))
+
+    def doomed_user_id(self, i: int) -> int:
+        return self.users - i
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    build: Callable[[Context, int], Dict[str, Any]]
+    # Obergrenze für teure Endpunkte (Passwort-Hashing, Löschen)
+    max_requests: Optional[int] = None
+    # Wie viele Anfragen der Stand des Laufs erlaubt (z.B. angelegte IDs)
+    available: Optional[Callable[[Context], int]] = None
+    expected: Tuple[int, ...] = (200,)
+    # Wertet die Antwort aus (Status erwartet), z.B. angelegte IDs merken
+    after: Optional[Callable[[Context, Any], None]] = None
+
+    def count(self, ctx: Context, requested: int) -> int:
+        count = requested if self.max_requests is None else min(requested, self.max_requests)
+        if self.available is not None:
+            count = min(count, self.available(ctx))
+        return count
+
+
+def _get(
+    path: str, superuser: bool = False, **params: Any
+) -> Callable[[Context, int], Dict[str, Any]]:
+    def build(ctx: Context, i: int) -> Dict[str, Any]:
+        headers = ctx.superuser_headers if superuser else ctx.headers
+        return {"url": path, "headers": headers, "params": params or None}
+
+    return build
+
+
+def _login(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/auth/login",
+        "data": {"username": user_email(2 + i % (ctx.users - 1)), "password": ctx.password},
+    }
+
+
+def _refresh(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"url": f"{API}/auth/refresh", "json": {"refresh_token": ctx.refresh_token}}
+
+
+def _list_revalidate(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/books/",
+        "headers": {**ctx.headers, "If-None-Match": ctx.etags.get("books", "")},
+    }
+
+
+def _book_detail(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"url": f"{API}/books/{ctx.own_book_id(i)}", "headers": ctx.headers}
+
+
+def _book_isbn(ctx: Context, i: int) -> Dict[str, Any]:
+    # Superuser: ISBNs aus dem ganzen Bestand
+    return {
+        "url": f"{API}/books/isbn/{book_isbn(ctx.any_book_index(i))}",
+        "headers": ctx.superuser_headers,
+    }
+
+
+def _search(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/books/search",
+        "params": {"q": WORDS[i % len(WORDS)], "limit": 20},
+        "headers": ctx.headers,
+    }
+
+
+def _create_book(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/books/",
+        # 9er-Präfix: kollidiert nicht mit den ISBNs des Datensatzes
+        "json": {"title": f"Neu {i}", "author": "Benchmark", "isbn": f"9{i:012d}"},
+        "headers": ctx.headers,
+    }
+
+
+def _remember_created(ctx: Context, response: Any) -> None:
+    ctx.created.append(response.json()["id"])
+
+
+def _update_book(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/books/{ctx.own_book_id(i)}",
+        "json": {"title": f"Geändert {i}"},
+        "headers": ctx.headers,
+    }
+
+
+def _delete_book(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"url": f"{API}/books/{ctx.created[i]}", "headers": ctx.headers}
+
+
+def _import_books(ctx: Context, i: int) -> Dict[str, Any]:
+    lines = (
+        json.dumps(
+            {"title": f"Import {i}-{n}", "author": "Benchmark", "isbn": f"8{i:06d}{n:06d}"}
+        )
+        for n in range(IMPORT_SIZE)
+    )
+    return {
+        "url": f"{API}/books/import",
+        "content": "\n".join(lines).encode(),
+        "headers": {**ctx.headers, "Content-Type": "application/x-ndjson"},
+    }
+
+
+def _batch_update(ctx: Context, i: int) -> Dict[str, Any]:
+    items = [
+        {"id": ctx.own_book_id(i * BATCH_SIZE + n), "title": f"Stapel {i}-{n}"}
+        for n in range(BATCH_SIZE)
+    ]
+    return {"url": f"{API}/books/batch-update", "json": {"items": items}, "headers": ctx.headers}
+
+
+def _batch_delete(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/books/batch-delete",
+        "json": {"ids": ctx.doomed_book_ids(i, BATCH_SIZE)},
+        "headers": ctx.superuser_headers,
+    }
+
+
+def _create_user(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/users/",
+        "json": {"email": f"neu{i}@bench.example", "password": ctx.password},
+        "headers": ctx.superuser_headers,
+    }
+
+
+def _update_me(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/users/me",
+        "json": {"email": user_email(ctx.user_id)},
+        "headers": ctx.headers,
+    }
+
+
+def _user_detail(ctx: Context, i: int) -> Dict[str, Any]:
+    return {
+        "url": f"{API}/users/{1 + (i * 7919) % ctx.users}",
+        "headers": ctx.superuser_headers,
+    }
+
+
+def _delete_user(ctx: Context, i: int) -> Dict[str, Any]:
+    return {"url": f"{API}/users/{ctx.doomed_user_id(i)}", "headers": ctx.superuser_headers}
+
+
+# Reihenfolge zählt: Lesen vor den Änderungen, Anlegen vor Löschen
+SCENARIOS = [
+    Scenario("auth.login", "POST", "/auth/login", _login, max_requests=20),
+    Scenario(
+        "auth.refresh", "POST", "/auth/refresh", _refresh,
+        available=lambda ctx: 1 << 30 if ctx.refresh_token else 0,
+    ),
+    Scenario("auth.cache_stats", "GET", "/auth/cache-stats", _get(f"{API}/auth/cache-stats", True)),
+    Scenario("books.list", "GET", "/books/", _get(f"{API}/books/")),
+    Scenario("books.list_304", "GET", "/books/", _list_revalidate, expected=(304,)),
+    Scenario("books.list_fields", "GET", "/books/", _get(f"{API}/books/", fields="title,author")),
+    Scenario("books.list_cursor", "GET", "/books/", _get(f"{API}/books/", cursor="", limit=50)),
+    Scenario("books.list_all", "GET", "/books/", _get(f"{API}/books/", True, skip=5000)),
+    Scenario("books.detail", "GET", "/books/{id}", _book_detail),
+    Scenario("books.isbn", "GET", "/books/isbn/{isbn}", _book_isbn),
+    Scenario("books.search", "GET", "/books/search", _search),
+    Scenario("books.export", "GET", "/books/export", _get(f"{API}/books/export"), max_requests=20),
+    Scenario("books.stats", "GET", "/books/stats", _get(f"{API}/books/stats", True)),
+    Scenario(
+        "books.cache_stats", "GET", "/books/cache-stats", _get(f"{API}/books/cache-stats", True)
+    ),
+    Scenario("users.list", "GET", "/users/", _get(f"{API}/users/", True)),
+    Scenario("users.me", "GET", "/users/me", _get(f"{API}/users/me")),
+    Scenario("users.detail", "GET", "/users/{user_id}", _user_detail),
+    Scenario("books.create", "POST", "/books/", _create_book, after=_remember_created),
+    Scenario("books.update", "PUT", "/books/{id}", _update_book),
+    Scenario(
+        "books.delete", "DELETE", "/books/{id}", _delete_book,
+        available=lambda ctx: len(ctx.created),
+    ),
+    Scenario("books.import", "POST", "/books/import", _import_books, max_requests=50),
+    Scenario("books.batch_update", "POST", "/books/batch-update", _batch_update, max_requests=50),
+    Scenario(
+        "books.batch_delete", "POST", "/books/batch-delete", _batch_delete, max_requests=50,
+        available=lambda ctx: (ctx.books - ctx.users) // (2 * BATCH_SIZE),
+    ),
+    Scenario("users.update_me", "PUT", "/users/me", _update_me),
+    Scenario("users.create", "POST", "/users/", _create_user, max_requests=20),
+    Scenario(
+        "users.delete", "DELETE", "/users/{user_id}", _delete_user, max_requests=20,
+        # Benutzer 1 und 2 fahren den Lauf
+        available=lambda ctx: ctx.users - 2,
+    ),
+]
@@ -0,0 +1,133 @@
+"""
+Erzeugt einen synthetischen, deterministischen Datensatz für den API-Benchmark.
+
+    python -m benchmarks.api.seed --db bench.db --users 10000 --books 1000000
+
+Benutzer ``user{n}@bench.example`` (n = ID, Benutzer 1 ist Superuser) haben
+alle das Passwort ``PASSWORD``. Buch ``i`` (ID ``i + 1``) gehört Benutzer
+``1 + i % users`` und hat die ISBN ``f"{i:013d}"``; daraus leitet der Runner
+gültige IDs und ISBNs ab, ohne die Datenbank zu fragen. Die Zeilen werden in
+Blöcken per executemany eingefügt; Volltextindex und Statistik entstehen erst
+danach in einem Durchgang (statt per Trigger pro Zeile).
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import date
+from typing import Any, Dict, Iterator, List
+
+PASSWORD = "benchmark"
+CHUNK_SIZE = 10000
+WORDS = (
+    "Abenteuer Reise Geschichte Roman Krimi Liebe Krieg Frieden Stadt Meer Wald "
+    "Berg Zeit Nacht Sommer Winter Familie Freundschaft Geheimnis Zukunft Welt "
+    "Leben Tod Traum Schatten Licht Feuer Wasser Stein Straße"
+).split()
+
+
+def user_email(user_id: int) -> str:
+    return f"user{user_id}@bench.example"
+
+
+def book_isbn(index: int) -> str:
+    return f"{index:013d}"
+
+
+def dataset_path(db: str) -> str:
+    return db + ".json"
+
+
+def _books(
+    start: int, stop: int, users: int, authors: int, rng: random.Random
+) -> Iterator[Dict[str, Any]]:
+    for i in range(start, stop):
+        yield {
+            "title": f"Buch {i} {rng.choice(WORDS)}",
+            "author": f"Autor {rng.randrange(authors)}",
+            "description": " ".join(rng.choices(WORDS, k=12)),
+            "publication_date": date(
+                1950 + rng.randrange(75), 1 + rng.randrange(12), 1 + rng.randrange(28)
+            ),
+            "isbn": book_isbn(i),
+            "owner_id": 1 + i % users,
+        }
+
+
+def seed(db: str, users: int, books: int, authors: int, seed_value: int) -> Dict[str, Any]:
+    from sqlalchemy import create_engine, insert, text
+
+    from app.core.security import get_password_hash
+    from app.db.base import Base, Book, User
+    from app.db.init_db import create_schema
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db + suffix):
+            os.remove(db + suffix)
+    engine = create_engine(f"sqlite:///{db}")
+    timings: Dict[str, float] = {}
+    rng = random.Random(seed_value)
+
+    started = time.perf_counter()
+    # Erst nur die Tabellen: Volltext- und Statistik-Trigger kämen sonst pro Zeile
+    Base.metadata.create_all(bind=engine)
+    hashed_password = get_password_hash(PASSWORD)
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA synchronous=OFF"))
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "email": user_email(user_id),
+                    "hashed_password": hashed_password,
+                    "is_active": True,
+                    "is_superuser": user_id == 1,
+                }
+                for user_id in range(1, users + 1)
+            ],
+        )
+        timings["users_s"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for start in range(0, books, CHUNK_SIZE):
+            rows: List[Dict[str, Any]] = list(
+                _books(start, min(start + CHUNK_SIZE, books), users, authors, rng)
+            )
+            conn.execute(insert(Book), rows)
+        timings["books_s"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    create_schema(engine)
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    timings["indexes_s"] = time.perf_counter() - started
+    engine.dispose()
+
+    dataset = {
+        "users": users,
+        "books": books,
+        "authors": authors,
+        "seed": seed_value,
+        "password": PASSWORD,
+    }
+    with open(dataset_path(db), "w") as fh:
+        json.dump(dataset, fh, indent=2)
+    return {**dataset, **{key: round(value, 1) for key, value in timings.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--books", type=int, default=1000000)
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.books < args.users:
+        parser.error("--books muss mindestens --users sein (jeder Benutzer bekommt Bücher)")
+    print(json.dumps(seed(args.db, args.users, args.books, args.authors, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
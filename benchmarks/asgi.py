@@ -0,0 +1,61 @@
+"""
+Minimaler ASGI-Treiber für Benchmarks: ruft die App direkt auf, ohne Server
+und ohne HTTP-Client (keine zusätzlichen Importe, kein Netzwerk-Overhead).
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+
+async def lifespan(app: Any) -> "asyncio.Queue[Dict[str, Any]]":
+    """
+    Führt die Startup-Handler über das ASGI-Lifespan-Protokoll aus (wie ein
+    ASGI-Server). Über die zurückgegebene Queue wird später heruntergefahren.
+    """
+    messages: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    done = asyncio.get_running_loop().create_future()
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "lifespan.startup.complete":
+            done.set_result(None)
+        elif message["type"] == "lifespan.startup.failed":
+            done.set_exception(RuntimeError(message.get("message")))
+
+    await messages.put({"type": "lifespan.startup"})
+    scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+    asyncio.ensure_future(app(scope, messages.get, send))
+    await done
+    return messages
+
+
+async def get(
+    app: Any, path: str, headers: Optional[List[Tuple[bytes, bytes]]] = None
+) -> int:
+    """
+    GET-Anfrage an die App; liefert den Statuscode, der Body wird verworfen.
+    """
+    status: List[int] = []
+    path, _, query = path.partition("?")
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), *(headers or [])],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    await app(scope, receive, send)
+    return status[0]
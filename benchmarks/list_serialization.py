@@ -0,0 +1,119 @@
+"""
+Vergleicht den ORM-Pfad der Listen-Endpunkte mit dem Core-/Serializer-Pfad.
+
+    python -m benchmarks.list_serialization --limit 1000 --iterations 200
+
+ORM-Pfad: ORM-Objekte laden, per ``response_model`` validieren und als JSON
+ausgeben (wie FastAPI). Schneller Pfad: Tupel aus einem Core-select direkt mit
+``RowSerializer`` kodieren. Beide Ausgaben werden vorab auf Gleichheit geprüft.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from typing import Any, Callable, Dict, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.serialization import RowSerializer
+from app.crud.crud_book import book as crud_book
+from app.db.base import Base, Book, User
+from app.schemas.book import Book as BookSchema
+
+BOOK_LIST = RowSerializer(BookSchema)
+BOOK_ADAPTER = TypeAdapter(List[BookSchema])
+
+
+def orm_path(db, limit: int) -> bytes:
+    books = crud_book.get_multi(db, limit=limit)
+    return BOOK_ADAPTER.dump_json(BOOK_ADAPTER.validate_python(books, from_attributes=True))
+
+
+def fast_path(db, limit: int) -> bytes:
+    rows = crud_book.get_multi_rows(db, columns=BOOK_LIST.fields, limit=limit)
+    return BOOK_LIST.dumps(rows)
+
+
+def _seed(engine, books: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(
+            insert(Book),
+            [
+                {
+                    "title": f"Buch {i} – Übersicht",
+                    "author": f"Autor {i % 500}",
+                    "description": "Beschreibung " * 5,
+                    "publication_date": date(2000 + i % 20, 1 + i % 12, 1 + i % 28),
+                    "isbn": f"{i:013d}",
+                    "owner_id": 1,
+                }
+                for i in range(books)
+            ],
+        )
+
+
+def measure(
+    Session, path: Callable[[Any, int], bytes], limit: int, iterations: int
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with Session() as db:
+            path(db, limit)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    with Session() as db:
+        path(db, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "requests_per_second": round(iterations / elapsed, 1),
+        "ms_per_request": round(elapsed / iterations * 1000, 2),
+        "peak_alloc_kib": round(peak / 1024, 1),
+    }
+
+
+def run(engine: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    _seed(engine, max(args.books, args.limit))
+    Session = sessionmaker(bind=engine)
+
+    with Session() as db:
+        if orm_path(db, args.limit) != fast_path(db, args.limit):
+            raise SystemExit("Ausgaben unterscheiden sich")
+
+    results = {
+        "limit": args.limit,
+        "orm": measure(Session, orm_path, args.limit, args.iterations),
+        "fast": measure(Session, fast_path, args.limit, args.iterations),
+    }
+    results["speedup"] = round(
+        results["orm"]["ms_per_request"] / results["fast"]["ms_per_request"], 2
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--books", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="list-bench-") as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        try:
+            results = run(engine, args)
+        finally:
+            engine.dispose()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Misst, was die Metriken selbst kosten.
+
+    python -m benchmarks.metrics_overhead --requests 2000 --runs 5
+
+Mikro: Kosten einzelner Aufrufe (Counter, Histogramm, Routen-Label) und einer
+``SELECT 1`` mit und ohne Abfrage-Hooks. Ende-zu-Ende: je ein frischer
+Prozess mit METRICS_ENABLED=true bzw. false schickt ``--requests`` GET-Anfragen
+über ASGI an die App (Liste und Einzelbuch, mit Token); verglichen wird der
+Median pro Anfrage im jeweils besten Lauf.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.asgi import get, lifespan
+
+PATHS = ["/api/v1/books/?limit=20", "/api/v1/books/{id}"]
+
+
+def _per_call_ns(function: Callable[[], Any], iterations: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter_ns() - started) / iterations
+
+
+def micro(iterations: int) -> Dict[str, float]:
+    from sqlalchemy import create_engine, text
+
+    from app.core.metrics import REQUEST_SECONDS, REQUESTS, route_label
+    from app.db.metrics import instrument_engine
+    from app.main import app
+
+    counter = REQUESTS.labels("GET", "/bench", "200")
+    histogram = REQUEST_SECONDS.labels("GET", "/bench")
+    route = next(r for r in app.routes if getattr(r, "path", None) == "/metrics")
+    scope = {"route": route, "path": "/metrics"}
+
+    results = {
+        "counter_inc_ns": _per_call_ns(counter.inc, iterations),
+        "histogram_observe_ns": _per_call_ns(lambda: histogram.observe(0.003), iterations),
+        "labels_lookup_ns": _per_call_ns(
+            lambda: REQUEST_SECONDS.labels("GET", "/bench"), iterations
+        ),
+        "route_label_ns": _per_call_ns(lambda: route_label(scope), iterations),
+    }
+    for name, instrumented in (("select_plain_ns", False), ("select_instrumented_ns", True)):
+        engine = create_engine("sqlite://")
+        if instrumented:
+            instrument_engine(engine, "bench")
+        with engine.connect() as conn:
+            statement = text("SELECT 1")
+            results[name] = _per_call_ns(lambda: conn.execute(statement), iterations)
+        engine.dispose()
+    return {key: round(value, 1) for key, value in results.items()}
+
+
+def _prepare(path: str, books: int) -> None:
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Book, User
+    from app.db.init_db import create_schema
+
+    engine = create_engine(f"sqlite:///{path}")
+    create_schema(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [{"email": "bench@example.com", "hashed_password": "x", "is_superuser": True}],
+        )
+        conn.execute(
+            insert(Book),
+            [
+                {"title": f"Buch {i}", "author": f"Autor {i % 500}", "owner_id": 1}
+                for i in range(books)
+            ],
+        )
+    engine.dispose()
+
+
+def child(requests: int, books: int) -> None:
+    from app.core.security import create_access_token
+    from app.main import app
+
+    headers = [(b"authorization", f"Bearer {create_access_token(1)}".encode())]
+    paths = [
+        PATHS[i % len(PATHS)].format(id=1 + i % books) for i in range(requests)
+    ]
+
+    async def run() -> List[float]:
+        shutdown = await lifespan(app)
+        # Aufwärmen: Routen werden beim ersten Aufruf aufgebaut
+        for path in paths[:50]:
+            assert await get(app, path, headers) == 200, path
+        timings = []
+        for path in paths:
+            started = time.perf_counter()
+            await get(app, path, headers)
+            timings.append(time.perf_counter() - started)
+        await shutdown.put({"type": "lifespan.shutdown"})
+        return timings
+
+    timings = asyncio.run(run())
+    print(json.dumps({"p50_us": statistics.median(timings) * 1e6}))
+
+
+def run_end_to_end(path: str, enabled: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    env = dict(
+        os.environ,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        METRICS_ENABLED=str(enabled).lower(),
+        BOOK_CACHE_BACKEND="none",
+        PYTHONWARNINGS="ignore",
+    )
+    command = [
+        sys.executable, "-m", "benchmarks.metrics_overhead", "--child",
+        "--requests", str(args.requests), "--books", str(args.books),
+    ]
+    medians = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            command, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        medians.append(json.loads(output.strip().splitlines()[-1])["p50_us"])
+    return {
+        "metrics": enabled,
+        "per_request_p50_us": {
+            "min": round(min(medians), 1),
+            "median": round(statistics.median(medians), 1),
+            "max": round(max(medians), 1),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--books", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.requests, args.books)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="metrics-bench-") as directory:
+        path = os.path.join(directory, "bench.db")
+        _prepare(path, args.books)
+        os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+        end_to_end = [run_end_to_end(path, enabled, args) for enabled in (False, True)]
+    # Verglichen wird der beste Lauf: am wenigsten von anderer Last gestört
+    plain, instrumented = (r["per_request_p50_us"]["min"] for r in end_to_end)
+    print(
+        json.dumps(
+            {
+                "micro": micro(args.iterations),
+                "end_to_end": end_to_end,
+                "overhead_us": round(instrumented - plain, 1),
+                "overhead_percent": round((instrumented / plain - 1) * 100, 1),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Vergleicht die SQLite-Profile aus app/db/sqlite.py unter gleichzeitigen Lese-
+und Schreibzugriffen.
+
+    python -m benchmarks.sqlite_profiles --seconds 5 --readers 8 --writers 2
+
+Jedes Profil bekommt eine eigene temporäre Datenbank mit ``--books`` Büchern.
+Leser holen Seiten per Keyset, Schreiber legen einzeln Bücher an (je ein
+Commit). Ausgegeben werden Operationen pro Sekunde, Latenzen und die Zahl der
+"database is locked"-Fehler.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Settings
+from app.db.base import Base, Book, User
+from app.db.sqlite import (
+    PROFILES,
+    apply_pragmas,
+    effective_pragmas,
+    engine_options,
+    sqlite_pragmas,
+)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def _seed(engine, books: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(
+            insert(Book),
+            [
+                {"title": f"Buch {i}", "author": f"Autor {i % 500}", "owner_id": 1}
+                for i in range(books)
+            ],
+        )
+
+
+def run_profile(name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="sqlite-bench-") as directory:
+        uri = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        settings = Settings(SQLITE_PROFILE=name, DB_POOL_SIZE=args.readers + args.writers)
+        engine = create_engine(uri, **engine_options(uri, settings))
+        try:
+            apply_pragmas(engine, sqlite_pragmas(settings))
+            return _measure(name, engine, args)
+        finally:
+            engine.dispose()
+
+
+def _measure(name: str, engine: Any, args: argparse.Namespace) -> Dict[str, Any]:
+    _seed(engine, args.books)
+    Session = sessionmaker(bind=engine)
+
+    stop = time.perf_counter() + args.seconds
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors = {"locked": 0}
+    lock = threading.Lock()
+
+    def reader():
+        local: List[float] = []
+        while time.perf_counter() < stop:
+            after_id = random.randint(0, args.books)
+            started = time.perf_counter()
+            with Session() as db:
+                db.scalars(
+                    select(Book).where(Book.id > after_id).order_by(Book.id).limit(100)
+                ).all()
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies["read"].extend(local)
+
+    def writer():
+        local: List[float] = []
+        locked = 0
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with Session() as db:
+                    db.add(Book(title="Neu", author="Bench", owner_id=1))
+                    db.commit()
+                local.append(time.perf_counter() - started)
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                locked += 1
+        with lock:
+            latencies["write"].extend(local)
+            errors["locked"] += locked
+
+    threads = [threading.Thread(target=reader) for _ in range(args.readers)]
+    threads += [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result: Dict[str, Any] = {"profile": name, "pragmas": effective_pragmas(engine)}
+    for kind, values in latencies.items():
+        result[kind] = {
+            "ops_per_second": round(len(values) / args.seconds, 1),
+            "p50_ms": round(statistics.median(values) * 1000, 2) if values else 0.0,
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+        }
+    result["locked_errors"] = errors["locked"]
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--books", type=int, default=20000)
+    args = parser.parse_args()
+    results = [run_profile(name, args) for name in args.profiles]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
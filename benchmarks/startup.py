@@ -0,0 +1,138 @@
+"""
+Misst die Startzeit eines Workers je DB_STARTUP_MODE.
+
+    python -m benchmarks.startup --runs 10 --modes create check
+
+Jeder Lauf startet einen frischen Python-Prozess (wie ein neu gestarteter
+oder ersetzter Worker) auf einer bereits migrierten Datenbank mit ``--books``
+Büchern. Gemessen werden die Zeit bis zum Ende des Imports von app.main, die
+Startup-Handler und die erste Anfrage sowie die Gesamtdauer des Prozesses
+bis zur ersten Antwort (inklusive Interpreter-Start).
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.asgi import get, lifespan
+
+# Werte von DB_STARTUP_MODE. Auf Modulebene wird bewusst nichts aus app,
+# sqlalchemy oder alembic importiert: der Kindprozess misst genau diese Importe.
+MODES = ["create", "check", "skip"]
+FIRST_REQUEST = "/api/v1/books/"
+
+
+def _prepare(path: str, books: int) -> None:
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, insert
+
+    from app.db.base import Book, User
+
+    engine = create_engine(f"sqlite:///{path}")
+    config = Config("alembic.ini")
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "hashed_password": "x"}])
+        conn.execute(
+            insert(Book),
+            [
+                {"title": f"Buch {i}", "author": f"Autor {i % 500}", "owner_id": 1}
+                for i in range(books)
+            ],
+        )
+    engine.dispose()
+
+
+def child() -> None:
+    started = time.perf_counter()
+    from app.main import app
+
+    imported = time.perf_counter()
+
+    async def run() -> Tuple[float, int]:
+        shutdown = await lifespan(app)
+        ready = time.perf_counter()
+        status = await get(app, FIRST_REQUEST)
+        await shutdown.put({"type": "lifespan.shutdown"})
+        return ready, status
+
+    ready, status = asyncio.run(run())
+    answered = time.perf_counter()
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - started) * 1000,
+                "startup_ms": (ready - imported) * 1000,
+                "first_request_ms": (answered - ready) * 1000,
+                "status": status,
+            }
+        )
+    )
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def run_mode(mode: str, path: str, runs: int) -> Dict[str, Any]:
+    env = dict(
+        os.environ,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}",
+        DB_STARTUP_MODE=mode,
+        PYTHONWARNINGS="ignore",
+    )
+    samples: Dict[str, List[float]] = {
+        "process_ms": [],
+        "import_ms": [],
+        "startup_ms": [],
+        "first_request_ms": [],
+    }
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples["process_ms"].append((time.perf_counter() - started) * 1000)
+        result = json.loads(output.strip().splitlines()[-1])
+        for key in ("import_ms", "startup_ms", "first_request_ms"):
+            samples[key].append(result[key])
+    return {"mode": mode, **{key: _summary(values) for key, values in samples.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--books", type=int, default=20000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as directory:
+        path = os.path.join(directory, "bench.db")
+        _prepare(path, args.books)
+        results = [run_mode(mode, path, args.runs) for mode in args.modes]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
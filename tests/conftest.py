@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+
+# Vor allen App-Importen: die Engines der App werden beim Import aus den
+# Einstellungen gebaut und sollen nicht auf ./test.db zeigen, das Access-Log
+# nicht nach logs/ schreiben
+_tmp = tempfile.mkdtemp(prefix="tests-")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_tmp, 'api.db')}")
+os.environ.setdefault("ACCESS_LOG_PATH", os.path.join(_tmp, "access.jsonl"))
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, delete  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.core.principal_cache import principal_cache  # noqa: E402
+from app.crud.cache import book_cache  # noqa: E402
+from app.db import query_budget as query_budget_module  # noqa: E402
+from app.db.init_db import create_first_superuser, create_schema  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _remove_tmp():
+    # Als erste Session-Fixture zuletzt abgebaut, nach dem Stopp der App
+    yield
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    create_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine) -> Session:
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    book_cache.clear()
+    yield session
+    session.close()
+    book_cache.clear()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    from fastapi.testclient import TestClient
+
+    from app.db.session import SessionLocal, engine, read_engine
+    from app.main import app
+
+    query_budget_module.instrument_engine(engine)
+    query_budget_module.instrument_engine(read_engine)
+    with TestClient(app) as client:
+        with SessionLocal() as session:
+            create_first_superuser(session)
+        yield client
+
+
+@pytest.fixture
+def client(app_client):
+    """
+    TestClient auf der Test-Datenbank; Bücher und Benutzer (außer dem ersten
+    Superuser) werden nach jedem Test gelöscht, die Caches geleert.
+    """
+    from app.db.session import SessionLocal
+    from app.models.book import Book
+    from app.models.user import User
+
+    yield app_client
+    with SessionLocal() as session:
+        session.execute(delete(Book))
+        session.execute(delete(User).where(User.email != settings.FIRST_SUPERUSER))
+        session.commit()
+    book_cache.clear()
+    principal_cache.clear()
+
+
+def _login(client, email: str, password: str) -> dict:
+    response = client.post(
+        f"{settings.API_V1_STR}/auth/login",
+        data={"username": email, "password": password},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def superuser_headers(client) -> dict:
+    return _login(client, settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD)
+
+
+@pytest.fixture
+def user_headers(client, superuser_headers) -> dict:
+    response = client.post(
+        f"{settings.API_V1_STR}/users/",
+        json={"email": "leser@example.com", "password": "geheim123"},
+        headers=superuser_headers,
+    )
+    assert response.status_code == 200, response.text
+    return _login(client, "leser@example.com", "geheim123")
+
+
+@pytest.fixture
+def query_budget():
+    """
+    ``query_budget(n)`` als Kontextmanager oder Decorator: höchstens ``n``
+    Abfragen und kein N+1-Verdacht im Block (siehe app.db.query_budget).
+    """
+    return query_budget_module.query_budget
@@ -0,0 +1,87 @@
+import json
+import logging
+from types import SimpleNamespace
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.access_log import AccessLog, AccessLogMiddleware, DroppingQueueHandler
+
+
+def _settings(tmp_path, **overrides) -> SimpleNamespace:
+    values = dict(
+        ACCESS_LOG_PATH=str(tmp_path / "access.jsonl"),
+        ACCESS_LOG_MAX_BYTES=0,
+        ACCESS_LOG_ROTATE_WHEN=None,
+        ACCESS_LOG_BACKUP_COUNT=1,
+        ACCESS_LOG_QUEUE_SIZE=100,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _lines(tmp_path, sample_rate_2xx: float, paths: list) -> list:
+    app = FastAPI()
+    app.add_middleware(AccessLogMiddleware, sample_rate_2xx=sample_rate_2xx)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, request: Request) -> dict:
+        request.state.user_id = 7
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    log = AccessLog()
+    log.start(_settings(tmp_path))
+    try:
+        with TestClient(app) as client:
+            for path in paths:
+                client.get(path)
+    finally:
+        log.stop()
+    return [json.loads(line) for line in (tmp_path / "access.jsonl").read_text().splitlines()]
+
+
+def test_writes_one_json_line_per_request(tmp_path) -> None:
+    first, second = _lines(tmp_path, 1.0, ["/items/1", "/items/0"])
+
+    assert first["route"] == "/items/{item_id}"
+    assert first["path"] == "/items/1"
+    assert (first["status"], first["user_id"]) == (200, 7)
+    assert first["duration_ms"] > 0
+    assert "sample_rate" not in first
+    assert second["status"] == 404
+
+
+def test_samples_only_successful_requests(tmp_path) -> None:
+    lines = _lines(tmp_path, 0.0, ["/items/1", "/items/2", "/items/0"])
+    assert [line["status"] for line in lines] == [404]
+
+
+def test_full_queue_drops_instead_of_blocking() -> None:
+    handler = DroppingQueueHandler(maxsize=2)
+    record = logging.LogRecord("app.access", logging.INFO, __file__, 0, "{}", None, None)
+    for _ in range(5):
+        handler.handle(record)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_size_rotation(tmp_path) -> None:
+    log = AccessLog()
+    log.start(_settings(tmp_path, ACCESS_LOG_MAX_BYTES=200))
+    logger = logging.getLogger("app.access")
+    for i in range(100):
+        logger.info(json.dumps({"i": i}))
+    log.stop()
+    assert (tmp_path / "access.jsonl.1").exists()
+
+
+def test_stop_with_full_queue(tmp_path) -> None:
+    log = AccessLog()
+    log.start(_settings(tmp_path, ACCESS_LOG_QUEUE_SIZE=1))
+    logger = logging.getLogger("app.access")
+    for i in range(50):
+        logger.info(json.dumps({"i": i}))
+    log.stop()
+    assert (tmp_path / "access.jsonl").exists()
@@ -0,0 +1,59 @@
+from app.config import settings
+
+AUTH = f"{settings.API_V1_STR}/auth"
+ME = f"{settings.API_V1_STR}/users/me"
+
+
+def _claims_login(client, monkeypatch) -> dict:
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_MODE", True)
+    response = client.post(
+        f"{AUTH}/login", data={"username": "leser@example.com", "password": "geheim123"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_token_types_are_not_interchangeable(client, user_headers, monkeypatch) -> None:
+    tokens = _claims_login(client, monkeypatch)
+
+    assert client.get(ME, headers=_bearer(tokens["access_token"])).status_code == 200
+    assert client.get(ME, headers=_bearer(tokens["refresh_token"])).status_code == 403
+    response = client.post(f"{AUTH}/refresh", json={"refresh_token": tokens["access_token"]})
+    assert response.status_code == 403
+
+    response = client.post(f"{AUTH}/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    assert client.get(ME, headers=_bearer(response.json()["access_token"])).status_code == 200
+
+
+def test_refresh_rejected_after_deactivation(client, user_headers, monkeypatch) -> None:
+    from sqlalchemy import update
+
+    from app.db.session import SessionLocal
+    from app.models.user import User
+
+    tokens = _claims_login(client, monkeypatch)
+    with SessionLocal() as session:
+        session.execute(
+            update(User).where(User.email == "leser@example.com").values(is_active=False)
+        )
+        session.commit()
+
+    response = client.post(f"{AUTH}/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_claims_principal_needs_no_query(client, user_headers, monkeypatch, query_budget) -> None:
+    from app.core.principal_cache import principal_cache
+
+    tokens = _claims_login(client, monkeypatch)
+    principal_cache.clear()
+    # Principal allein aus den Claims: weder Cache noch Datenbank
+    with query_budget(0):
+        response = client.get(ME, headers=_bearer(tokens["access_token"]))
+    assert response.json()["email"] == "leser@example.com"
+    assert response.json()["is_superuser"] is False
@@ -0,0 +1,422 @@
+import json
+from itertools import count
+
+from app.config import settings
+
+BOOKS = f"{settings.API_V1_STR}/books"
+_isbns = count()
+
+
+def _create_books(client, headers, number: int) -> list:
+    books = []
+    for i in range(number):
+        response = client.post(
+            f"{BOOKS}/",
+            json={
+                "title": f"Buch {i}",
+                "author": f"Autor {i % 3}",
+                "isbn": f"978{next(_isbns):010d}",
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        books.append(response.json())
+    return books
+
+
+def test_create_and_read_book(client, user_headers) -> None:
+    book = _create_books(client, user_headers, 1)[0]
+
+    response = client.get(f"{BOOKS}/{book['id']}", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json() == book
+
+    response = client.get(f"{BOOKS}/isbn/{book['isbn']}", headers=user_headers)
+    assert response.json()["id"] == book["id"]
+
+
+def test_users_only_see_their_own_books(client, user_headers, superuser_headers) -> None:
+    own = _create_books(client, user_headers, 2)
+    foreign = client.post(
+        f"{BOOKS}/", json={"title": "Fremd", "author": "X"}, headers=superuser_headers
+    ).json()
+
+    listed = client.get(f"{BOOKS}/", headers=user_headers).json()
+    assert [book["id"] for book in listed] == [book["id"] for book in own]
+    assert client.get(f"{BOOKS}/{foreign['id']}", headers=user_headers).status_code == 403
+    assert len(client.get(f"{BOOKS}/", headers=superuser_headers).json()) == 3
+
+
+def test_list_etag_and_fields(client, user_headers) -> None:
+    _create_books(client, user_headers, 2)
+    response = client.get(f"{BOOKS}/?fields=title", headers=user_headers)
+    assert [set(book) for book in response.json()] == [{"id", "title"}] * 2
+
+    etag = response.headers["ETag"]
+    cached = client.get(
+        f"{BOOKS}/?fields=title", headers={**user_headers, "If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    _create_books(client, user_headers, 1)
+    changed = client.get(
+        f"{BOOKS}/?fields=title", headers={**user_headers, "If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+
+
+def _page_through(client, url: str, headers: dict, limit: int) -> list:
+    """
+    Blättert im Cursor-Modus, bis kein ``X-Next-Cursor`` mehr kommt.
+    """
+    pages, cursor = [], ""
+    while cursor is not None:
+        params = {"cursor": cursor, "limit": limit}
+        response = client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+    return pages
+
+
+def test_cursor_pages_through_own_books(client, user_headers, superuser_headers) -> None:
+    own = [book["id"] for book in _create_books(client, user_headers, 5)]
+    foreign = _create_books(client, superuser_headers, 1)[0]["id"]
+
+    pages = _page_through(client, f"{BOOKS}/", user_headers, limit=2)
+    assert pages == [own[:2], own[2:4], own[4:]]
+    # Volle letzte Seite: ein Cursor mehr, dann eine leere Seite
+    pages = _page_through(client, f"{BOOKS}/", superuser_headers, limit=3)
+    assert pages == [own[:3], [*own[3:], foreign], []]
+
+
+def test_cursor_filters_are_enforced(client, user_headers, superuser_headers) -> None:
+    from app.core.pagination import encode_cursor
+
+    _create_books(client, user_headers, 2)
+    superuser_cursor = client.get(
+        f"{BOOKS}/", params={"cursor": "", "limit": 1}, headers=superuser_headers
+    ).headers["X-Next-Cursor"]
+    me = client.get(f"{settings.API_V1_STR}/users/me", headers=user_headers).json()
+    for cursor in [
+        "kein-cursor",
+        encode_cursor(owner_id=me["id"] + 1, id=0),
+        encode_cursor(owner_id=me["id"], id="1"),
+        superuser_cursor,
+    ]:
+        response = client.get(f"{BOOKS}/", params={"cursor": cursor}, headers=user_headers)
+        assert response.status_code == 400, cursor
+    own_cursor = encode_cursor(owner_id=me["id"], id=0)
+    response = client.get(f"{BOOKS}/", params={"cursor": own_cursor}, headers=user_headers)
+    assert len(response.json()) == 2
+
+
+def test_if_none_match_star_needs_visible_book(client, user_headers, superuser_headers) -> None:
+    own = _create_books(client, user_headers, 1)[0]
+    foreign = _create_books(client, superuser_headers, 1)[0]
+    headers = {**user_headers, "If-None-Match": "*"}
+
+    assert client.get(f"{BOOKS}/{own['id']}", headers=headers).status_code == 304
+    assert client.get(f"{BOOKS}/{foreign['id']}", headers=headers).status_code == 403
+    assert client.get(f"{BOOKS}/{foreign['id'] + 1000}", headers=headers).status_code == 404
+    assert client.get(f"{BOOKS}/isbn/{foreign['isbn']}", headers=headers).status_code == 403
+    assert client.get(f"{BOOKS}/isbn/9780000000000x", headers=headers).status_code == 404
+
+
+def test_search_is_owner_scoped(client, user_headers, superuser_headers) -> None:
+    def create(headers, title: str) -> int:
+        response = client.post(
+            f"{BOOKS}/", json={"title": title, "author": "Thomas Mann"}, headers=headers
+        )
+        return response.json()["id"]
+
+    own = create(user_headers, "Der Zauberberg")
+    foreign = create(superuser_headers, "Zauberberg, zweiter Band")
+
+    def search(q: str, headers: dict) -> list:
+        response = client.get(f"{BOOKS}/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200, (q, response.text)
+        return [book["id"] for book in response.json()]
+
+    assert search("zauberberg", user_headers) == [own]
+    assert sorted(search("zauberberg", superuser_headers)) == [own, foreign]
+    assert search("zaub", user_headers) == [own]
+    # FTS5-Syntax in der Eingabe ist nur Text, nie ein Operator
+    syntax = [
+        '"', '"zauberberg', "*", "zauber*", "NEAR(zauberberg mann)",
+        "mann OR", "title:zauberberg", "-mann", "^der", "(", "AND",
+    ]
+    for q in syntax:
+        assert set(search(q, user_headers)) <= {own}
+
+
+def _export(client, headers: dict, **params) -> str:
+    with client.stream("GET", f"{BOOKS}/export", params=params, headers=headers) as response:
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].endswith(f'books.{params["format"]}"')
+        return "".join(response.iter_text())
+
+
+def test_export_ndjson(client, user_headers, superuser_headers) -> None:
+    own = _create_books(client, user_headers, 3)
+    _create_books(client, superuser_headers, 1)
+
+    lines = _export(client, user_headers, format="ndjson").splitlines()
+    assert [json.loads(line) for line in lines] == own
+    lines = _export(client, user_headers, format="ndjson", fields="title").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": book["id"], "title": book["title"]} for book in own
+    ]
+    assert len(_export(client, superuser_headers, format="ndjson").splitlines()) == 4
+
+
+def test_export_csv_quotes_fields(client, user_headers, superuser_headers) -> None:
+    import csv
+    import io
+
+    book = client.post(
+        f"{BOOKS}/",
+        json={
+            "title": 'Komma, "Zitat"\nund Zeilenumbruch',
+            "author": "A",
+            "description": "x;y",
+            "publication_date": "1924-11-20",
+        },
+        headers=user_headers,
+    ).json()
+    _create_books(client, superuser_headers, 1)
+
+    text = _export(client, user_headers, format="csv", fields="title,publication_date")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert rows == [
+        {
+            "id": str(book["id"]),
+            "title": book["title"],
+            "publication_date": "1924-11-20",
+        }
+    ]
+    rows = list(csv.DictReader(io.StringIO(_export(client, user_headers, format="csv"))))
+    assert rows[0]["description"] == "x;y"
+
+
+def test_update_and_delete_book(client, user_headers) -> None:
+    book = _create_books(client, user_headers, 1)[0]
+
+    response = client.put(f"{BOOKS}/{book['id']}", json={"title": "Neu"}, headers=user_headers)
+    assert response.json()["title"] == "Neu"
+    assert client.delete(f"{BOOKS}/{book['id']}", headers=user_headers).status_code == 200
+    assert client.get(f"{BOOKS}/{book['id']}", headers=user_headers).status_code == 404
+
+
+def test_update_ignores_stale_cache(client, user_headers) -> None:
+    from sqlalchemy import update
+
+    from app.db.session import SessionLocal
+    from app.models.book import Book
+
+    book = _create_books(client, user_headers, 1)[0]
+    client.get(f"{BOOKS}/{book['id']}", headers=user_headers)
+    # Schreibzugriff eines anderen Workers: invalidiert diesen Cache nicht
+    with SessionLocal() as session:
+        session.execute(update(Book).where(Book.id == book["id"]).values(title="Anders"))
+        session.commit()
+
+    # Zurück auf den alten Titel: die Kopie im Cache darf das nicht verschlucken
+    response = client.put(
+        f"{BOOKS}/{book['id']}", json={"title": book["title"]}, headers=user_headers
+    )
+    assert response.json()["title"] == book["title"]
+    with SessionLocal() as session:
+        assert session.get(Book, book["id"]).title == book["title"]
+
+
+def test_cache_skips_rows_read_before_invalidation() -> None:
+    from app.crud.cache import MISS, book_cache
+
+    generation = book_cache.generation()
+    book_cache.invalidate(["book:id:-1"])
+    book_cache.store("book:id:-1", {"id": -1}, generation)
+    assert book_cache.get("book:id:-1") is MISS
+
+
+# Abfragebudgets: Version für den ETag plus die eigentliche Abfrage. Mehr als
+# REPEAT_THRESHOLD Bücher, damit Nachladen pro Buch als N+1 auffällt.
+def test_list_query_budget(client, user_headers, query_budget) -> None:
+    _create_books(client, user_headers, 10)
+    with query_budget(2):
+        response = client.get(f"{BOOKS}/", headers=user_headers)
+    assert len(response.json()) == 10
+
+    with query_budget(1):
+        response = client.get(
+            f"{BOOKS}/", headers={**user_headers, "If-None-Match": response.headers["ETag"]}
+        )
+    assert response.status_code == 304
+
+
+def test_detail_query_budget(client, user_headers, query_budget) -> None:
+    book = _create_books(client, user_headers, 1)[0]
+    with query_budget(2):
+        client.get(f"{BOOKS}/{book['id']}", headers=user_headers)
+    # Zweiter Abruf aus dem Read-Through-Cache, nur noch die Version
+    with query_budget(1):
+        client.get(f"{BOOKS}/{book['id']}", headers=user_headers)
+
+
+def test_write_query_budgets(client, user_headers, query_budget) -> None:
+    # Erste Anfrage lädt den Benutzer für den Principal-Cache (eine Abfrage mehr)
+    _create_books(client, user_headers, 1)
+    with query_budget(2):
+        book = client.post(
+            f"{BOOKS}/", json={"title": "Neu", "author": "A"}, headers=user_headers
+        ).json()
+    with query_budget(2):
+        client.put(f"{BOOKS}/{book['id']}", json={"title": "Neu"}, headers=user_headers)
+    with query_budget(3):
+        client.delete(f"{BOOKS}/{book['id']}", headers=user_headers)
+
+
+def test_batch_delete_query_budget(client, user_headers, query_budget) -> None:
+    ids = [book["id"] for book in _create_books(client, user_headers, 10)]
+    with query_budget(4):
+        response = client.post(
+            f"{BOOKS}/batch-delete", json={"ids": ids}, headers=user_headers
+        )
+    assert response.status_code == 200
+
+
+def test_stats_query_budget(client, user_headers, superuser_headers, query_budget) -> None:
+    _create_books(client, user_headers, 10)
+    with query_budget(5):
+        response = client.get(f"{BOOKS}/stats", headers=superuser_headers)
+    assert response.json()["total"] == 10
+
+
+def test_batch_update_and_delete_refresh_cache_and_etag(client, user_headers) -> None:
+    from app.crud.crud_book import book as crud_book
+    from app.db.session import SessionLocal
+    from app.models.book import Book
+
+    first, second, third = _create_books(client, user_headers, 3)
+    owner_id = client.get(f"{settings.API_V1_STR}/users/me", headers=user_headers).json()["id"]
+
+    def version() -> int:
+        with SessionLocal() as session:
+            return crud_book.get_version(session, owner_id=owner_id)
+
+    # Detail und ISBN-Abruf füllen den Cache, der ETag gilt für diesen Stand
+    etag = client.get(f"{BOOKS}/{first['id']}", headers=user_headers).headers["ETag"]
+    client.get(f"{BOOKS}/isbn/{second['isbn']}", headers=user_headers)
+    before = version()
+    new_isbn = f"978{next(_isbns):010d}"
+    response = client.post(
+        f"{BOOKS}/batch-update",
+        json={
+            "items": [
+                {"id": first["id"], "title": "Neuer Titel"},
+                {"id": second["id"], "isbn": new_isbn},
+            ]
+        },
+        headers=user_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert (response.json()["succeeded"], response.json()["failed"]) == (2, 0)
+    assert version() == before + 1
+
+    with SessionLocal() as session:
+        assert session.get(Book, first["id"]).title == "Neuer Titel"
+        assert session.get(Book, second["id"]).isbn == new_isbn
+    detail = client.get(
+        f"{BOOKS}/{first['id']}", headers={**user_headers, "If-None-Match": etag}
+    )
+    assert detail.status_code == 200
+    assert detail.json()["title"] == "Neuer Titel"
+    assert client.get(f"{BOOKS}/isbn/{second['isbn']}", headers=user_headers).status_code == 404
+    by_isbn = client.get(f"{BOOKS}/isbn/{new_isbn}", headers=user_headers)
+    assert by_isbn.json()["id"] == second["id"]
+
+    response = client.post(
+        f"{BOOKS}/batch-delete", json={"ids": [first["id"], third["id"]]}, headers=user_headers
+    )
+    assert response.json()["succeeded"] == 2
+    assert version() == before + 2
+    assert client.get(f"{BOOKS}/{first['id']}", headers=user_headers).status_code == 404
+    listed = client.get(f"{BOOKS}/", headers=user_headers).json()
+    assert [book["id"] for book in listed] == [second["id"]]
+
+
+def test_batch_update_skips_book_deleted_after_check(client, user_headers, monkeypatch) -> None:
+    from sqlalchemy import delete
+
+    from app.crud.crud_book import book as crud_book
+    from app.models.book import Book
+
+    kept, gone = (book["id"] for book in _create_books(client, user_headers, 2))
+    get_owners = crud_book.get_owners
+
+    def get_owners_then_delete(db, *, ids):
+        # Gleichzeitiges Löschen zwischen Prüfung und UPDATE
+        owners = get_owners(db, ids=ids)
+        db.execute(delete(Book).where(Book.id == gone))
+        return owners
+
+    monkeypatch.setattr(crud_book, "get_owners", get_owners_then_delete)
+    response = client.post(
+        f"{BOOKS}/batch-update",
+        json={"items": [{"id": kept, "title": "Neu"}, {"id": gone, "title": "Weg"}]},
+        headers=user_headers,
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["succeeded"], body["failed"]) == (1, 1)
+    assert [item["status"] for item in body["results"]] == [200, 404]
+    assert body["results"][0]["book"]["title"] == "Neu"
+
+
+def test_import_recovers_from_isbn_taken_after_check(client, user_headers, monkeypatch) -> None:
+    from app.crud.crud_book import book as crud_book
+
+    taken = _create_books(client, user_headers, 1)[0]["isbn"]
+    get_existing_isbns = crud_book.get_existing_isbns
+    calls = []
+
+    def miss_first_check(db, *, isbns):
+        # Erste Prüfung sieht die ISBN noch nicht (gleichzeitig angelegt)
+        calls.append(isbns)
+        return set() if len(calls) == 1 else get_existing_isbns(db, isbns=isbns)
+
+    monkeypatch.setattr(crud_book, "get_existing_isbns", miss_first_check)
+    lines = [
+        {"title": "Doppelt", "author": "X", "isbn": taken},
+        {"title": "Neu", "author": "X", "isbn": f"978{next(_isbns):010d}"},
+    ]
+    response = client.post(
+        f"{BOOKS}/import",
+        content="\n".join(json.dumps(line) for line in lines),
+        headers={**user_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (1, 1)
+    assert [(error["row"], error["isbn"]) for error in body["errors"]] == [(1, taken)]
+    assert len(calls) == 2
+
+
+def test_import_does_not_retry_other_integrity_errors(db, monkeypatch) -> None:
+    import pytest
+    from sqlalchemy.exc import IntegrityError
+
+    from app.crud.crud_book import book as crud_book
+    from app.schemas.book import BookCreate, BookImportResult
+    from app.services.book_import import _insert_chunk
+
+    calls = []
+
+    def owner_gone(db, *, objs_in, owner_id):
+        calls.append(owner_id)
+        raise IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+
+    monkeypatch.setattr(crud_book, "create_multi_with_owner", owner_gone)
+    valid = [(1, BookCreate(title="Buch", author="X"))]
+    with pytest.raises(IntegrityError):
+        _insert_chunk(db, valid, 1, set(), BookImportResult())
+    assert calls == [1]
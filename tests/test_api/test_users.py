@@ -0,0 +1,100 @@
+from app.config import settings
+
+USERS = f"{settings.API_V1_STR}/users"
+
+
+def test_read_and_update_me(client, user_headers) -> None:
+    me = client.get(f"{USERS}/me", headers=user_headers).json()
+    assert me["email"] == "leser@example.com"
+    assert me["is_superuser"] is False
+
+    response = client.put(f"{USERS}/me", json={"email": "neu@example.com"}, headers=user_headers)
+    assert response.json()["email"] == "neu@example.com"
+    assert client.get(f"{USERS}/me", headers=user_headers).json()["email"] == "neu@example.com"
+
+
+def test_user_list_requires_superuser(client, user_headers, superuser_headers) -> None:
+    assert client.get(f"{USERS}/", headers=user_headers).status_code == 400
+    emails = [user["email"] for user in client.get(f"{USERS}/", headers=superuser_headers).json()]
+    assert emails == [settings.FIRST_SUPERUSER, "leser@example.com"]
+
+
+def test_user_list_cursor(client, superuser_headers) -> None:
+    for i in range(3):
+        client.post(
+            f"{USERS}/",
+            json={"email": f"u{i}@example.com", "password": "geheim123"},
+            headers=superuser_headers,
+        )
+    emails, cursor = [], ""
+    while cursor is not None:
+        response = client.get(
+            f"{USERS}/", params={"cursor": cursor, "limit": 2}, headers=superuser_headers
+        )
+        emails.append([user["email"] for user in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+    assert emails == [
+        [settings.FIRST_SUPERUSER, "u0@example.com"],
+        ["u1@example.com", "u2@example.com"],
+        [],
+    ]
+    response = client.get(
+        f"{USERS}/", params={"cursor": "kein-cursor"}, headers=superuser_headers
+    )
+    assert response.status_code == 400
+
+
+def test_delete_user(client, user_headers, superuser_headers) -> None:
+    me = client.get(f"{USERS}/me", headers=user_headers).json()
+    response = client.delete(f"{USERS}/{me['id']}", headers=superuser_headers)
+    assert response.status_code == 200
+    assert client.get(f"{USERS}/{me['id']}", headers=superuser_headers).status_code == 404
+
+
+def test_me_query_budget(client, user_headers, query_budget) -> None:
+    client.get(f"{USERS}/me", headers=user_headers)
+    # Benutzer kommt aus dem Principal-Cache
+    with query_budget(0):
+        client.get(f"{USERS}/me", headers=user_headers)
+    with query_budget(2):
+        client.put(f"{USERS}/me", json={"email": "neu@example.com"}, headers=user_headers)
+
+
+def test_list_query_budget(client, superuser_headers, query_budget) -> None:
+    for i in range(10):
+        client.post(
+            f"{USERS}/",
+            json={"email": f"u{i}@example.com", "password": "geheim123"},
+            headers=superuser_headers,
+        )
+    with query_budget(1):
+        response = client.get(f"{USERS}/", headers=superuser_headers)
+    assert len(response.json()) == 11
+
+
+def test_login_unknown_email_runs_one_bcrypt(client, monkeypatch) -> None:
+    from app.core import security
+    from app.core.password_pool import password_pool
+
+    calls = []
+    run, run_sync = password_pool.run, password_pool.run_sync
+
+    async def counted_run(fn, *args):
+        calls.append(fn.__name__)
+        return await run(fn, *args)
+
+    def counted_run_sync(fn, *args):
+        calls.append(fn.__name__)
+        return run_sync(fn, *args)
+
+    monkeypatch.setattr(password_pool, "run", counted_run)
+    monkeypatch.setattr(password_pool, "run_sync", counted_run_sync)
+    monkeypatch.setattr(security, "_dummy_hash", None)
+    for _ in range(2):
+        response = client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": "niemand@example.com", "password": "geheim123"},
+        )
+        assert response.status_code in (400, 401)
+    # Erster Login berechnet den Vergleichshash, danach nur noch Prüfungen
+    assert calls == ["_hash", "_verify"]
@@ -0,0 +1,60 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.metrics import (
+    REQUEST_QUERIES,
+    REQUESTS,
+    Histogram,
+    MetricsMiddleware,
+    Registry,
+)
+from app.db.metrics import QUERIES, instrument_engine
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    histogram = registry.register(
+        Histogram("latency_seconds", "Test.", ["route"], buckets=(0.1, 1.0))
+    )
+    for value in (0.05, 0.5, 0.5, 2.0):
+        histogram.labels("/a").observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Test.", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.05' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_middleware_labels_route_template_and_counts_queries(engine) -> None:
+    instrument_engine(engine, "test")
+    router = APIRouter()
+
+    @router.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": item_id}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router, prefix="/api")
+
+    route = "/api/items/{item_id}"
+    before = QUERIES.labels("test").value
+    with TestClient(app) as client:
+        assert client.get("/api/items/1").status_code == 200
+        assert client.get("/api/items/2").status_code == 200
+        assert client.get("/api/other/2").status_code == 404
+
+    assert REQUESTS.labels("GET", route, "200").value == 2
+    assert REQUESTS.labels("GET", "unmatched", "404").value >= 1
+    assert "/api/items/1" not in {values[1] for values in REQUESTS._children}
+    assert QUERIES.labels("test").value - before == 4
+    per_request = REQUEST_QUERIES.labels("GET", route)
+    assert per_request.sum == 4
+    assert per_request.counts[REQUEST_QUERIES.buckets.index(2)] == 2
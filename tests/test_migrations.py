@@ -0,0 +1,108 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from app.db.base import Base
+from app.db.fts import FTS_TABLE
+from app.db.init_db import (
+    SCHEMA_REVISION,
+    check_schema,
+    create_schema,
+    get_schema_revision,
+)
+
+
+def _include_object(object, name, type_, reflected, compare_to) -> bool:
+    # Wie alembic/env.py: den Volltextindex verwaltet app/db/fts.py
+    return not (type_ == "table" and name.startswith(FTS_TABLE))
+
+
+def test_schema_revision_is_alembic_head() -> None:
+    head = ScriptDirectory.from_config(Config("alembic.ini")).get_current_head()
+    assert head == SCHEMA_REVISION
+
+
+def test_empty_database_has_no_revision(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+    assert get_schema_revision(engine) is None
+    engine.dispose()
+
+
+def test_migrations_match_models(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = Config("alembic.ini")
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+
+    check_schema(engine)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn, opts={"include_object": _include_object}
+        )
+        assert compare_metadata(context, Base.metadata) == []
+    engine.dispose()
+
+
+def _upgrade(engine, revision: str) -> None:
+    config = Config("alembic.ini")
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.upgrade(config, revision)
+
+
+def _triggers_and_index(engine) -> list:
+    # Verhalten statt DDL-Text vergleichen: Statistik und Suche nach Schreibzugriffen
+    with engine.begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@b.de', 'x')")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO books (id, title, author, owner_id, publication_date) VALUES "
+                "(1, 'Zauberberg', 'Mann', 1, '1924-01-01'), (2, 'Prozess', 'Kafka', 1, NULL)"
+            )
+        )
+        conn.execute(text("UPDATE books SET author = 'Thomas Mann' WHERE id = 1"))
+        conn.execute(text("DELETE FROM books WHERE id = 2"))
+        stats = conn.execute(
+            text("SELECT dimension, key, count FROM book_stats ORDER BY 1, 2")
+        ).all()
+        hits = conn.execute(
+            text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH 'thomas'")
+        ).all()
+    return [stats, hits]
+
+
+def test_migration_matches_application_ddl(tmp_path) -> None:
+    migrated = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    _upgrade(migrated, "head")
+    created = create_engine(f"sqlite:///{tmp_path / 'created.db'}")
+    create_schema(created)
+
+    assert _triggers_and_index(migrated) == _triggers_and_index(created)
+    migrated.dispose()
+    created.dispose()
+
+
+def test_fts_migration_downgrade(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    _upgrade(engine, "head")
+    config = Config("alembic.ini")
+    with engine.begin() as conn:
+        config.attributes["connection"] = conn
+        command.downgrade(config, "0003")
+    with engine.connect() as conn:
+        leftovers = conn.execute(
+            text(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                f"OR name LIKE '{FTS_TABLE}%'"
+            )
+        ).all()
+    assert leftovers == []
+    _upgrade(engine, "head")
+    check_schema(engine)
+    engine.dispose()
@@ -0,0 +1,35 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.password_pool import PasswordHashPool, PasswordPoolBusy
+
+
+def test_inline_mode_limits_queue_and_leaves_loop_free() -> None:
+    pool = PasswordHashPool(workers=0, queue_size=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking() -> str:
+        started.set()
+        release.wait(5)
+        return threading.current_thread().name
+
+    async def run() -> str:
+        loop_thread = threading.current_thread().name
+        task = asyncio.ensure_future(pool.run(blocking))
+        # Die Event-Loop läuft weiter, während gerechnet wird
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        with pytest.raises(PasswordPoolBusy):
+            await pool.run(blocking)
+        with pytest.raises(PasswordPoolBusy):
+            pool.run_sync(blocking)
+        release.set()
+        worker_thread = await task
+        assert worker_thread != loop_thread
+        return await pool.run(str.upper, "frei")
+
+    assert asyncio.run(run()) == "FREI"
+    assert pool.rejected == 2
@@ -0,0 +1,42 @@
+import pytest
+
+from app.db.query_budget import QueryBudgetExceeded, instrument_engine, query_budget
+from app.models.book import Book
+from app.models.user import User
+
+
+@pytest.fixture
+def books(engine, db) -> list:
+    instrument_engine(engine)
+    db.add_all(
+        Book(title=f"Buch {i}", owner=User(email=f"u{i}@example.com", hashed_password="x"))
+        for i in range(6)
+    )
+    db.commit()
+    db.expunge_all()
+    return db.query(Book).all()
+
+
+def test_flags_lazy_loading_per_row(books) -> None:
+    with pytest.raises(QueryBudgetExceeded, match="6x wiederholt: SELECT users"):
+        with query_budget():
+            [book.owner.email for book in books]
+
+
+def test_budget_counts_statements(db, books) -> None:
+    with pytest.raises(QueryBudgetExceeded, match="2 Abfragen \\(Budget 1\\)"):
+        with query_budget(1):
+            db.query(Book).count()
+            db.query(User).count()
+
+    with query_budget(1) as log:
+        db.query(Book).count()
+    assert len(log) == 1
+
+
+def test_works_as_decorator(db, books) -> None:
+    @query_budget(0)
+    def no_queries() -> int:
+        return len(books)
+
+    assert no_queries() == 6
@@ -0,0 +1,32 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.db.session import ReadSessionLocal, SessionLocal, get_db
+
+
+def _app(seen: list) -> FastAPI:
+    app = FastAPI()
+
+    def current_user(db: Session = Depends(get_db)) -> Session:
+        return db
+
+    def endpoint(db: Session = Depends(get_db), user_db: Session = Depends(current_user)):
+        seen.append((db, user_db))
+        return {}
+
+    app.add_api_route("/", endpoint, methods=["GET", "POST"])
+    return app
+
+
+def test_one_session_per_request_routed_by_method() -> None:
+    seen = []
+    with TestClient(_app(seen)) as client:
+        client.get("/")
+        client.post("/")
+        client.get("/")
+
+    assert [db is user_db for db, user_db in seen] == [True, True, True]
+    assert seen[0][0] is not seen[2][0]
+    assert seen[0][0].bind is ReadSessionLocal.kw["bind"]
+    assert seen[1][0].bind is SessionLocal.kw["bind"]
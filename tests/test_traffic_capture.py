@@ -0,0 +1,131 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.traffic_capture import (
+    ANONYMIZED_PASSWORD,
+    TrafficCapture,
+    TrafficCaptureMiddleware,
+    anonymize_body,
+    anonymize_query,
+)
+from benchmarks.api.replay import load_entries, replay
+
+KEY = b"geheim"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(TrafficCaptureMiddleware, prefix="/api", key="geheim", max_body_bytes=100)
+
+    @app.post("/api/items")
+    async def create_item(request: Request) -> dict:
+        request.state.user_id = 7
+        return {"size": len(await request.body())}
+
+    @app.get("/api/items/{item_id}")
+    def read_item(item_id: int) -> dict:
+        return {"id": item_id}
+
+    @app.get("/health")
+    def health() -> dict:
+        return {}
+
+    return app
+
+
+def _capture(tmp_path, app: FastAPI, requests: list) -> list:
+    capture = TrafficCapture()
+    capture.start(
+        SimpleNamespace(
+            CAPTURE_PATH=str(tmp_path / "requests.jsonl"),
+            CAPTURE_MAX_BYTES=0,
+            CAPTURE_BACKUP_COUNT=1,
+        )
+    )
+    try:
+        with TestClient(app) as client:
+            for method, path, kwargs in requests:
+                client.request(method, path, **kwargs)
+    finally:
+        capture.stop()
+    return load_entries([str(tmp_path / "requests.jsonl")])
+
+
+def test_anonymizes_sensitive_fields() -> None:
+    body = json.dumps({"email": "Leser@example.com", "password": "geheim123", "title": "Buch"})
+    anonymized = json.loads(anonymize_body(body.encode(), "application/json", KEY))
+    assert anonymized["password"] == ANONYMIZED_PASSWORD
+    assert anonymized["title"] == "Buch"
+    assert "leser" not in anonymized["email"].lower()
+    # Stabil: dieselbe Adresse ergibt dasselbe Pseudonym
+    again = json.loads(anonymize_body(b'{"email": "leser@example.com"}', "application/json", KEY))
+    assert again["email"] == anonymized["email"]
+
+    form = anonymize_body(
+        b"username=leser%40example.com&password=x", "application/x-www-form-urlencoded", KEY
+    )
+    assert "leser" not in form and f"password={ANONYMIZED_PASSWORD}" in form
+    assert anonymize_body(b"\x00\xff", "application/octet-stream", KEY) is None
+
+
+def test_anonymizes_query_strings_and_csv() -> None:
+    query = anonymize_query("q=Leser%40example.com&limit=2&access_token=abc", KEY)
+    assert "leser" not in query.lower() and "abc" not in query
+    assert "limit=2" in query and "access_token=%2A%2A%2A" in query
+    assert anonymize_query("fields=id&limit=2", KEY) == "fields=id&limit=2"
+
+    body = 'title,author,email\r\n"Brief, an leser@example.com",Kafka,leser@example.com\r\n'
+    csv_text = anonymize_body(body.encode(), "text/csv", KEY)
+    assert "leser" not in csv_text
+    assert "Brief, an" in csv_text and "Kafka" in csv_text
+    # Ohne persönliche Daten bleibt der Body byte-gleich
+    plain = "title,author\r\nProzess,Kafka\r\n"
+    assert anonymize_body(plain.encode(), "text/csv", KEY) == plain
+
+
+def test_captures_api_requests_only(tmp_path) -> None:
+    entries = _capture(
+        tmp_path,
+        _app(),
+        [
+            ("GET", "/api/items/3?fields=id", {}),
+            ("POST", "/api/items", {"json": {"password": "geheim123"}}),
+            ("POST", "/api/items", {"content": b"x" * 200}),
+            ("GET", "/api/items/4?q=leser@example.com", {}),
+            ("GET", "/health", {}),
+        ],
+    )
+    read, create, too_large, search = entries
+
+    assert read["route"] == "/api/items/{item_id}"
+    assert (read["query"], read["status"]) == ("fields=id", 200)
+    assert "body" not in read
+    assert create["user_id"] == 7
+    assert json.loads(create["body"]) == {"password": ANONYMIZED_PASSWORD}
+    assert (too_large["body_bytes"], too_large["body"]) == (200, None)
+    assert "leser" not in search["query"] and search["query"].startswith("q=")
+
+
+def test_replay_reports_no_differences_against_same_app(tmp_path) -> None:
+    app = _app()
+    entries = _capture(
+        tmp_path,
+        app,
+        [("GET", f"/api/items/{i}", {}) for i in range(5)]
+        + [("POST", "/api/items", {"json": {"title": "Buch"}})],
+    )
+
+    async def run() -> list:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+            return await replay(client, entries, {}, speed=0, concurrency=2)
+
+    outcomes = asyncio.run(run())
+    assert len(outcomes) == 6
+    assert all(o["status"] == o["entry"]["status"] for o in outcomes)
+    assert all(o["sha1"] == o["entry"]["response_sha1"] for o in outcomes)